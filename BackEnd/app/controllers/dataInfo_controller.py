@@ -1,14 +1,41 @@
-from typing import List
-from fastapi import APIRouter
-from app.models import DataSearch, WeatherData
+from typing import Annotated, List
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.models import DataFilter, DataPage, DataPageQuery, DataSearch, WeatherData
 from app.services import dataInfo_service
+from app.services.rendered_body import RenderedBody
 
 router = APIRouter()
 
-@router.get("/GetAllDataInfo")
-async def get_all_data_info():
-    return await dataInfo_service.get_all_data()
+# The service renders the JSON body straight from the in-memory store, so the
+# responses skip FastAPI's per-object validation; response_model only
+# documents the schema in OpenAPI.
+
+def conditional_response(request: Request, rendered: RenderedBody) -> Response:
+    encoding = rendered.negotiate(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": rendered.etags[encoding],
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if rendered.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=rendered.bodies[encoding], media_type="application/json", headers=headers)
+
+@router.get("/GetAllDataInfo", response_model=List[WeatherData])
+async def get_all_data_info(request: Request):
+    return conditional_response(request, await dataInfo_service.get_all_data_rendered())
 
 @router.post("/GetDataLocation", response_model=List[WeatherData])
 async def get_data_location(data: DataSearch):
-    return await dataInfo_service.get_data_location(data)
\ No newline at end of file
+    return Response(content=await dataInfo_service.get_data_location_json(data), media_type="application/json")
+
+@router.get("/GetDataInfoPage", response_model=DataPage)
+async def get_data_info_page(query: Annotated[DataPageQuery, Query()]):
+    return Response(content=await dataInfo_service.get_data_page_json(query), media_type="application/json")
+
+@router.get("/StreamDataInfo")
+async def stream_data_info(filters: Annotated[DataFilter, Query()]):
+    return StreamingResponse(await dataInfo_service.stream_data_ndjson(filters), media_type="application/x-ndjson")
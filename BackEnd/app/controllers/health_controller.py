@@ -1,8 +1,16 @@
 import datetime
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services import dataInfo_service
 
 router = APIRouter()
 
 @router.get("/")
 async def get_health_check_api():
+    if not dataInfo_service.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
     return datetime.datetime.now()
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    return {"GetDataLocation": dataInfo_service.location_cache_stats()}
@@ -1,6 +1,6 @@
 from datetime import date
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 class WeatherData(BaseModel):
     date: date 
@@ -21,4 +21,32 @@ class DataSearch(BaseModel):
     latitude: Optional[float] = Field(default=None)
     longitude: Optional[float] = Field(default=None)
     name_city: Optional[str] = Field(default=None)
-    
\ No newline at end of file
+    radius_km: Optional[float] = Field(default=None, gt=0)
+    nearest: Optional[int] = Field(default=None, ge=1)
+
+    @model_validator(mode="after")
+    def check_nearest_has_point(self) -> "DataSearch":
+        # radius_km and nearest are measured from latitude/longitude.
+        if (self.radius_km is not None or self.nearest is not None) and (
+            self.latitude is None or self.longitude is None
+        ):
+            raise ValueError("radius_km and nearest require latitude and longitude")
+        return self
+
+class DataFilter(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    name_city: Optional[str] = Field(default=None)
+    start_date: Optional[date] = Field(default=None)
+    end_date: Optional[date] = Field(default=None)
+    classification: Optional[str] = Field(default=None)
+
+class DataPageQuery(DataFilter):
+    offset: int = Field(default=0, ge=0)
+    limit: int = Field(default=100, ge=1, le=1000)
+
+class DataPage(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    next_offset: Optional[int]
+    items: List[WeatherData]
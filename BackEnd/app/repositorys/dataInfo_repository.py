@@ -1,34 +1,67 @@
-from datetime import datetime
-import pandas as pd
-from typing import List
-from app.models import WeatherData
+import asyncio
+import os
+import threading
+import time
+from typing import Optional, Tuple
+from app.repositorys.forecast_store import ForecastStore
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "classified_weather_forecast.csv")
+# Binary snapshot of the same data written by Data/forecast_snapshot.py.
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "classified_weather_forecast.snapshot")
 
 class DataInfoRepository:
 
-    async def load_data_info(self) -> List[WeatherData]:
-      
-        df = pd.read_csv('app/repositorys/classified_weather_forecast.csv', encoding='utf-8')
+    def __init__(self, path: str = DATA_PATH, snapshot_path: str = SNAPSHOT_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.check_interval = check_interval
+        self._store: Optional[ForecastStore] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_store(self) -> ForecastStore:
+        store = self._store
+        now = time.monotonic()
+        if store is not None and now - self._checked_at < self.check_interval:
+            return store
+
+        source, version = self._current_source()
+        self._checked_at = now
+        if store is not None and store.version == version:
+            return store
 
-        infosCsv = []
-        for index, row in df.iterrows():
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock.
+            if self._store is None or self._store.version != version:
+                # Build the new snapshot completely (including its indexes) before
+                # swapping the reference, so concurrent readers see either the old
+                # or the new data, never a mix.
+                if source == self.snapshot_path:
+                    store = ForecastStore.from_snapshot(source, version)
+                else:
+                    store = ForecastStore.from_csv(source, version)
+                self._store = store
+            return self._store
+
+    def _current_source(self) -> Tuple[str, int]:
+        # Serve whichever of the snapshot and the CSV was deployed last, so a new
+        # CSV is never shadowed by an older snapshot.
+        candidates = []
+        for path in (self.snapshot_path, self.path):
             try:
-                info_data = WeatherData(
-                    classification=row['classification'],
-                    city_name=row['city_name'],
-                    latitude=float(row['latitude']),
-                    longitude=float(row['longitude']),
-                    T2M_prediction=float(row['T2M_prediction']),
-                    T2M_MAX_prediction=float(row['T2M_MAX_prediction']),
-                    T2M_MIN_prediction=float(row['T2M_MIN_prediction']),
-                    WS2M_prediction=float(row['WS2M_prediction']),
-                    RH2M_prediction=float(row['RH2M_prediction']),
-                    date=pd.to_datetime(row['date']).date(),
-                    sabia_message_en=row['sabia_message_en']
-                )
-                infosCsv.append(info_data)
-            except Exception as e:
-                print(f"Error processing the line {index}: {e}")
-
-        return infosCsv
-
-dataInfo_repository = DataInfoRepository()
\ No newline at end of file
+                candidates.append((os.stat(path).st_mtime_ns, path == self.snapshot_path, path))
+            except FileNotFoundError:
+                continue
+        if not candidates:
+            raise FileNotFoundError(self.path)
+        mtime, _, path = max(candidates)
+        return path, mtime
+
+    async def get_store_async(self) -> ForecastStore:
+        store = self._store
+        if store is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return store
+        # The freshness check may turn into a CSV parse; keep it off the event loop.
+        return await asyncio.to_thread(self.get_store)
+
+dataInfo_repository = DataInfoRepository()
@@ -0,0 +1,123 @@
+import json
+import struct
+from typing import Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+# Binary snapshot written by Data/forecast_snapshot.py; see that module for the layout.
+MAGIC = b"SABIASN2"
+
+
+class DictionaryColumn:
+    """
+    A string column kept as integer codes into a list of distinct values. With a
+    snapshot the codes are a view of the memory-mapped file.
+    """
+
+    def __init__(self, codes: np.ndarray, dictionary: Sequence[str]):
+        self.codes = codes
+        self.dictionary = np.array(list(dictionary), dtype=object)
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "DictionaryColumn":
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=True)
+        return cls(codes.astype(np.int32), [str(u) for u in uniques])
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        return self.dictionary[self.codes[rows]]
+
+    def compress(self, mask: np.ndarray) -> "DictionaryColumn":
+        return DictionaryColumn(self.codes[mask], self.dictionary)
+
+
+class TextColumn:
+    """
+    A string column kept as UTF-8 bytes plus row offsets; rows are decoded only when
+    a response needs them. With a snapshot both arrays are views of the mapped file.
+    """
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray):
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "TextColumn":
+        encoded = [v.encode("utf-8") if isinstance(v, str) else b"" for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return cls(offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        rows = np.asarray(rows)
+        blob = memoryview(self.blob)
+        starts = self.offsets[rows].tolist()
+        ends = self.offsets[rows + 1].tolist()
+        return np.array([str(blob[a:b], "utf-8") for a, b in zip(starts, ends)], dtype=object)
+
+    def compress(self, mask: np.ndarray) -> "TextColumn":
+        return TextColumn.from_values(self.take(np.flatnonzero(mask)).tolist())
+
+
+Column = Union[np.ndarray, DictionaryColumn, TextColumn]
+
+
+def take(column: Column, rows: np.ndarray) -> np.ndarray:
+    """Values of the given rows; string columns are decoded here."""
+    if isinstance(column, (DictionaryColumn, TextColumn)):
+        return column.take(rows)
+    return column[rows]
+
+
+def compress(column: Column, mask: np.ndarray) -> Column:
+    """Keeps the rows where mask is true (a copy)."""
+    if isinstance(column, (DictionaryColumn, TextColumn)):
+        return column.compress(mask)
+    return column[mask]
+
+
+def read_forecast_snapshot(path: str) -> Tuple[Dict[str, Column], np.ndarray, str]:
+    """
+    Memory-maps a forecast snapshot and returns its columns, a mask of the complete
+    rows and the content hash recorded by the writer. Dates and numbers are
+    zero-copy views of the file, string columns are dictionary codes or offsets
+    into the mapped bytes, so the pages are shared by every worker process.
+    """
+    mm = np.memmap(path, dtype=np.uint8, mode="r")
+    if bytes(mm[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} is not a forecast snapshot")
+    (header_len,) = struct.unpack("<I", bytes(mm[len(MAGIC):len(MAGIC) + 4]))
+    start = len(MAGIC) + 4
+    header = json.loads(bytes(mm[start:start + header_len]))
+
+    rows = header["rows"]
+    valid = np.ones(rows, dtype=bool)
+    columns: Dict[str, Column] = {}
+    for name, meta in header["columns"].items():
+        block = mm[meta["offset"]:meta["offset"] + meta["nbytes"]]
+        kind = meta["kind"]
+        if kind == "date":
+            days = block.view(meta["dtype"])
+            valid &= ~np.isnat(days)
+            columns[name] = days
+        elif kind == "dictionary":
+            codes = block.view(meta["dtype"])
+            valid &= codes >= 0
+            columns[name] = DictionaryColumn(codes, header["dictionaries"][name])
+        elif kind == "numeric":
+            values = block.view(meta["dtype"])
+            valid &= ~np.isnan(values)
+            columns[name] = values
+        elif kind == "text":
+            offsets = block[:(rows + 1) * 8].view(meta["dtype"])
+            valid[meta.get("missing", [])] = False
+            columns[name] = TextColumn(offsets, block[(rows + 1) * 8:])
+        else:
+            raise ValueError(f"Unknown column kind {kind!r} in {path}")
+
+    return columns, valid, header["content_sha256"]
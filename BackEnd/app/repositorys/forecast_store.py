@@ -0,0 +1,300 @@
+from datetime import date
+import hashlib
+import io
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.models import WeatherData
+from app.repositorys.forecast_snapshot import (
+    Column,
+    DictionaryColumn,
+    TextColumn,
+    compress,
+    read_forecast_snapshot,
+    take,
+)
+from app.repositorys.location_index import LocationIndex
+
+DICTIONARY_COLUMNS = ["classification", "city_name"]
+TEXT_COLUMNS = ["sabia_message_en"]
+STRING_COLUMNS = DICTIONARY_COLUMNS + TEXT_COLUMNS
+FLOAT_COLUMNS = [
+    "latitude",
+    "longitude",
+    "T2M_prediction",
+    "T2M_MAX_prediction",
+    "T2M_MIN_prediction",
+    "WS2M_prediction",
+    "RH2M_prediction",
+]
+FIELD_ORDER = list(WeatherData.model_fields)
+EMPTY_ROWS = np.empty(0, dtype=np.intp)
+
+
+def city_key(name: str) -> str:
+    return name.lower()
+
+
+def coordinate_key(latitude: float, longitude: float) -> Tuple[float, float]:
+    return (round(latitude, 4), round(longitude, 4))
+
+
+class ForecastStore:
+    """
+    Immutable column-oriented snapshot of the classified forecast file.
+
+    Every column has the same length: dates as datetime64[D] and numbers as
+    float64 arrays, classification and city as DictionaryColumn (codes plus
+    distinct values) and the message as TextColumn (UTF-8 bytes plus offsets).
+    Loaded from the binary snapshot, all of them are views of the memory-mapped
+    file shared by every worker; strings are decoded only for the rows a
+    response renders. It can also be loaded from the CSV. A new
+    snapshot is built for every data version; readers keep a reference to the
+    instance they started with, so a reload never changes data mid-request.
+
+    Lookups go through indexes built once per snapshot: a date-sorted row
+    order plus hashes from normalized city name and rounded coordinate to
+    the rows of that key, each already sorted by date. A 7-day window is
+    then two binary searches over the key's rows. Distinct coordinates are
+    also held in a LocationIndex for nearest-location searches.
+    """
+
+    def __init__(self, columns: Dict[str, Column], version: int, content_hash: str = ""):
+        columns = dict(columns)
+        for c in DICTIONARY_COLUMNS:
+            if isinstance(columns[c], np.ndarray):
+                columns[c] = DictionaryColumn.from_values(columns[c])
+        for c in TEXT_COLUMNS:
+            if isinstance(columns[c], np.ndarray):
+                columns[c] = TextColumn.from_values(columns[c])
+        self.columns = columns
+        self.version = version
+        self.content_hash = content_hash
+        self._build_indexes()
+
+    def __len__(self) -> int:
+        return len(self.columns["date"])
+
+    @classmethod
+    def from_csv(cls, path: str, version: int) -> "ForecastStore":
+        with open(path, "rb") as f:
+            raw = f.read()
+        content_hash = hashlib.sha256(raw).hexdigest()
+        df = pd.read_csv(io.BytesIO(raw), encoding="utf-8", dtype={c: str for c in STRING_COLUMNS})
+
+        dates = pd.to_datetime(df["date"], errors="coerce")
+        numeric = {c: pd.to_numeric(df[c], errors="coerce") for c in FLOAT_COLUMNS}
+
+        valid = dates.notna()
+        for c in STRING_COLUMNS:
+            valid &= df[c].notna()
+        for c in FLOAT_COLUMNS:
+            valid &= numeric[c].notna()
+
+        columns: Dict[str, Column] = {"date": dates.to_numpy().astype("datetime64[D]")}
+        for c in DICTIONARY_COLUMNS:
+            columns[c] = DictionaryColumn.from_values(df[c].to_numpy(dtype=object))
+        for c in TEXT_COLUMNS:
+            columns[c] = TextColumn.from_values(df[c].to_numpy(dtype=object))
+        for c in FLOAT_COLUMNS:
+            columns[c] = numeric[c].to_numpy(dtype=np.float64)
+
+        return cls._from_columns(columns, valid.to_numpy(), version, content_hash)
+
+    @classmethod
+    def from_snapshot(cls, path: str, version: int) -> "ForecastStore":
+        columns, valid, content_hash = read_forecast_snapshot(path)
+        return cls._from_columns(columns, valid, version, content_hash)
+
+    @classmethod
+    def _from_columns(
+        cls, columns: Dict[str, Column], valid: np.ndarray, version: int, content_hash: str
+    ) -> "ForecastStore":
+        invalid_lines = np.flatnonzero(~valid)
+        if len(invalid_lines):
+            print(f"Error processing the lines {invalid_lines.tolist()}: missing or invalid values")
+            columns = {c: compress(values, valid) for c, values in columns.items()}
+        return cls(columns, version, content_hash)
+
+    def _build_indexes(self) -> None:
+        dates = self.columns["date"]
+        # Stable sort keeps the file order between rows of the same day.
+        self._date_order = np.argsort(dates, kind="stable")
+        self._sorted_dates = dates[self._date_order]
+
+        cols = self.columns
+        self._city_keys, self._city_ids = self._factorize_dictionary(city_key, cols["city_name"])
+        self._coord_keys, self._coord_ids = self._factorize(coordinate_key, cols["latitude"], cols["longitude"])
+        self._class_keys, self._class_ids = self._factorize_dictionary(str, cols["classification"])
+
+        self._city_rows = self._group_rows(self._city_ids, len(self._city_keys))
+        self._coord_rows = self._group_rows(self._coord_ids, len(self._coord_keys))
+        self._locations = LocationIndex(list(self._coord_keys))
+
+    @staticmethod
+    def _factorize(key_fn: Callable[..., object], *arrays: np.ndarray) -> Tuple[Dict[object, int], np.ndarray]:
+        # Normalize each distinct raw value once instead of once per row; keys keep
+        # the order in which they first appear in the file.
+        codes, uniques = pd.MultiIndex.from_arrays(arrays).factorize()
+        return ForecastStore._remap(key_fn, uniques.tolist(), codes)
+
+    @staticmethod
+    def _factorize_dictionary(
+        key_fn: Callable[[str], object], column: DictionaryColumn
+    ) -> Tuple[Dict[object, int], np.ndarray]:
+        # The dictionary already holds the distinct values; only the codes are remapped.
+        return ForecastStore._remap(key_fn, [(u,) for u in column.dictionary.tolist()], column.codes)
+
+    @staticmethod
+    def _remap(
+        key_fn: Callable[..., object], raw: List[tuple], codes: np.ndarray
+    ) -> Tuple[Dict[object, int], np.ndarray]:
+        mapping: Dict[object, int] = {}
+        remap = np.array([mapping.setdefault(key_fn(*u), len(mapping)) for u in raw], dtype=np.intp)
+        return mapping, remap[codes]
+
+    def city_names(self) -> List[str]:
+        """Distinct city names as written in the file, in order of first appearance."""
+        return self.columns["city_name"].dictionary.tolist()
+
+    def _group_rows(self, ids: np.ndarray, n_keys: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        # (rows, dates) of each key, in date order.
+        ordered_ids = ids[self._date_order]
+        by_key = np.argsort(ordered_ids, kind="stable")
+        bounds = np.searchsorted(ordered_ids[by_key], np.arange(n_keys + 1))
+        rows = self._date_order[by_key]
+        dates = self._sorted_dates[by_key]
+        return [
+            (rows[bounds[k]:bounds[k + 1]], dates[bounds[k]:bounds[k + 1]])
+            for k in range(n_keys)
+        ]
+
+    @staticmethod
+    def _window(
+        group: Tuple[np.ndarray, np.ndarray], start: Optional[date], end: Optional[date]
+    ) -> np.ndarray:
+        rows, dates = group
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"), "left")
+        hi = len(rows) if end is None else np.searchsorted(dates, np.datetime64(end, "D"), "right")
+        return rows[lo:hi]
+
+    def _classification_mask(self, label: str) -> np.ndarray:
+        # One entry per distinct classification text, e.g. "very_hot, very_uncomfortable".
+        label = label.strip().lower()
+        return np.array(
+            [label in (part.strip().lower() for part in text.split(",")) for text in self._class_keys],
+            dtype=bool,
+        )
+
+    def query(
+        self,
+        start: date,
+        end: date,
+        city: Optional[str] = None,
+        coordinate: Optional[Tuple[float, float]] = None,
+    ) -> np.ndarray:
+        """
+        Returns the row indices dated within [start, end], optionally restricted to a
+        city (case-insensitive) and/or a coordinate (rounded to 4 decimals), in file order.
+        """
+        city_id = coord_id = None
+        if city is not None:
+            city_id = self._city_keys.get(city_key(city))
+            if city_id is None:
+                return EMPTY_ROWS
+        if coordinate is not None:
+            coord_id = self._coord_keys.get(coordinate_key(*coordinate))
+            if coord_id is None:
+                return EMPTY_ROWS
+
+        if city_id is not None and coord_id is not None:
+            rows = self._window(self._city_rows[city_id], start, end)
+            rows = rows[self._coord_ids[rows] == coord_id]
+        elif city_id is not None:
+            rows = self._window(self._city_rows[city_id], start, end)
+        elif coord_id is not None:
+            rows = self._window(self._coord_rows[coord_id], start, end)
+        else:
+            rows = self._window((self._date_order, self._sorted_dates), start, end)
+        return np.sort(rows)
+
+    def select(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        city: Optional[str] = None,
+        classification: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Returns the row indices matching every given filter, in file order. Dates are an
+        inclusive range and either bound may be open; classification matches any of the
+        labels in a row's comma-separated classification.
+        """
+        group = (self._date_order, self._sorted_dates)
+        if city is not None:
+            city_id = self._city_keys.get(city_key(city))
+            if city_id is None:
+                return EMPTY_ROWS
+            group = self._city_rows[city_id]
+
+        rows = self._window(group, start, end)
+        if classification is not None:
+            rows = rows[self._classification_mask(classification)[self._class_ids[rows]]]
+        return np.sort(rows)
+
+    def query_nearest(
+        self,
+        start: date,
+        end: date,
+        latitude: float,
+        longitude: float,
+        k: Optional[int] = None,
+        radius_km: Optional[float] = None,
+        city: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Returns the row indices dated within [start, end] for the k nearest locations
+        and/or those within radius_km of the given point, nearest location first. With
+        a city, only that city's locations are candidates, so k counts matching locations.
+        """
+        city_id = allowed = None
+        if city is not None:
+            city_id = self._city_keys.get(city_key(city))
+            if city_id is None:
+                return EMPTY_ROWS
+            allowed = np.zeros(len(self._coord_keys), dtype=bool)
+            allowed[self._coord_ids[self._city_rows[city_id][0]]] = True
+
+        parts = []
+        for coord_id, _ in self._locations.nearest(latitude, longitude, k, radius_km, allowed):
+            rows = self._window(self._coord_rows[coord_id], start, end)
+            if city_id is not None:
+                rows = rows[self._city_ids[rows] == city_id]
+            parts.append(rows)
+        return np.concatenate(parts) if parts else EMPTY_ROWS
+
+    def fragments(self, indices: Optional[np.ndarray] = None) -> List[bytes]:
+        """
+        Renders the JSON object of each selected row (all rows by default). Only the
+        selected rows are read and decoded from the columns.
+        """
+        rows = np.arange(len(self)) if indices is None else np.asarray(indices, dtype=np.intp)
+        # Same settings as FastAPI's JSONResponse, so the bytes match what the
+        # WeatherData response_model used to produce.
+        dumps = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode
+        dates = np.datetime_as_string(self.columns["date"][rows], unit="D").tolist()
+        values = {c: take(self.columns[c], rows).tolist() for c in FIELD_ORDER[1:]}
+        fragments = []
+        for i, d in enumerate(dates):
+            record = {"date": d}
+            for c in FIELD_ORDER[1:]:
+                record[c] = values[c][i]
+            fragments.append(dumps(record).encode("utf-8"))
+        return fragments
+
+    def to_json(self, indices: Optional[np.ndarray] = None) -> bytes:
+        """
+        Serializes the selected rows (all rows by default) as a JSON array of WeatherData objects.
+        """
+        return b"[" + b",".join(self.fragments(indices)) + b"]"
@@ -0,0 +1,86 @@
+import importlib.util
+import os
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+# The great-circle distance is the data pipeline's (Data/load_dataset/geo.py), loaded
+# by file path so the API does not import the loader package.
+GEO_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "Data", "load_dataset", "geo.py")
+_spec = importlib.util.spec_from_file_location("sabia_geo", GEO_PATH)
+geo = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(geo)
+
+EARTH_RADIUS_KM = geo.EARTH_RADIUS_KM
+KM_PER_DEGREE_LAT = np.pi * EARTH_RADIUS_KM / 180.0
+# Half the Earth's circumference: no two points are farther apart.
+MAX_DISTANCE_KM = np.pi * EARTH_RADIUS_KM
+# First radius tried by k-nearest queries without radius_km; doubled until enough
+# locations are found.
+INITIAL_SEARCH_KM = 50.0
+
+
+class LocationIndex:
+    """
+    Nearest-neighbour index over the distinct forecast locations.
+
+    Locations are kept sorted by latitude, so a query with a radius only computes
+    distances for the latitude band that can contain a match (two binary searches).
+    A k-nearest query without a radius searches bands of growing radius until the
+    band holds k candidates within that radius, which are then the k nearest overall.
+    """
+
+    def __init__(self, coordinates: Sequence[Tuple[float, float]]):
+        coords = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        self._order = np.argsort(coords[:, 0], kind="stable")
+        self._lats = coords[self._order, 0]
+        self._lons = coords[self._order, 1]
+
+    def __len__(self) -> int:
+        return len(self._lats)
+
+    def _within(
+        self, latitude: float, longitude: float, radius_km: float, allowed: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # (sorted positions, distances) of the allowed locations within radius_km.
+        band = radius_km / KM_PER_DEGREE_LAT
+        lo = np.searchsorted(self._lats, latitude - band, "left")
+        hi = np.searchsorted(self._lats, latitude + band, "right")
+        candidates = np.arange(lo, hi)
+        dist = geo._haversine_km_np(latitude, longitude, self._lats[lo:hi], self._lons[lo:hi])
+        keep = dist <= radius_km
+        if allowed is not None:
+            keep &= np.asarray(allowed, dtype=bool)[self._order[candidates]]
+        return candidates[keep], dist[keep]
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: Optional[int] = None,
+        radius_km: Optional[float] = None,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Returns (location position, distance in km) pairs sorted by distance. With
+        radius_km only locations within that distance are kept; with allowed (a boolean
+        mask over location positions) only those locations are candidates; with k at
+        most k of the remaining candidates are returned.
+        """
+        if radius_km is not None or k is None:
+            candidates, dist = self._within(latitude, longitude, np.inf if radius_km is None else radius_km, allowed)
+        else:
+            search_km = INITIAL_SEARCH_KM
+            while True:
+                candidates, dist = self._within(latitude, longitude, search_km, allowed)
+                if len(dist) >= k or np.isinf(search_km):
+                    break
+                search_km = 2 * search_km if 2 * search_km < MAX_DISTANCE_KM else np.inf
+        if k is not None and k < len(dist):
+            top = np.argpartition(dist, k - 1)[:k]
+            dist, candidates = dist[top], candidates[top]
+
+        by_distance = np.argsort(dist, kind="stable")
+        return [
+            (int(self._order[candidates[i]]), float(dist[i]))
+            for i in by_distance
+        ]
@@ -1,40 +1,164 @@
-from datetime import date as dt_date, datetime, timedelta
-from typing import List
-from app.models import DataSearch,WeatherData
+import asyncio
+from datetime import date as dt_date, timedelta
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+import numpy as np
+from app.models import DataFilter, DataPageQuery, DataSearch
 from app.repositorys.dataInfo_repository import dataInfo_repository
+from app.repositorys.forecast_store import ForecastStore, city_key, coordinate_key
+from app.services.rendered_body import RenderedBody
+from app.services.response_cache import LRUTTLCache
+
+STREAM_CHUNK_ROWS = 500
+LOCATION_CACHE_ENTRIES = 4096
+LOCATION_CACHE_TTL_SECONDS = 600.0
+# The warmed default queries are recomputed well before their cache entries expire.
+WARM_REFRESH_SECONDS = LOCATION_CACHE_TTL_SECONDS / 2
+
+class LocationQuery(NamedTuple):
+    """A DataSearch reduced to what determines its result; used as the cache key."""
+    target_date: dt_date
+    city: Optional[str]
+    coordinate: Optional[Tuple[float, float]]
+    radius_km: Optional[float]
+    nearest: Optional[int]
 
 class DataInfoService:
 
-    async def get_all_data(self):
-        return await dataInfo_repository.load_data_info()
+    def __init__(self):
+        self._all_data: Optional[RenderedBody] = None
+        self._location_cache: LRUTTLCache[bytes] = LRUTTLCache(
+            LOCATION_CACHE_ENTRIES, LOCATION_CACHE_TTL_SECONDS
+        )
+        self._location_cache_version: Optional[int] = None
+        self.ready = False
+
+    async def warm_up(self) -> None:
+        """
+        Loads and indexes the forecast data, renders the full response and fills the
+        location cache with each city's default (today + 7 days) query, so the first
+        requests after a restart cost the same as any other.
+        """
+        await self.get_all_data_rendered()
+        await self.refresh_default_queries()
+        self.ready = True
+
+    async def refresh_default_queries(self) -> None:
+        """
+        Recomputes each city's default query and stores it with a fresh TTL, so the
+        warmed entries do not expire and follow the current date and data version.
+        """
+        store = await dataInfo_repository.get_store_async()
+        self._sync_cache_version(store)
+        for city in store.city_names():
+            query = self._normalize(DataSearch(name_city=city))
+            self._location_cache.put(query, store.to_json(self._find_rows(store, query)))
+
+    async def run_warm_up(self, refresh_seconds: float = WARM_REFRESH_SECONDS) -> None:
+        """
+        Background task started by the app lifespan: warms up, then keeps the default
+        queries fresh. The health check answers 503 until the warm-up has finished.
+        """
+        while not self.ready:
+            try:
+                await self.warm_up()
+            except Exception as e:
+                print(f"Warm-up failed, retrying in {refresh_seconds:.0f}s: {e}")
+                await asyncio.sleep(refresh_seconds)
+        while True:
+            await asyncio.sleep(refresh_seconds)
+            try:
+                await self.refresh_default_queries()
+            except Exception as e:
+                print(f"Refreshing the default queries failed: {e}")
+
+    async def get_all_data_rendered(self) -> RenderedBody:
+        store = await dataInfo_repository.get_store_async()
+        rendered = self._all_data
+        if rendered is None or rendered.version != store.version:
+            # Compression is CPU-bound; run it in the thread pool.
+            rendered = await asyncio.to_thread(
+                RenderedBody, store.to_json(), store.content_hash, store.version
+            )
+            self._all_data = rendered
+        return rendered
+
+    async def get_data_location_json(self, data: DataSearch) -> bytes:
+        store = await dataInfo_repository.get_store_async()
+        self._sync_cache_version(store)
+        query = self._normalize(data)
+        body = self._location_cache.get(query)
+        if body is None:
+            body = store.to_json(self._find_rows(store, query))
+            self._location_cache.put(query, body)
+        return body
+
+    def _sync_cache_version(self, store: ForecastStore) -> None:
+        if store.version != self._location_cache_version:
+            # New data was loaded: every cached answer is stale.
+            self._location_cache.clear()
+            self._location_cache_version = store.version
+
+    def location_cache_stats(self) -> Dict[str, float]:
+        return self._location_cache.stats()
 
-    async def get_data_location(self, data: DataSearch) -> List[WeatherData]:
-        print(data)
-        rows = await dataInfo_repository.load_data_info()
+    async def get_data_page_json(self, query: DataPageQuery) -> bytes:
+        store = await dataInfo_repository.get_store_async()
+        rows = self._select_rows(store, query)
+        total = len(rows)
+        page = rows[query.offset:query.offset + query.limit]
+        next_offset = query.offset + len(page)
+        header = '{"total":%d,"offset":%d,"limit":%d,"next_offset":%s,"items":' % (
+            total,
+            query.offset,
+            query.limit,
+            next_offset if next_offset < total else "null",
+        )
+        return header.encode("utf-8") + store.to_json(page) + b"}"
 
-        items: List[WeatherData] = [
-            r if isinstance(r, WeatherData) else WeatherData(**r) for r in rows
-        ]
+    async def stream_data_ndjson(self, filters: DataFilter) -> Iterator[bytes]:
+        # Resolve the snapshot and the matching rows up front; the rows are then
+        # sent in chunks without building the whole body in memory.
+        store = await dataInfo_repository.get_store_async()
+        rows = self._select_rows(store, filters)
 
-        target_date = data.date_wanted or dt_date.today()
-        
-        date_range = [target_date + timedelta(days=i) for i in range(7)]
+        def chunks() -> Iterator[bytes]:
+            for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+                fragments = store.fragments(rows[start:start + STREAM_CHUNK_ROWS])
+                yield b"\n".join(fragments) + b"\n"
 
-        def to_date(d):
-            return d.date() if isinstance(d, datetime) else d
+        return chunks()
 
-        filtered = [w for w in items if to_date(w.date) in date_range]
+    def _select_rows(self, store: ForecastStore, filters: DataFilter) -> np.ndarray:
+        return store.select(
+            start=filters.start_date,
+            end=filters.end_date,
+            city=filters.name_city or None,
+            classification=filters.classification or None,
+        )
 
-        if data.name_city:
-            filtered = [w for w in filtered if w.city_name.lower() == data.name_city.lower()]
+    def _normalize(self, data: DataSearch) -> LocationQuery:
+        coordinate = None
         if data.latitude is not None and data.longitude is not None:
-            filtered = [
-                w for w in filtered
-                if round(w.latitude, 4) == round(data.latitude, 4)
-                and round(w.longitude, 4) == round(data.longitude, 4)
-            ]
+            coordinate = coordinate_key(data.latitude, data.longitude)
+        return LocationQuery(
+            target_date=data.date_wanted or dt_date.today(),
+            city=city_key(data.name_city) if data.name_city else None,
+            coordinate=coordinate,
+            radius_km=data.radius_km,
+            nearest=data.nearest,
+        )
 
-            print(filtered)
-        return filtered
+    def _find_rows(self, store: ForecastStore, query: LocationQuery) -> np.ndarray:
+        end_date = query.target_date + timedelta(days=6)
+        if query.coordinate is not None and (query.radius_km is not None or query.nearest is not None):
+            return store.query_nearest(
+                query.target_date,
+                end_date,
+                *query.coordinate,
+                k=query.nearest,
+                radius_km=query.radius_km,
+                city=query.city,
+            )
+        return store.query(query.target_date, end_date, city=query.city, coordinate=query.coordinate)
 
-dataInfo_service = DataInfoService()
\ No newline at end of file
+dataInfo_service = DataInfoService()
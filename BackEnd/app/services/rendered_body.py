@@ -0,0 +1,64 @@
+import gzip
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Preferred content codings, best compression first.
+ENCODINGS = ("br", "gzip", "identity")
+
+
+class RenderedBody:
+    """
+    A response body rendered once per data version, with precompressed variants
+    and a strong ETag per content coding derived from the source file hash.
+    """
+
+    def __init__(self, body: bytes, content_hash: str, version: int):
+        self.version = version
+        self.bodies: Dict[str, bytes] = {
+            "identity": body,
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body)
+
+        tag = content_hash[:32]
+        self.etags: Dict[str, str] = {
+            encoding: f'"{tag}"' if encoding == "identity" else f'"{tag}-{encoding}"'
+            for encoding in self.bodies
+        }
+
+    def negotiate(self, accept_encoding: Optional[str]) -> str:
+        accepted: Dict[str, float] = {}
+        for item in (accept_encoding or "").split(","):
+            name, _, params = item.strip().partition(";")
+            q = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    q = float(params[2:])
+                except ValueError:
+                    q = 0.0
+            if name:
+                accepted[name.strip().lower()] = q
+
+        for encoding in ENCODINGS:
+            if encoding not in self.bodies:
+                continue
+            q = accepted.get(encoding, accepted.get("*", 1.0 if encoding == "identity" else 0.0))
+            if q > 0:
+                return encoding
+        return "identity"
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # Any coding of the same data version is the same content, so a client
+        # holding the gzip variant can revalidate against the identity ETag and vice versa.
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return not candidates.isdisjoint(self.etags.values())
@@ -0,0 +1,108 @@
+"""
+Before/after latency of the WeatherData response path (GetAllDataInfo and
+GetDataLocation): the original per-request CSV parse + WeatherData objects +
+FastAPI serialization (benchmarks/legacy_app.py) against the resident store
+that renders JSON straight from its columns (the full response once per file
+version).
+
+Run from BackEnd/:
+
+    python benchmarks/bench_serialization.py --repeat 50
+
+--repeat concatenates the shipped forecast CSV that many times to simulate a
+larger deployment. Both paths are checked to return the same bytes.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from app.repositorys.dataInfo_repository import DATA_PATH
+
+
+def timings_ms(fn: Callable[[], object], iterations: int) -> List[float]:
+    fn()  # warm-up
+    out = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def summary(name: str, before: List[float], after: List[float]) -> str:
+    b, a = statistics.median(before), statistics.median(after)
+    return f"{name:<34} {b:>10.2f} {a:>10.2f} {b / a:>9.1f}x"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1, help="times the shipped CSV is concatenated")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="sabia-bench-")
+    csv_path = os.path.join(tmp, "classified_weather_forecast.csv")
+    df = pd.read_csv(DATA_PATH, encoding="utf-8", dtype=str, keep_default_na=False)
+    pd.concat([df] * args.repeat).to_csv(csv_path, index=False, encoding="utf-8")
+
+    # Both apps read the scaled file: the legacy module through its env var, the
+    # current app through the repository singleton.
+    os.environ["SABIA_BENCH_CSV"] = csv_path
+    import legacy_app
+    from app.repositorys.dataInfo_repository import dataInfo_repository
+    from app.repositorys.forecast_store import ForecastStore
+    dataInfo_repository.path = csv_path
+    dataInfo_repository.snapshot_path = os.path.join(tmp, "missing.snapshot")
+    from main import app
+
+    first = df.iloc[0]
+    search = {"name_city": first["city_name"], "date_wanted": first["date"]}
+    results: Dict[str, tuple] = {}
+
+    # Serialization only: objects already built vs. columns already loaded.
+    records = legacy_app.load_data_info(csv_path)
+    t0 = time.perf_counter()
+    store = ForecastStore.from_csv(csv_path, version=0)
+    load_ms = (time.perf_counter() - t0) * 1000
+    legacy_body = json.dumps(jsonable_encoder(records), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert legacy_body == store.to_json(), "the two paths rendered different bytes"
+    results["serialize all rows"] = (
+        timings_ms(lambda: json.dumps(jsonable_encoder(records), ensure_ascii=False, separators=(",", ":")), args.iterations),
+        timings_ms(store.to_json, args.iterations),
+    )
+
+    with TestClient(legacy_app.app) as before, TestClient(app) as after:
+        identity = {"Accept-Encoding": "identity"}
+        for path in ("/infos/GetAllDataInfo",):
+            assert before.get(path).content == after.get(path, headers=identity).content
+        assert (
+            before.post("/infos/GetDataLocation", json=search).content
+            == after.post("/infos/GetDataLocation", json=search).content
+        )
+        results["GET /infos/GetAllDataInfo"] = (
+            timings_ms(lambda: before.get("/infos/GetAllDataInfo"), args.iterations),
+            timings_ms(lambda: after.get("/infos/GetAllDataInfo", headers=identity), args.iterations),
+        )
+        results["POST /infos/GetDataLocation"] = (
+            timings_ms(lambda: before.post("/infos/GetDataLocation", json=search), args.iterations),
+            timings_ms(lambda: after.post("/infos/GetDataLocation", json=search), args.iterations),
+        )
+
+    print(f"rows: {len(store)}  (shipped CSV x{args.repeat}); store load: {load_ms:.1f} ms once per file version")
+    print(f"{'median latency (ms)':<34} {'before':>10} {'after':>10} {'speedup':>10}")
+    for name, (b, a) in results.items():
+        print(summary(name, b, a))
+
+
+if __name__ == "__main__":
+    main()
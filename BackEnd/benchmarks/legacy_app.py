@@ -0,0 +1,65 @@
+"""
+The original request path, kept only as the "before" side of the benchmarks:
+the CSV is parsed and turned into WeatherData objects row by row on every request,
+and FastAPI validates and serializes the objects again through response_model.
+"""
+from datetime import date as dt_date, timedelta
+import os
+from typing import List
+import pandas as pd
+from fastapi import FastAPI
+from app.models import DataSearch, WeatherData
+from app.repositorys.dataInfo_repository import DATA_PATH
+
+CSV_PATH = os.environ.get("SABIA_BENCH_CSV", DATA_PATH)
+
+
+def load_data_info(path: str = CSV_PATH) -> List[WeatherData]:
+    df = pd.read_csv(path, encoding="utf-8")
+    infos = []
+    for index, row in df.iterrows():
+        try:
+            infos.append(WeatherData(
+                classification=row["classification"],
+                city_name=row["city_name"],
+                latitude=float(row["latitude"]),
+                longitude=float(row["longitude"]),
+                T2M_prediction=float(row["T2M_prediction"]),
+                T2M_MAX_prediction=float(row["T2M_MAX_prediction"]),
+                T2M_MIN_prediction=float(row["T2M_MIN_prediction"]),
+                WS2M_prediction=float(row["WS2M_prediction"]),
+                RH2M_prediction=float(row["RH2M_prediction"]),
+                date=pd.to_datetime(row["date"]).date(),
+                sabia_message_en=row["sabia_message_en"],
+            ))
+        except Exception as e:
+            print(f"Error processing the line {index}: {e}")
+    return infos
+
+
+def find_location(items: List[WeatherData], data: DataSearch) -> List[WeatherData]:
+    target_date = data.date_wanted or dt_date.today()
+    date_range = [target_date + timedelta(days=i) for i in range(7)]
+    filtered = [w for w in items if w.date in date_range]
+    if data.name_city:
+        filtered = [w for w in filtered if w.city_name.lower() == data.name_city.lower()]
+    if data.latitude is not None and data.longitude is not None:
+        filtered = [
+            w for w in filtered
+            if round(w.latitude, 4) == round(data.latitude, 4)
+            and round(w.longitude, 4) == round(data.longitude, 4)
+        ]
+    return filtered
+
+
+app = FastAPI(title="SabIA - Api (legacy request path)")
+
+
+@app.get("/infos/GetAllDataInfo")
+async def get_all_data_info():
+    return load_data_info()
+
+
+@app.post("/infos/GetDataLocation", response_model=List[WeatherData])
+async def get_data_location(data: DataSearch):
+    return find_location(load_data_info(), data)
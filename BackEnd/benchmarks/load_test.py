@@ -0,0 +1,121 @@
+"""
+Load test of the async endpoints: N concurrent clients against one uvicorn worker,
+for the original request path (benchmarks/legacy_app.py) and for the current app.
+
+Each client sends --requests requests, alternating GetAllDataInfo and
+GetDataLocation (one city, 7-day window). The script reports throughput and the
+p50/p99 latency of each app. Run from BackEnd/:
+
+    python benchmarks/load_test.py --clients 100 --requests 10
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+import httpx
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.repositorys.dataInfo_repository import DATA_PATH
+
+APPS = {
+    "before": ("legacy_app:app", os.path.join(BACKEND_DIR, "benchmarks")),
+    "after": ("main:app", BACKEND_DIR),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(target: str, app_dir: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([BACKEND_DIR, os.environ.get("PYTHONPATH", "")]))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", target, "--app-dir", app_dir, "--port", str(port),
+         "--workers", "1", "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/infos/GetAllDataInfo")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+async def run_clients(base_url: str, clients: int, requests: int, search: dict) -> Tuple[List[float], float, int]:
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as client:
+        async def one_client(offset: int) -> None:
+            nonlocal errors
+            for i in range(requests):
+                t0 = time.perf_counter()
+                if (i + offset) % 2:
+                    r = await client.post("/infos/GetDataLocation", json=search)
+                else:
+                    r = await client.get("/infos/GetAllDataInfo")
+                latencies.append(time.perf_counter() - t0)
+                errors += r.status_code != 200
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one_client(c) for c in range(clients)))
+        elapsed = time.perf_counter() - t0
+    return latencies, elapsed, errors
+
+
+def percentile(values: List[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=10, help="requests per client")
+    parser.add_argument("--apps", nargs="+", choices=list(APPS), default=list(APPS))
+    args = parser.parse_args()
+
+    first = pd.read_csv(DATA_PATH, encoding="utf-8", nrows=1).iloc[0]
+    search = {"name_city": first["city_name"], "date_wanted": first["date"]}
+
+    print(f"{args.clients} clients x {args.requests} requests, one uvicorn worker")
+    print(f"{'app':<8} {'req/s':>8} {'p50 (s)':>9} {'p99 (s)':>9} {'errors':>7}")
+    for name in args.apps:
+        target, app_dir = APPS[name]
+        port = free_port()
+        server = start_server(target, app_dir, port)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            asyncio.run(wait_ready(base_url))
+            latencies, elapsed, errors = asyncio.run(run_clients(base_url, args.clients, args.requests, search))
+        finally:
+            server.terminate()
+            server.wait()
+        print(
+            f"{name:<8} {len(latencies) / elapsed:>8.1f} {statistics.median(latencies):>9.3f} "
+            f"{percentile(latencies, 99):>9.3f} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
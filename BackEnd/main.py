@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -5,11 +7,24 @@ from app import (
     dataInfo_router,
     health_router,
 )
+from app.services import dataInfo_service
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load, index and pre-render the forecast data in the background; the health
+    # check answers 503 "starting" until it is done, then the default queries are
+    # refreshed on a timer so they never expire from the cache.
+    warm_up = asyncio.create_task(dataInfo_service.run_warm_up())
+    yield
+    warm_up.cancel()
+    with suppress(asyncio.CancelledError):
+        await warm_up
 
 app = FastAPI(
     title="SabIA - Api",
     description="SabIA Api - Trem de AI Project",
     version="1.0.0",
+    lifespan=lifespan,
     )
 
 app.add_middleware(
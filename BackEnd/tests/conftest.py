@@ -0,0 +1,63 @@
+import os
+import sys
+import pytest
+
+# The app is imported as `app.*`, as uvicorn does when started from BackEnd/.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CSV_HEADER = (
+    "date,classification,city_name,latitude,longitude,T2M_prediction,T2M_MAX_prediction,"
+    "T2M_MIN_prediction,WS2M_prediction,RH2M_prediction,sabia_message_en\n"
+)
+CITIES = [("Uberlândia", -18.9186, -48.2772), ("São Paulo", -23.5505, -46.6333), ("Recife", -8.0476, -34.877)]
+LABELS = ["normal", "very_hot", "rain, windy"]
+
+
+def forecast_csv_text(days: int = 10, t2m: float = 25.0) -> str:
+    """A small classified forecast: every city on every day from 2025-10-01, labels cycling."""
+    lines = [CSV_HEADER]
+    for day in range(days):
+        for i, (name, lat, lon) in enumerate(CITIES):
+            label = LABELS[(day + i) % len(LABELS)]
+            lines.append(
+                f'2025-10-{day + 1:02d},"{label}",{name},{lat},{lon},'
+                f"{t2m + day},{t2m + day + 5},{t2m + day - 5},2.5,60.0,Day {day + 1} in {name}\n"
+            )
+    return "".join(lines)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def rewrite(path, text: str) -> None:
+    """Replaces a data file and moves its mtime forward, as a deploy would."""
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+@pytest.fixture
+def forecast_csv(tmp_path, monkeypatch):
+    """Points the repository at a temporary CSV and resets the service caches."""
+    from app.repositorys.dataInfo_repository import dataInfo_repository
+    from app.services import dataInfo_service
+    from app.services.dataInfo_service import LOCATION_CACHE_ENTRIES, LOCATION_CACHE_TTL_SECONDS
+    from app.services.response_cache import LRUTTLCache
+
+    path = tmp_path / "classified_weather_forecast.csv"
+    path.write_text(forecast_csv_text(), encoding="utf-8")
+    monkeypatch.setattr(dataInfo_repository, "path", str(path))
+    monkeypatch.setattr(dataInfo_repository, "snapshot_path", str(tmp_path / "missing.snapshot"))
+    monkeypatch.setattr(dataInfo_repository, "check_interval", 0.0)
+    monkeypatch.setattr(dataInfo_repository, "_store", None)
+    monkeypatch.setattr(dataInfo_service, "_all_data", None)
+    monkeypatch.setattr(
+        dataInfo_service, "_location_cache", LRUTTLCache(LOCATION_CACHE_ENTRIES, LOCATION_CACHE_TTL_SECONDS)
+    )
+    monkeypatch.setattr(dataInfo_service, "_location_cache_version", None)
+    return path
@@ -0,0 +1,77 @@
+import gzip
+import hashlib
+from fastapi.testclient import TestClient
+from app.services.rendered_body import RenderedBody
+from conftest import rewrite
+from main import app
+
+
+def test_etag_is_the_content_hash_and_revalidates_with_304(forecast_csv):
+    client = TestClient(app)
+    response = client.get("/infos/GetAllDataInfo", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag == '"%s"' % hashlib.sha256(forecast_csv.read_bytes()).hexdigest()[:32]
+    assert response.headers["cache-control"] == "no-cache"
+    assert len(response.json()) == 30
+
+    not_modified = client.get("/infos/GetAllDataInfo", headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    # A weak validator and a list of tags match too; a stale tag does not.
+    assert client.get("/infos/GetAllDataInfo", headers={"If-None-Match": f'"old", W/{etag}'}).status_code == 304
+    assert client.get("/infos/GetAllDataInfo", headers={"If-None-Match": '"old"'}).status_code == 200
+
+
+def test_gzip_variant_has_its_own_etag_and_same_content(forecast_csv):
+    client = TestClient(app)
+    identity = client.get("/infos/GetAllDataInfo", headers={"Accept-Encoding": "identity"})
+    # httpx decodes the body; the raw stream is what went over the wire.
+    with client.stream("GET", "/infos/GetAllDataInfo", headers={"Accept-Encoding": "gzip"}) as compressed:
+        raw = b"".join(compressed.iter_raw())
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in compressed.headers["vary"]
+        gzip_etag = compressed.headers["etag"]
+    assert gzip.decompress(raw) == identity.content
+    assert gzip_etag == identity.headers["etag"][:-1] + '-gzip"'
+
+    # Either coding's tag revalidates the other, since the data is the same.
+    response = client.get("/infos/GetAllDataInfo", headers={"If-None-Match": identity.headers["etag"], "Accept-Encoding": "gzip"})
+    assert response.status_code == 304
+    assert response.headers["etag"] == gzip_etag
+
+
+def test_etag_changes_with_the_data(forecast_csv):
+    client = TestClient(app)
+    etag = client.get("/infos/GetAllDataInfo").headers["etag"]
+    rewrite(forecast_csv, forecast_csv.read_text(encoding="utf-8").replace("Day 1 ", "First day "))
+    response = client.get("/infos/GetAllDataInfo", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_negotiate_prefers_the_best_accepted_coding():
+    rendered = RenderedBody(b"[]", "0" * 64, version=1)
+    best = "br" if "br" in rendered.bodies else "gzip"
+    assert rendered.negotiate(None) == "identity"
+    assert rendered.negotiate("") == "identity"
+    assert rendered.negotiate("gzip") == "gzip"
+    assert rendered.negotiate("gzip, deflate, br") == best
+    assert rendered.negotiate("br;q=0, gzip;q=0.5") == "gzip"
+    assert rendered.negotiate("gzip;q=0") == "identity"
+    assert rendered.negotiate("*") == best
+    assert rendered.negotiate("gzip;q=bogus") == "identity"
+    assert rendered.negotiate("deflate") == "identity"
+
+
+def test_matches_any_coding_of_the_same_version():
+    rendered = RenderedBody(b"[]", "ab" * 32, version=1)
+    assert not rendered.matches(None)
+    assert not rendered.matches("")
+    assert rendered.matches("*")
+    for tag in rendered.etags.values():
+        assert rendered.matches(tag)
+        assert rendered.matches("W/" + tag)
+    assert not rendered.matches('"%s"' % ("cd" * 16))
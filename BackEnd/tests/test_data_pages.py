@@ -0,0 +1,81 @@
+import asyncio
+import importlib
+import json
+from fastapi.testclient import TestClient
+from app.models import DataFilter
+from app.services import dataInfo_service
+from main import app
+
+# The package re-exports the singleton under the module's name.
+service_module = importlib.import_module("app.services.dataInfo_service")
+
+
+def test_pages_walk_all_rows_in_file_order(forecast_csv):
+    client = TestClient(app)
+    everything = client.get("/infos/GetAllDataInfo").json()
+    items, offset = [], 0
+    while offset is not None:
+        page = client.get("/infos/GetDataInfoPage", params={"offset": offset, "limit": 7}).json()
+        assert page["total"] == 30
+        assert page["offset"] == offset
+        assert page["limit"] == 7
+        assert len(page["items"]) == min(7, 30 - offset)
+        items += page["items"]
+        offset = page["next_offset"]
+    assert items == everything
+
+
+def test_page_past_the_end_is_empty(forecast_csv):
+    page = TestClient(app).get("/infos/GetDataInfoPage", params={"offset": 30}).json()
+    assert page == {"total": 30, "offset": 30, "limit": 100, "next_offset": None, "items": []}
+
+
+def test_page_bounds_are_validated(forecast_csv):
+    client = TestClient(app)
+    for params in ({"offset": -1}, {"limit": 0}, {"limit": 1001}, {"limit": "many"}):
+        assert client.get("/infos/GetDataInfoPage", params=params).status_code == 422
+    assert len(client.get("/infos/GetDataInfoPage", params={"limit": 1000}).json()["items"]) == 30
+
+
+def test_page_filters_by_classification_city_and_dates(forecast_csv):
+    client = TestClient(app)
+    # "rain, windy" rows match either label, case-insensitively.
+    for label in ("windy", "RAIN"):
+        page = client.get("/infos/GetDataInfoPage", params={"classification": label}).json()
+        assert page["total"] == 10
+        assert all(item["classification"] == "rain, windy" for item in page["items"])
+    assert client.get("/infos/GetDataInfoPage", params={"classification": "rain, windy"}).json()["total"] == 0
+
+    page = client.get(
+        "/infos/GetDataInfoPage",
+        params={"name_city": "recife", "start_date": "2025-10-03", "end_date": "2025-10-05", "classification": "normal"},
+    ).json()
+    assert [(item["city_name"], item["date"]) for item in page["items"]] == [("Recife", "2025-10-05")]
+
+
+def test_stream_is_one_json_object_per_line(forecast_csv, monkeypatch):
+    monkeypatch.setattr(service_module, "STREAM_CHUNK_ROWS", 4)
+    client = TestClient(app)
+    with client.stream("GET", "/infos/StreamDataInfo", params={"classification": "normal"}) as response:
+        assert response.headers["content-type"] == "application/x-ndjson"
+        body = b"".join(response.iter_bytes())
+    assert body.endswith(b"\n")
+    lines = body.split(b"\n")[:-1]
+    assert all(lines)
+    streamed = [json.loads(line) for line in lines]
+    page = client.get("/infos/GetDataInfoPage", params={"classification": "normal"}).json()
+    assert streamed == page["items"]
+    assert len(streamed) == 10
+
+
+def test_stream_chunks_end_on_a_row_boundary(forecast_csv, monkeypatch):
+    monkeypatch.setattr(service_module, "STREAM_CHUNK_ROWS", 4)
+    chunks = list(asyncio.run(dataInfo_service.stream_data_ndjson(DataFilter())))
+    assert [chunk.count(b"\n") for chunk in chunks] == [4] * 7 + [2]
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+
+
+def test_empty_stream(forecast_csv):
+    response = TestClient(app).get("/infos/StreamDataInfo", params={"name_city": "Atlantis"})
+    assert response.status_code == 200
+    assert response.content == b""
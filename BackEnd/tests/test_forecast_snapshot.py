@@ -0,0 +1,66 @@
+import hashlib
+import importlib.util
+import os
+import numpy as np
+import pandas as pd
+from app.repositorys.dataInfo_repository import DATA_PATH
+from app.repositorys.forecast_snapshot import DictionaryColumn, TextColumn
+from app.repositorys.forecast_store import ForecastStore
+
+# The writer lives in the data pipeline (Data/forecast_snapshot.py).
+WRITER_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "Data", "forecast_snapshot.py")
+spec = importlib.util.spec_from_file_location("data_forecast_snapshot", WRITER_PATH)
+writer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(writer)
+
+
+def is_mapped_view(array: np.ndarray) -> bool:
+    return not array.flags.owndata and not array.flags.writeable
+
+
+def write_snapshot(csv_path: str, snapshot_path: str) -> str:
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    df = pd.read_csv(csv_path, encoding="utf-8")
+    return writer.write_forecast_snapshot(df, snapshot_path, hashlib.sha256(raw).hexdigest())
+
+
+def test_snapshot_serves_the_same_bytes_and_etag_as_the_csv(tmp_path):
+    snapshot_path = str(tmp_path / "forecast.snapshot")
+    write_snapshot(DATA_PATH, snapshot_path)
+    from_csv = ForecastStore.from_csv(DATA_PATH, version=1)
+    from_snapshot = ForecastStore.from_snapshot(snapshot_path, version=2)
+
+    assert from_snapshot.to_json() == from_csv.to_json()
+    assert from_snapshot.content_hash == from_csv.content_hash
+    rows = np.array([5, 0, 42])
+    assert from_snapshot.to_json(rows) == from_csv.to_json(rows)
+    assert from_snapshot.city_names() == from_csv.city_names()
+
+
+def test_snapshot_columns_are_views_of_the_mapped_file(tmp_path):
+    snapshot_path = str(tmp_path / "forecast.snapshot")
+    write_snapshot(DATA_PATH, snapshot_path)
+    columns = ForecastStore.from_snapshot(snapshot_path, version=1).columns
+
+    assert columns["date"].dtype == np.dtype("datetime64[D]") and is_mapped_view(columns["date"])
+    assert columns["T2M_prediction"].dtype == np.float64 and is_mapped_view(columns["T2M_prediction"])
+    assert isinstance(columns["city_name"], DictionaryColumn) and is_mapped_view(columns["city_name"].codes)
+    message = columns["sabia_message_en"]
+    assert isinstance(message, TextColumn)
+    assert is_mapped_view(message.offsets) and is_mapped_view(message.blob)
+
+
+def test_default_hash_matches_the_csv_written_from_the_same_frame(tmp_path):
+    df = pd.read_csv(DATA_PATH, encoding="utf-8")
+    df.loc[3, "sabia_message_en"] = None  # incomplete row, dropped by both loaders
+    csv_path = str(tmp_path / "forecast.csv")
+    df.to_csv(csv_path, index=False)
+    snapshot_path = str(tmp_path / "forecast.snapshot")
+    writer.write_forecast_snapshot(df, snapshot_path)
+
+    from_csv = ForecastStore.from_csv(csv_path, version=1)
+    from_snapshot = ForecastStore.from_snapshot(snapshot_path, version=2)
+    assert len(from_snapshot) == len(df) - 1
+    assert from_snapshot.content_hash == from_csv.content_hash
+    assert from_snapshot.to_json() == from_csv.to_json()
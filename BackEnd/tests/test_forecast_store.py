@@ -0,0 +1,60 @@
+from datetime import date
+import numpy as np
+from app.repositorys.forecast_snapshot import take
+from app.repositorys.forecast_store import FIELD_ORDER, FLOAT_COLUMNS, ForecastStore
+
+# (city, latitude, longitude): "Alpha" has a near and a far location, "Beta" sits
+# right next to the query point.
+LOCATIONS = [
+    ("Beta", -18.9000, -48.2800),
+    ("Alpha", -19.5000, -48.9000),
+    ("Alpha", -25.0000, -50.0000),
+]
+DAYS = [date(2025, 10, 1), date(2025, 10, 2), date(2025, 10, 3)]
+POINT = (-18.9186, -48.2772)
+
+
+def make_store() -> ForecastStore:
+    rows = [(d, city, lat, lon) for city, lat, lon in LOCATIONS for d in DAYS]
+    columns = {
+        "date": np.array([r[0] for r in rows], dtype="datetime64[D]"),
+        "classification": np.array(["normal"] * len(rows), dtype=object),
+        "city_name": np.array([r[1] for r in rows], dtype=object),
+        "latitude": np.array([r[2] for r in rows], dtype=np.float64),
+        "longitude": np.array([r[3] for r in rows], dtype=np.float64),
+        "sabia_message_en": np.array(["hi"] * len(rows), dtype=object),
+    }
+    for c in FLOAT_COLUMNS[2:]:
+        columns[c] = np.zeros(len(rows), dtype=np.float64)
+    assert set(columns) == set(FIELD_ORDER)
+    return ForecastStore(columns, version=1)
+
+
+def locations(store: ForecastStore, rows: np.ndarray):
+    cols = store.columns
+    return list(dict.fromkeys(zip(take(cols["city_name"], rows), cols["latitude"][rows])))
+
+
+def test_nearest_without_city_takes_the_closest_location():
+    store = make_store()
+    rows = store.query_nearest(DAYS[0], DAYS[-1], *POINT, k=1)
+    assert locations(store, rows) == [("Beta", -18.9)]
+    assert len(rows) == len(DAYS)
+
+
+def test_nearest_with_city_counts_only_matching_locations():
+    store = make_store()
+    rows = store.query_nearest(DAYS[0], DAYS[-1], *POINT, k=1, city="alpha")
+    assert locations(store, rows) == [("Alpha", -19.5)]
+
+    rows = store.query_nearest(DAYS[0], DAYS[-1], *POINT, k=2, city="Alpha")
+    assert locations(store, rows) == [("Alpha", -19.5), ("Alpha", -25.0)]
+
+
+def test_nearest_with_city_and_radius():
+    store = make_store()
+    rows = store.query_nearest(DAYS[0], DAYS[0], *POINT, k=5, radius_km=150, city="Alpha")
+    assert locations(store, rows) == [("Alpha", -19.5)]
+    assert len(rows) == 1
+    assert len(store.query_nearest(DAYS[0], DAYS[-1], *POINT, radius_km=10, city="Alpha")) == 0
+    assert len(store.query_nearest(DAYS[0], DAYS[-1], *POINT, k=1, city="Gamma")) == 0
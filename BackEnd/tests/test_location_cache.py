@@ -0,0 +1,52 @@
+from fastapi.testclient import TestClient
+from app.services import dataInfo_service
+from app.services.response_cache import LRUTTLCache
+from conftest import FakeClock, forecast_csv_text, rewrite
+from main import app
+
+SEARCH = {"name_city": "Recife", "date_wanted": "2025-10-02"}
+
+
+def stats(client: TestClient) -> dict:
+    return client.get("/cache-stats").json()["GetDataLocation"]
+
+
+def test_cache_stats_count_hits_and_misses(forecast_csv):
+    client = TestClient(app)
+    first = client.post("/infos/GetDataLocation", json=SEARCH)
+    assert [item["date"] for item in first.json()] == [f"2025-10-{d:02d}" for d in range(2, 9)]
+    # The city name is case-insensitive, so this is the same cache key.
+    assert client.post("/infos/GetDataLocation", json={**SEARCH, "name_city": "RECIFE"}).content == first.content
+    client.post("/infos/GetDataLocation", json={**SEARCH, "date_wanted": "2025-10-03"})
+
+    s = stats(client)
+    assert (s["entries"], s["hits"], s["misses"]) == (2, 1, 2)
+    assert s["hit_ratio"] == 1 / 3
+    assert s["max_entries"] == dataInfo_service._location_cache.max_entries
+
+
+def test_new_data_version_clears_the_cache(forecast_csv):
+    client = TestClient(app)
+    before = client.post("/infos/GetDataLocation", json=SEARCH).json()
+    client.post("/infos/GetDataLocation", json=SEARCH)
+    assert stats(client)["hits"] == 1
+
+    rewrite(forecast_csv, forecast_csv_text(t2m=30.0))
+    after = client.post("/infos/GetDataLocation", json=SEARCH).json()
+    assert after[0]["T2M_prediction"] == before[0]["T2M_prediction"] + 5
+    s = stats(client)
+    assert (s["invalidations"], s["entries"], s["misses"]) == (1, 1, 2)
+
+
+def test_entries_expire_and_the_oldest_is_evicted(forecast_csv, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(dataInfo_service, "_location_cache", LRUTTLCache(2, 60.0, clock=clock))
+    client = TestClient(app)
+    for day in ("2025-10-01", "2025-10-02", "2025-10-03"):
+        client.post("/infos/GetDataLocation", json={**SEARCH, "date_wanted": day})
+    assert stats(client)["evictions"] == 1
+
+    clock.now = 61.0
+    client.post("/infos/GetDataLocation", json={**SEARCH, "date_wanted": "2025-10-03"})
+    s = stats(client)
+    assert (s["expirations"], s["hits"], s["misses"], s["ttl_seconds"]) == (1, 0, 4, 60.0)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.repositorys.location_index import LocationIndex, geo
+from main import app
+
+
+def brute_force(points, latitude, longitude, k=None, radius_km=None, allowed=None):
+    dist = geo._haversine_km_np(latitude, longitude, points[:, 0], points[:, 1])
+    order = [i for i in np.argsort(dist, kind="stable") if allowed is None or allowed[i]]
+    if radius_km is not None:
+        order = [i for i in order if dist[i] <= radius_km]
+    return order if k is None else order[:k]
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(7)
+    # Dense cluster (Brazil) plus a few far away points, including near the poles.
+    brazil = np.column_stack([rng.uniform(-33, 5, 2000), rng.uniform(-73, -35, 2000)])
+    world = np.column_stack([rng.uniform(-89, 89, 50), rng.uniform(-180, 180, 50)])
+    return np.round(np.vstack([brazil, world]), 4)
+
+
+@pytest.mark.parametrize("k", [1, 5, 40])
+@pytest.mark.parametrize("query", [(-18.9186, -48.2772), (48.85, 2.35), (-89.5, 10.0)])
+def test_k_nearest_matches_brute_force(points, k, query):
+    index = LocationIndex(list(map(tuple, points)))
+    found = [pos for pos, _ in index.nearest(*query, k=k)]
+    assert found == brute_force(points, *query, k=k)
+
+
+def test_k_nearest_with_allowed_mask_and_radius(points):
+    index = LocationIndex(list(map(tuple, points)))
+    allowed = np.zeros(len(points), dtype=bool)
+    allowed[-50:] = True  # only the points spread around the world
+    query = (-18.9186, -48.2772)
+    assert [p for p, _ in index.nearest(*query, k=3, allowed=allowed)] == brute_force(points, *query, k=3, allowed=allowed)
+    assert [p for p, _ in index.nearest(*query, radius_km=200)] == brute_force(points, *query, radius_km=200)
+    assert index.nearest(*query, k=3, radius_km=1, allowed=allowed) == []
+    # More than there are: every allowed location, nearest first.
+    assert len(index.nearest(*query, k=100, allowed=allowed)) == 50
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"radius_km": 50},
+        {"nearest": 3, "latitude": -18.9},
+        {"nearest": 1, "name_city": "Uberlândia"},
+    ],
+)
+def test_nearest_search_without_a_point_is_rejected(body):
+    # No lifespan: the request is rejected by validation before the data is needed.
+    response = TestClient(app).post("/infos/GetDataLocation", json=body)
+    assert response.status_code == 422
+    assert "require latitude and longitude" in response.text
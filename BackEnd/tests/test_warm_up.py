@@ -0,0 +1,48 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.models import DataSearch
+from app.repositorys.dataInfo_repository import dataInfo_repository
+from app.services import dataInfo_service
+from app.services.dataInfo_service import LOCATION_CACHE_ENTRIES, LOCATION_CACHE_TTL_SECONDS
+from app.services.response_cache import LRUTTLCache
+from conftest import FakeClock
+from main import app
+
+
+def test_health_reports_starting_until_warm(monkeypatch):
+    # Without the lifespan, so the background warm-up cannot flip the flag.
+    client = TestClient(app)
+    monkeypatch.setattr(dataInfo_service, "ready", False)
+    response = client.get("/")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting"}
+
+    monkeypatch.setattr(dataInfo_service, "ready", True)
+    assert client.get("/").status_code == 200
+
+
+def test_lifespan_serves_while_warming_up():
+    with TestClient(app) as client:
+        response = client.get("/infos/GetAllDataInfo")
+        assert response.status_code == 200
+
+
+def test_warmed_queries_are_refreshed_before_they_expire(monkeypatch):
+    clock = FakeClock()
+    cache = LRUTTLCache(LOCATION_CACHE_ENTRIES, LOCATION_CACHE_TTL_SECONDS, clock=clock)
+    monkeypatch.setattr(dataInfo_service, "_location_cache", cache)
+    monkeypatch.setattr(dataInfo_service, "_location_cache_version", None)
+    monkeypatch.setattr(dataInfo_service, "ready", False)
+
+    asyncio.run(dataInfo_service.warm_up())
+    cities = dataInfo_repository.get_store().city_names()
+    assert dataInfo_service.ready
+    assert cache.stats()["entries"] == len(cities)
+
+    # Without the refresh every warmed entry would be gone after the TTL.
+    clock.now = LOCATION_CACHE_TTL_SECONDS / 2
+    asyncio.run(dataInfo_service.refresh_default_queries())
+    clock.now = LOCATION_CACHE_TTL_SECONDS * 1.2
+    for city in cities:
+        assert cache.get(dataInfo_service._normalize(DataSearch(name_city=city))) is not None
+    assert cache.stats()["expirations"] == 0
@@ -0,0 +1,64 @@
+"""
+Tempo de parse dos índices SOI, MEI.v2 e ONI: leitores antigos (read_csv com engine
+'python', skiprows/skipfooter fixos e datas montadas como texto, em
+tests/legacy_noaa_index.py) contra load_dataset.noaa_index, nas amostras de
+tests/data. Os dois caminhos são conferidos para devolver o mesmo DataFrame.
+
+Execute nesta pasta (Data/):
+
+    python benchmarks/bench_noaa_index.py --iterations 50
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+DATA_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.join(DATA_ROOT, "tests")
+sys.path.insert(0, DATA_ROOT)
+sys.path.insert(0, TESTS_DIR)
+
+import pandas as pd
+
+from legacy_noaa_index import legacy_mei_v2, legacy_oni, legacy_soi
+from load_dataset.noaa_index import parse_monthly_index, parse_seasonal_index
+from load_dataset.soi_data import SOI_MISSING
+
+
+def timings_ms(fn: Callable[[], object], iterations: int) -> List[float]:
+    fn()  # aquecimento
+    out = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    cases = [
+        ("SOI", "soi.txt", legacy_soi,
+         lambda text: parse_monthly_index(text, "SOI", section="STANDARDIZED", missing=SOI_MISSING)),
+        ("MEI.v2", "meiv2.data", legacy_mei_v2, lambda text: parse_monthly_index(text, "MEI_V2")),
+        ("ONI", "oni.ascii.txt", legacy_oni, lambda text: parse_seasonal_index(text, "ANOM")),
+    ]
+    print(f"{'índice':<8} {'linhas':>7} {'antigo (ms)':>12} {'novo (ms)':>10} {'ganho':>7}")
+    for name, filename, legacy, new in cases:
+        with open(os.path.join(TESTS_DIR, "data", filename), encoding="utf-8") as f:
+            text = f.read()
+        pd.testing.assert_frame_equal(new(text), legacy(io.StringIO(text)), check_freq=False)
+        old_ms = statistics.median(timings_ms(lambda: legacy(io.StringIO(text)), args.iterations))
+        new_ms = statistics.median(timings_ms(lambda: new(text), args.iterations))
+        lines = text.count("\n")
+        print(f"{name:<8} {lines:>7} {old_ms:>12.2f} {new_ms:>10.2f} {old_ms / new_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Limiares climatológicos por localização e dia do ano, calculados a partir do histórico
+diário da NASA POWER.
+
+Para cada localização e cada dia do ano (calendário de 366 dias), o limiar
+"<VAR>_P<pct>" é o percentil `pct` da variável VAR em todos os anos do histórico,
+considerando uma janela de ±window_days dias em torno daquele dia. A tabela fica em um
+único array float32 (localização x 366 x limiar), então a consulta na classificação é
+só indexação de arrays.
+"""
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Limiares usados pelas regras relativas do WeatherClassifier.
+DEFAULT_THRESHOLDS = ("T2M_MAX_P90", "T2M_MIN_P10", "WS2M_P90", "RH2M_P90", "T2M_P90", "RH2M_P80")
+DEFAULT_WINDOW_DAYS = 7
+DAYS_PER_YEAR = 366
+# Valor de preenchimento da POWER para dados ausentes.
+POWER_FILL_VALUE = -999.0
+# Casas decimais usadas para casar coordenadas (mesmo arredondamento do BackEnd).
+COORDINATE_DECIMALS = 4
+
+
+def _parse_threshold(name: str) -> Tuple[str, float]:
+    variable, _, pct = name.rpartition("_P")
+    if not variable or not pct:
+        raise ValueError(f"Limiar inválido: '{name}' (esperado <VAR>_P<percentil>, ex: T2M_MAX_P90).")
+    return variable, float(pct)
+
+
+def day_of_year_366(dates) -> np.ndarray:
+    """
+    Dia do ano (1 a 366) em um calendário bissexto fixo: 1º de março é sempre o dia 61,
+    de modo que o mesmo dia do calendário cai na mesma posição em todos os anos.
+
+    Args:
+        dates: Datas (qualquer formato aceito por pd.to_datetime).
+
+    Returns:
+        np.ndarray: Dia do ano de cada data (int64); 0 para datas ausentes (NaT) ou inválidas.
+    """
+    # As datas se repetem muito (várias localizações por dia): converte só os valores distintos.
+    codes, uniques = pd.factorize(np.asarray(dates))
+    idx = pd.DatetimeIndex(pd.to_datetime(uniques, errors="coerce"))
+    valid = ~idx.isna()
+    doy = np.zeros(len(idx) + 1, dtype=np.int64)
+    doy[:-1][valid] = idx.dayofyear[valid] + ((~idx.is_leap_year) & (idx.month > 2))[valid]
+    # factorize devolve -1 para valores ausentes, que cai na última posição (0).
+    return doy[codes]
+
+
+def _nanpercentile(window: np.ndarray, percentiles: Sequence[float]) -> np.ndarray:
+    # np.nanpercentile (interpolação linear) por coluna, com uma ordenação só para todos
+    # os percentis; NaN vão para o fim de cada coluna. Colunas sem dados resultam em NaN.
+    ordered = np.sort(window, axis=0)
+    count = np.sum(~np.isnan(window), axis=0)
+    cols = np.arange(window.shape[1])
+    out = np.full((len(percentiles), window.shape[1]), np.nan)
+    has_data = count > 0
+    for j, pct in enumerate(percentiles):
+        pos = (count - 1) * (pct / 100.0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, np.maximum(count - 1, 0))
+        lo = np.maximum(lo, 0)
+        frac = pos - np.floor(pos)
+        low, high = ordered[lo, cols], ordered[hi, cols]
+        diff = high - low
+        # Mesma fórmula de interpolação do NumPy (resultado idêntico ao np.nanpercentile).
+        value = np.where(frac >= 0.5, high - diff * (1 - frac), low + diff * frac)
+        out[j, has_data] = value[has_data]
+    return out
+
+
+def _coordinate_keys(latitudes, longitudes) -> pd.MultiIndex:
+    return pd.MultiIndex.from_arrays(
+        [np.round(np.asarray(latitudes, dtype=np.float64), COORDINATE_DECIMALS),
+         np.round(np.asarray(longitudes, dtype=np.float64), COORDINATE_DECIMALS)]
+    )
+
+
+@dataclass
+class ThresholdTable:
+    """
+    Tabela de limiares: values[i, d - 1, k] é o limiar names[k] da localização
+    (latitudes[i], longitudes[i]) no dia do ano d.
+    """
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    names: List[str]
+    values: np.ndarray
+    window_days: int = DEFAULT_WINDOW_DAYS
+
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}.npz"
+        np.savez(
+            tmp,
+            latitudes=self.latitudes,
+            longitudes=self.longitudes,
+            names=np.array(self.names),
+            values=self.values,
+            window_days=np.array(self.window_days),
+        )
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "ThresholdTable":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                latitudes=data["latitudes"],
+                longitudes=data["longitudes"],
+                names=[str(n) for n in data["names"]],
+                values=data["values"],
+                window_days=int(data["window_days"]),
+            )
+
+    def lookup(self, latitudes, longitudes, dates) -> Dict[str, np.ndarray]:
+        """
+        Limiares de cada linha (localização, data), por indexação direta da tabela.
+
+        Args:
+            latitudes: Latitude de cada linha.
+            longitudes: Longitude de cada linha.
+            dates: Data de cada linha.
+
+        Returns:
+            Dict[str, np.ndarray]: Um array (float64) por limiar; NaN para localizações
+            fora da tabela e datas ausentes ou inválidas (a classificação usa os limiares fixos).
+        """
+        rows = _coordinate_keys(self.latitudes, self.longitudes).get_indexer(_coordinate_keys(latitudes, longitudes))
+        doy = day_of_year_366(dates) - 1
+        known = (rows >= 0) & (doy >= 0)
+        picked = self.values[np.maximum(rows, 0), np.maximum(doy, 0)].astype(np.float64)
+        picked[~known] = np.nan
+        return {name: picked[:, k] for k, name in enumerate(self.names)}
+
+
+def build_threshold_table(
+    history: pd.DataFrame,
+    names: Sequence[str] = DEFAULT_THRESHOLDS,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+) -> ThresholdTable:
+    """
+    Calcula a tabela de limiares a partir do histórico diário da NASA POWER.
+
+    Args:
+        history (pd.DataFrame): Histórico indexado por data, com as colunas 'latitude',
+            'longitude' e as variáveis dos limiares (ex: saída de
+            DataLoader.load_many(..., sources=("power",))["power"]).
+        names (Sequence[str]): Limiares "<VAR>_P<percentil>" a calcular.
+        window_days (int): Meia largura da janela de dias do ano.
+
+    Returns:
+        ThresholdTable: Limiares por localização e dia do ano.
+    """
+    names = list(names)
+    parsed = [_parse_threshold(name) for name in names]
+    # Linhas sem data válida não entram no histórico.
+    dates = pd.DatetimeIndex(pd.to_datetime(history.index, errors="coerce"))
+    history = history[~dates.isna()]
+    dates = dates[~dates.isna()]
+    years = dates.year.to_numpy()
+    doy = day_of_year_366(dates) - 1
+    keys = _coordinate_keys(history["latitude"], history["longitude"])
+    loc_codes, locations = pd.factorize(keys)
+
+    values = np.full((len(locations), DAYS_PER_YEAR, len(names)), np.nan, dtype=np.float32)
+    offsets = np.arange(-window_days, window_days + 1)
+    by_variable: Dict[str, List[int]] = {}
+    for k, (variable, _) in enumerate(parsed):
+        by_variable.setdefault(variable, []).append(k)
+
+    order = np.argsort(loc_codes, kind="stable")
+    bounds = np.searchsorted(loc_codes[order], np.arange(len(locations) + 1))
+    columns = {variable: history[variable].to_numpy(dtype=np.float64) for variable in by_variable}
+    for i in range(len(locations)):
+        rows = order[bounds[i]:bounds[i + 1]]
+        year_codes, year_ids = np.unique(years[rows], return_inverse=True)
+        for variable, ks in by_variable.items():
+            series = columns[variable][rows]
+            series = np.where(series == POWER_FILL_VALUE, np.nan, series)
+            # Matriz ano x dia do ano; a janela é montada deslocando as colunas (circular).
+            grid = np.full((len(year_codes), DAYS_PER_YEAR), np.nan)
+            grid[year_ids, doy[rows]] = series
+            window = np.concatenate([np.roll(grid, -off, axis=1) for off in offsets], axis=0)
+            # Dias sem nenhum dado (ex: 29/02 num histórico curto) ficam NaN.
+            values[i][:, ks] = _nanpercentile(window, [parsed[k][1] for k in ks]).T
+
+    latitudes = np.array([loc[0] for loc in locations], dtype=np.float64)
+    longitudes = np.array([loc[1] for loc in locations], dtype=np.float64)
+    return ThresholdTable(latitudes, longitudes, names, values, window_days)
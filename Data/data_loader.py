@@ -1,20 +1,30 @@
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import datetime as dt
-from typing import Optional, List, Tuple
+from typing import Callable, Dict, Iterable, Mapping, Optional, List, Sequence, Tuple, Union
 
 from endpoints import Endpoints
 
 # Importar as funções de busca de dados
 from load_dataset.soi_data import fetch_soi_data
 from load_dataset.power_data import fetch_power_daily
-from load_dataset.oisst_data import fetch_oisst_sst
-from load_dataset.nhc_data import fetch_nhc_current_storms, nhc_forecast_horizon_distances
-from load_dataset.ibtracs_data import fetch_ibtracs_all, compute_min_distance_to_ibtracs
-from load_dataset.open_meteo_data import fetch_open_meteo_daily_forecast, fetch_open_meteo_marine_sst
+from load_dataset.power_store import PowerStore
+from load_dataset.oisst_data import fetch_oisst_sst, fetch_oisst_sst_many
+from load_dataset.nhc_data import fetch_nhc_current_storms, nhc_forecast_horizon_distances, nhc_forecast_horizon_distances_many
+from load_dataset.ibtracs_data import fetch_ibtracs_all, compute_min_distance_to_ibtracs, compute_min_distance_matrix
+from load_dataset.open_meteo_data import (
+    fetch_open_meteo_daily_forecast,
+    fetch_open_meteo_daily_forecast_many,
+    fetch_open_meteo_marine_sst,
+    fetch_open_meteo_marine_sst_many,
+)
 from load_dataset.mei_data import fetch_mei_v2_data
 from load_dataset.nino_oni_data import fetch_nino34_oni_data
 
+# Fontes por ponto aceitas por DataLoader.load_many.
+POINT_SOURCES = ("power", "oisst", "open_meteo_forecast", "open_meteo_marine")
+
 
 class DataLoader:
     """
@@ -22,14 +32,29 @@ class DataLoader:
     a partir de diversas fontes. Cada método corresponde a um tipo específico de dado
     e utiliza as funções de busca de dados apropriadas.
     """
-    def __init__(self, endpoints: Endpoints = Endpoints()):
+    def __init__(self, endpoints: Endpoints = Endpoints(), power_store: Optional[PowerStore] = None):
         """
         Inicializa o DataLoader com os endpoints das APIs.
 
         Args:
             endpoints (Endpoints): Objeto contendo os URLs dos endpoints das APIs.
+            power_store (Optional[PowerStore]): Armazenamento local da NASA POWER. Quando informado,
+                as consultas POWER buscam na API apenas as datas que ainda não estão armazenadas.
         """
         self.endpoints = endpoints
+        self.power_store = power_store
+
+    def _fetch_power(
+        self,
+        lat: float,
+        lon: float,
+        start: dt.date | dt.datetime | str,
+        end: dt.date | dt.datetime | str,
+        params: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        if self.power_store is not None:
+            return self.power_store.fetch(lat, lon, start, end, params, endpoints=self.endpoints)
+        return fetch_power_daily(lat, lon, start, end, params, endpoints=self.endpoints)
 
     def load_soi_data(self) -> pd.DataFrame:
         """
@@ -70,7 +95,7 @@ class DataLoader:
         Returns:
             pd.DataFrame: DataFrame com os dados diários da NASA POWER.
         """
-        return fetch_power_daily(lat, lon, start, end, params, endpoints=self.endpoints)
+        return self._fetch_power(lat, lon, start, end, params)
 
     def load_oisst_sst_data(
         self,
@@ -123,6 +148,31 @@ class DataLoader:
         """
         return nhc_forecast_horizon_distances(lat, lon, storms, horizons_days)
 
+    def load_nhc_forecast_horizon_distances_many(
+        self,
+        points: Union[pd.DataFrame, Sequence[Mapping[str, object]]],
+        storms: pd.DataFrame,
+        horizons_days: Tuple[int, ...] = (1, 2, 3, 4, 5),
+    ) -> pd.DataFrame:
+        """
+        Calcula a distância mínima para cada horizonte de previsão de tempestades do NHC para vários pontos de uma vez.
+
+        Args:
+            points (pd.DataFrame | Sequence[Mapping]): Pontos com as colunas/chaves 'name', 'latitude' e 'longitude'.
+            storms (pd.DataFrame): DataFrame com os pontos de previsão das tempestades.
+            horizons_days (Tuple[int, ...]): Tupla de dias de horizonte para cálculo da distância.
+
+        Returns:
+            pd.DataFrame: Formato longo com as colunas 'name', 'horizon_days' e 'NHC_distance_km'.
+        """
+        if not isinstance(points, pd.DataFrame):
+            points = pd.DataFrame(list(points))
+        tidy = nhc_forecast_horizon_distances_many(
+            points["latitude"].to_numpy(), points["longitude"].to_numpy(), storms, horizons_days
+        )
+        tidy.insert(0, "name", points["name"].to_numpy()[tidy.pop("location").to_numpy()])
+        return tidy
+
     def load_ibtracs_all_data(self) -> pd.DataFrame:
         """
         Carrega o arquivo CSV completo do IBTrACS v04r00 (todas as bacias).
@@ -155,6 +205,35 @@ class DataLoader:
         """
         return compute_min_distance_to_ibtracs(lat, lon, ib, start, end)
 
+    def compute_ibtracs_min_distance_matrix(
+        self,
+        points: Union[pd.DataFrame, Sequence[Mapping[str, object]]],
+        ib: pd.DataFrame,
+        start: dt.date | dt.datetime | str,
+        end: dt.date | dt.datetime | str,
+        max_distance_km: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Calcula a distância mínima diária para qualquer tempestade IBTrACS para vários pontos de uma vez.
+
+        Args:
+            points (pd.DataFrame | Sequence[Mapping]): Pontos com as colunas/chaves 'name', 'latitude' e 'longitude'.
+            ib (pd.DataFrame): DataFrame com os dados das tempestades IBTrACS.
+            start (dt.date | dt.datetime | str): Data de início da janela de busca.
+            end (dt.date | dt.datetime | str): Data de fim da janela de busca.
+            max_distance_km (Optional[float]): Se informado, distâncias acima do limite viram NaN (e a busca é mais rápida).
+
+        Returns:
+            pd.DataFrame: Matriz (ponto x dia) indexada pelo nome do ponto.
+        """
+        if not isinstance(points, pd.DataFrame):
+            points = pd.DataFrame(list(points))
+        matrix = compute_min_distance_matrix(
+            points["latitude"].to_numpy(), points["longitude"].to_numpy(), ib, start, end, max_distance_km
+        )
+        matrix.index = pd.Index(points["name"], name="name")
+        return matrix
+
     def load_open_meteo_daily_forecast(
         self,
         lat: float,
@@ -201,3 +280,95 @@ class DataLoader:
             pd.DataFrame: DataFrame com as anomalias de TSM do ONI.
         """
         return fetch_nino34_oni_data(endpoints=self.endpoints)
+
+    def _point_fetcher(
+        self,
+        source: str,
+        start: dt.date | dt.datetime | str | None,
+        end: dt.date | dt.datetime | str | None,
+    ) -> Callable[[float, float], pd.DataFrame]:
+        # Fontes buscadas ponto a ponto em load_many (as demais vão em lote).
+        if source == "power":
+            return lambda lat, lon: self._fetch_power(lat, lon, start, end)
+        raise ValueError(f"Fonte desconhecida: '{source}'. Use uma de {POINT_SOURCES}.")
+
+    def load_many(
+        self,
+        points: Union[pd.DataFrame, Sequence[Mapping[str, object]]],
+        sources: Iterable[str] = ("power", "open_meteo_forecast", "open_meteo_marine"),
+        start: dt.date | dt.datetime | str | None = None,
+        end: dt.date | dt.datetime | str | None = None,
+        days: int = 7,
+        max_workers: int = 16,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Carrega várias fontes para vários pontos de uma vez, com as requisições
+        executadas em paralelo por um pool de threads limitado. Os limites de
+        concorrência e de taxa por host (load_dataset.concurrency.host_limiter)
+        continuam valendo, então cada API recebe no máximo o volume configurado.
+        As fontes 'oisst' e Open-Meteo são buscadas em lote (fetch_*_many), com várias
+        localizações por requisição.
+
+        Args:
+            points (pd.DataFrame | Sequence[Mapping]): Pontos com as colunas/chaves 'name', 'latitude' e 'longitude'.
+            sources (Iterable[str]): Fontes a buscar, entre POINT_SOURCES.
+            start (dt.date | dt.datetime | str | None): Data de início (obrigatória para 'power' e 'oisst').
+            end (dt.date | dt.datetime | str | None): Data de fim (obrigatória para 'power' e 'oisst').
+            days (int): Dias de previsão para as fontes Open-Meteo.
+            max_workers (int): Número máximo de requisições em andamento no total.
+
+        Returns:
+            Dict[str, pd.DataFrame]: Um DataFrame por fonte, com as linhas de todos os pontos
+            concatenadas na ordem de `points` e as colunas 'name', 'latitude' e 'longitude' adicionadas.
+        """
+        if isinstance(points, pd.DataFrame):
+            points = points.to_dict("records")
+        sources = list(sources)
+        for source in sources:
+            if source in ("power", "oisst") and (start is None or end is None):
+                raise ValueError(f"A fonte '{source}' exige start e end.")
+
+        coords = [(float(point["latitude"]), float(point["longitude"])) for point in points]
+
+        def tag(df: pd.DataFrame, point: Mapping[str, object], lat: float, lon: float) -> pd.DataFrame:
+            df["name"] = point.get("name")
+            df["latitude"] = lat
+            df["longitude"] = lon
+            return df
+
+        lats, lons = [c[0] for c in coords], [c[1] for c in coords]
+
+        def per_location(long: pd.DataFrame) -> List[pd.DataFrame]:
+            # Formato longo (location, date) -> um DataFrame por ponto, indexado por data.
+            groups = {i: g.droplevel("location") for i, g in long.groupby(level="location")}
+            empty = long.iloc[:0].droplevel("location")
+            return [groups.get(i, empty).copy() for i in range(len(coords))]
+
+        # Fontes buscadas em lote: OISST por caixa de pontos próximos, Open-Meteo com
+        # várias coordenadas por requisição.
+        batched: Dict[str, Callable[[], List[pd.DataFrame]]] = {
+            "oisst": lambda: fetch_oisst_sst_many(lats, lons, start, end, self.endpoints),
+            "open_meteo_forecast": lambda: per_location(
+                fetch_open_meteo_daily_forecast_many(lats, lons, days, self.endpoints)
+            ),
+            "open_meteo_marine": lambda: per_location(
+                fetch_open_meteo_marine_sst_many(lats, lons, days, self.endpoints)
+            ),
+        }
+        fetchers = {
+            source: self._point_fetcher(source, start, end) for source in sources if source not in batched
+        }
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            for source in sources:
+                if source in batched:
+                    futures[source] = pool.submit(batched[source])
+                else:
+                    futures[source] = [pool.submit(fetchers[source], lat, lon) for lat, lon in coords]
+            out: Dict[str, pd.DataFrame] = {}
+            for source, fs in futures.items():
+                frames = fs.result() if source in batched else [f.result() for f in fs]
+                frames = [tag(df, point, lat, lon) for df, point, (lat, lon) in zip(frames, points, coords)]
+                out[source] = pd.concat(frames) if frames else pd.DataFrame()
+            return out
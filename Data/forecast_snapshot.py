@@ -0,0 +1,139 @@
+"""
+Snapshot binário das previsões classificadas, lido pelo BackEnd via memory-map.
+
+Layout do arquivo (little-endian):
+
+    MAGIC (8 bytes) | tamanho do cabeçalho (uint32) | cabeçalho JSON (UTF-8) | blocos de colunas
+
+Cada bloco começa em um offset múltiplo de 64 bytes; o cabeçalho informa, para cada
+coluna, o tipo, o dtype NumPy, o offset e o tamanho em bytes. Os blocos já estão no
+formato usado pelo BackEnd, que os expõe como views do arquivo mapeado (sem cópia,
+páginas compartilhadas entre os workers):
+
+    - "date": datetime64[D] (int64, dias desde 1970-01-01; NaT = ausente);
+    - "numeric": float64 (NaN = ausente), o mesmo valor que o parse do CSV;
+    - "dictionary": códigos int32 (-1 = ausente) mais a lista de valores no cabeçalho;
+    - "text": offsets int64 (n + 1) seguidos dos bytes UTF-8 concatenados; as linhas
+      ausentes ficam listadas em "missing".
+
+"content_sha256" é o SHA-256 do CSV com o mesmo conteúdo (df.to_csv(index=False)),
+o mesmo hash que o BackEnd calcula ao carregar o CSV, então a ETag não muda com a fonte.
+
+O arquivo é gravado em um temporário e movido com os.replace, então leitores nunca
+veem um snapshot pela metade.
+"""
+import hashlib
+import io
+import json
+import os
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"SABIASN2"
+ALIGNMENT = 64
+
+DATE_COLUMNS = ["date"]
+DICTIONARY_COLUMNS = ["classification", "city_name"]
+NUMERIC_COLUMNS = [
+    "latitude",
+    "longitude",
+    "T2M_prediction",
+    "T2M_MAX_prediction",
+    "T2M_MIN_prediction",
+    "WS2M_prediction",
+    "RH2M_prediction",
+]
+TEXT_COLUMNS = ["sabia_message_en"]
+
+
+def _encode_columns(df: pd.DataFrame) -> Tuple[List[Tuple[str, Dict[str, object], bytes]], Dict[str, List[str]]]:
+    blocks: List[Tuple[str, Dict[str, object], bytes]] = []
+    dictionaries: Dict[str, List[str]] = {}
+
+    for col in DATE_COLUMNS:
+        days = pd.to_datetime(df[col], errors="coerce").to_numpy().astype("<M8[D]")
+        blocks.append((col, {"kind": "date", "dtype": "<M8[D]"}, days.tobytes()))
+
+    for col in DICTIONARY_COLUMNS:
+        codes, uniques = pd.factorize(df[col], use_na_sentinel=True)
+        dictionaries[col] = [str(u) for u in uniques]
+        blocks.append((col, {"kind": "dictionary", "dtype": "<i4"}, codes.astype("<i4").tobytes()))
+
+    for col in NUMERIC_COLUMNS:
+        values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="<f8")
+        blocks.append((col, {"kind": "numeric", "dtype": "<f8"}, values.tobytes()))
+
+    for col in TEXT_COLUMNS:
+        encoded = [b"" if pd.isna(v) else str(v).encode("utf-8") for v in df[col]]
+        offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        missing = [i for i, v in enumerate(df[col]) if pd.isna(v)]
+        blocks.append((col, {"kind": "text", "dtype": "<i8", "missing": missing}, offsets.tobytes() + b"".join(encoded)))
+
+    return blocks, dictionaries
+
+
+def write_forecast_snapshot(df: pd.DataFrame, path: str, content_hash: Optional[str] = None) -> str:
+    """
+    Grava o DataFrame de previsões classificadas (mesmas colunas do
+    classified_weather_forecast.csv) no formato de snapshot binário.
+
+    Args:
+        df (pd.DataFrame): Previsões classificadas com mensagens do SabIA.
+        path (str): Caminho do arquivo de saída (ex: classified_weather_forecast.snapshot).
+        content_hash (Optional[str]): SHA-256 do CSV de mesmo conteúdo; se None, é
+            calculado sobre df.to_csv(index=False).
+
+    Returns:
+        str: Hash do conteúdo, usado pelo BackEnd como ETag.
+    """
+    if content_hash is None:
+        content_hash = hashlib.sha256(df.to_csv(index=False).encode("utf-8")).hexdigest()
+    blocks, dictionaries = _encode_columns(df)
+
+    # O cabeçalho depende dos offsets, que dependem do tamanho do cabeçalho:
+    # reserva espaço com uma primeira estimativa e recalcula até estabilizar.
+    header_size = 0
+    while True:
+        offset = -(-(len(MAGIC) + 4 + header_size) // ALIGNMENT) * ALIGNMENT
+        columns: Dict[str, Dict[str, object]] = {}
+        for name, meta, payload in blocks:
+            columns[name] = dict(meta, offset=offset, nbytes=len(payload))
+            offset = -(-(offset + len(payload)) // ALIGNMENT) * ALIGNMENT
+        header = json.dumps(
+            {
+                "rows": len(df),
+                "columns": columns,
+                "dictionaries": dictionaries,
+                "content_sha256": content_hash,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        if len(header) <= header_size:
+            header = header.ljust(header_size, b" ")
+            break
+        header_size = len(header) + 256
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        for name, _, payload in blocks:
+            f.seek(columns[name]["offset"])
+            f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return content_hash
+
+
+if __name__ == "__main__":
+    # Uso: python forecast_snapshot.py entrada.csv saida.snapshot
+    source, target = sys.argv[1], sys.argv[2]
+    with open(source, "rb") as f:
+        raw = f.read()
+    df = pd.read_csv(io.BytesIO(raw), encoding="utf-8")
+    print("Snapshot gravado:", target, write_forecast_snapshot(df, target, hashlib.sha256(raw).hexdigest()))
@@ -0,0 +1,76 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+# (requisições simultâneas, requisições por segundo) por host.
+DEFAULT_HOST_LIMITS: Dict[str, Tuple[int, Optional[float]]] = {
+    "power.larc.nasa.gov": (4, 5.0),
+    "api.open-meteo.com": (8, 10.0),
+    "marine-api.open-meteo.com": (8, 10.0),
+}
+
+
+class HostLimiter:
+    """
+    Limita, por host, o número de requisições simultâneas e o ritmo de novas
+    requisições, para que coletas concorrentes não sobrecarreguem (ou sejam
+    bloqueadas por) uma mesma API.
+    """
+
+    def __init__(
+        self,
+        default_concurrency: int = 4,
+        default_rate: Optional[float] = None,
+        limits: Optional[Dict[str, Tuple[int, Optional[float]]]] = None,
+    ):
+        """
+        Args:
+            default_concurrency (int): Requisições simultâneas para hosts sem limite configurado.
+            default_rate (Optional[float]): Requisições por segundo para hosts sem limite configurado (None = sem limite).
+            limits (Optional[Dict[str, Tuple[int, Optional[float]]]]): Limites por host.
+        """
+        self.default_concurrency = default_concurrency
+        self.default_rate = default_rate
+        self._limits = dict(DEFAULT_HOST_LIMITS if limits is None else limits)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, max_concurrent: int, rate_per_second: Optional[float] = None) -> None:
+        with self._lock:
+            self._limits[host] = (max_concurrent, rate_per_second)
+            self._semaphores.pop(host, None)
+
+    def _limits_for(self, host: str) -> Tuple[int, Optional[float]]:
+        return self._limits.get(host, (self.default_concurrency, self.default_rate))
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self._limits_for(host)[0])
+                self._semaphores[host] = sem
+            return sem
+
+    def _wait_for_slot(self, host: str) -> None:
+        rate = self._limits_for(host)[1]
+        if not rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + 1.0 / rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[None]:
+        host = urlsplit(url).netloc
+        with self._semaphore(host):
+            self._wait_for_slot(host)
+            yield
+
+
+host_limiter = HostLimiter()
@@ -0,0 +1,33 @@
+"""
+Distância de grande círculo (haversine) usada pelos loaders e pelo índice de
+localizações do BackEnd. Só depende de math/NumPy, para poder ser carregado fora do
+pacote de loaders (o BackEnd o importa pelo caminho do arquivo).
+"""
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    R = EARTH_RADIUS_KM
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+
+def _haversine_km_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+    # Versão vetorizada (com broadcasting) de _haversine_km. As funções do NumPy (arctan2,
+    # potência) podem diferir do math no último bit (~1e-11 km); quando o valor exato
+    # importa, use _haversine_km_exact (utils) nos poucos pares que decidem o resultado.
+    R = EARTH_RADIUS_KM
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = np.radians(np.subtract(lat2, lat1))
+    dlambda = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
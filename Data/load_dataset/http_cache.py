@@ -0,0 +1,228 @@
+import datetime as dt
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".http_cache")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Dias após os quais um intervalo da NASA POWER deixa de ser revisado (dados "finais").
+POWER_FINAL_AFTER_DAYS = 30
+
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Regra de frescor de uma fonte:
+        - "immutable": nunca expira;
+        - "ttl": expira após max_age segundos e é baixado de novo;
+        - "revalidate": após max_age segundos é revalidado com GET condicional (ETag/Last-Modified).
+    """
+    kind: str
+    max_age: float = 0.0
+
+
+def normalize_url(url: str) -> str:
+    # Esquema/host em minúsculas, sem porta padrão, parâmetros da query ordenados.
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def _power_policy(url: str) -> Optional[CachePolicy]:
+    end = dict(parse_qsl(urlsplit(url).query)).get("end")
+    try:
+        end_date = dt.datetime.strptime(end, "%Y%m%d").date()
+    except (TypeError, ValueError):
+        return None
+    if (dt.date.today() - end_date).days > POWER_FINAL_AFTER_DAYS:
+        return CachePolicy("immutable")
+    return CachePolicy("ttl", 6 * 3600)
+
+
+def default_policy(url: str) -> Optional[CachePolicy]:
+    """
+    Política de cache por fonte (None = não armazena).
+
+    Args:
+        url (str): URL da requisição.
+
+    Returns:
+        Optional[CachePolicy]: Política aplicável à URL.
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host == "power.larc.nasa.gov":
+        return _power_policy(url)
+    if host in ("api.open-meteo.com", "marine-api.open-meteo.com"):
+        return CachePolicy("ttl", 3 * 3600)
+    if host in ("www.cpc.ncep.noaa.gov", "psl.noaa.gov"):
+        # Índices mensais (SOI/ONI/MEI)
+        return CachePolicy("revalidate", 12 * 3600)
+    return None
+
+
+class HttpCache:
+    """
+    Cache de respostas HTTP em disco, indexado pela URL normalizada. Cada entrada é um
+    par <hash>.body (conteúdo) + <hash>.json (URL, cabeçalhos de validação e horário do
+    download). O tamanho total é limitado, descartando as entradas usadas há mais tempo
+    (o mtime do .body marca o último acesso). `clock` (segundos, como time.time) pode
+    ser substituído nos testes.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        policy=default_policy,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".body", base + ".json"
+
+    def _read_meta(self, url: str) -> Optional[Dict]:
+        _, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def lookup(self, url: str, policy: CachePolicy):
+        """
+        Returns:
+            (resposta em cache ou None, cabeçalhos condicionais para revalidação)
+        """
+        meta = self._read_meta(url)
+        if meta is None:
+            return None, {}
+        age = self._clock() - meta["fetched_at"]
+        if policy.kind == "immutable" or age < policy.max_age:
+            response = self._response(url, meta)
+            if response is not None:
+                with self._lock:
+                    self.hits += 1
+            return response, {}
+        if policy.kind == "revalidate":
+            headers = {}
+            if meta["headers"].get("ETag"):
+                headers["If-None-Match"] = meta["headers"]["ETag"]
+            if meta["headers"].get("Last-Modified"):
+                headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+            return None, headers
+        return None, {}
+
+    def _response(self, url: str, meta: Dict) -> Optional[requests.Response]:
+        body_path, _ = self._paths(url)
+        try:
+            with open(body_path, "rb") as f:
+                content = f.read()
+            self._touch(body_path)  # marca o acesso para o LRU
+        except OSError:
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = meta["url"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        return response
+
+    def not_modified(self, url: str) -> Optional[requests.Response]:
+        # Servidor respondeu 304: renova o horário da entrada e devolve o conteúdo salvo.
+        meta = self._read_meta(url)
+        if meta is None:
+            return None
+        meta["fetched_at"] = self._clock()
+        self._write_meta(url, meta)
+        with self._lock:
+            self.revalidated += 1
+        return self._response(url, meta)
+
+    def _touch(self, path: str) -> None:
+        now = self._clock()
+        os.utime(path, (now, now))
+
+    def _write_meta(self, url: str, meta: Dict) -> None:
+        _, meta_path = self._paths(url)
+        tmp = f"{meta_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def store(self, url: str, response: requests.Response) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        body_path, _ = self._paths(url)
+        tmp = f"{body_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp, "wb") as f:
+            f.write(response.content)
+        os.replace(tmp, body_path)
+        self._touch(body_path)
+        headers = {k: response.headers[k] for k in _STORED_HEADERS if k in response.headers}
+        self._write_meta(url, {"url": normalize_url(url), "headers": headers, "fetched_at": self._clock()})
+        with self._lock:
+            self.stores += 1
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            try:
+                names = [n for n in os.listdir(self.directory) if n.endswith(".body")]
+            except OSError:
+                return
+            entries = []
+            for name in names:
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name[:-len(".body")]))
+            total = sum(size for _, size, _ in entries)
+            for _, size, key in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for suffix in (".body", ".json"):
+                    try:
+                        os.remove(os.path.join(self.directory, key + suffix))
+                    except OSError:
+                        pass
+                total -= size
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "stores": self.stores,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,273 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .concurrency import HostLimiter, host_limiter
+from .http_cache import HttpCache
+
+# Timeout (segundos) por host; hosts ausentes usam HttpSession.default_timeout.
+DEFAULT_TIMEOUTS: Dict[str, float] = {
+    "power.larc.nasa.gov": 120.0,
+    "www.ncei.noaa.gov": 120.0,  # IBTrACS (centenas de MB) e ERDDAP da NCEI
+    "api.open-meteo.com": 30.0,
+    "marine-api.open-meteo.com": 30.0,
+    "www.nhc.noaa.gov": 30.0,
+    "www.cpc.ncep.noaa.gov": 30.0,
+    "psl.noaa.gov": 30.0,
+}
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Espera antes da próxima tentativa: o Retry-After da resposta, quando houver
+        (limitado a backoff_max), senão "full jitter" (aleatória entre 0 e o teto exponencial).
+
+        Args:
+            attempt (int): Tentativa que falhou (0 = primeira).
+            response (Optional[requests.Response]): Resposta da tentativa, se houve.
+
+        Returns:
+            float: Segundos a esperar.
+        """
+        if response is not None:
+            retry_after = retry_after_seconds(response)
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+@dataclass
+class RequestRecord:
+    """Resultado de uma requisição (incluindo as novas tentativas)."""
+    url: str
+    status: Optional[int] = None
+    attempts: int = 0
+    elapsed_s: float = 0.0
+    error: Optional[str] = None
+    from_cache: bool = False
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """
+    Espera pedida pelo servidor no cabeçalho Retry-After (segundos ou data HTTP).
+
+    Args:
+        response (requests.Response): Resposta (tipicamente 429 ou 503).
+
+    Returns:
+        Optional[float]: Segundos a esperar, ou None sem cabeçalho válido.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpSession:
+    """
+    Camada HTTP compartilhada pelos loaders: reaproveita conexões (keep-alive) por
+    host, refaz requisições com backoff exponencial com jitter em erros de conexão e
+    respostas 429/5xx (respeitando Retry-After), aplica timeouts por fonte e registra
+    a duração e o motivo de falha de cada requisição. Com um HttpCache, respostas das
+    fontes com política de cache são servidas do disco enquanto estiverem frescas.
+    """
+
+    def __init__(
+        self,
+        retry: Optional[RetryPolicy] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: float = 60.0,
+        pool_maxsize: int = 16,
+        limiter: HostLimiter = host_limiter,
+        history: int = 1000,
+        cache: Optional[HttpCache] = None,
+    ):
+        self.retry = retry or RetryPolicy()
+        self.timeouts = dict(DEFAULT_TIMEOUTS if timeouts is None else timeouts)
+        self.default_timeout = default_timeout
+        self.limiter = limiter
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.records: Deque[RequestRecord] = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def timeout_for(self, url: str) -> float:
+        return self.timeouts.get(urlsplit(url).netloc, self.default_timeout)
+
+    def get(
+        self,
+        url: str,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        max_retries: Optional[int] = None,
+    ) -> Tuple[Optional[requests.Response], RequestRecord]:
+        """
+        Executa um GET com novas tentativas.
+
+        Args:
+            url (str): URL completa da requisição.
+            timeout (Optional[float]): Timeout em segundos; se None, usa o timeout da fonte (host).
+            stream (bool): Se True, não lê o corpo (para downloads grandes) e não usa o cache.
+            headers (Optional[Dict[str, str]]): Cabeçalhos adicionais.
+            max_retries (Optional[int]): Novas tentativas; se None, usa a RetryPolicy da sessão.
+
+        Returns:
+            Tuple[Optional[requests.Response], RequestRecord]: A resposta (None em caso de falha)
+            e o registro com status, tentativas, duração e motivo da falha.
+        """
+        timeout = self.timeout_for(url) if timeout is None else timeout
+        max_retries = self.retry.max_retries if max_retries is None else max_retries
+        record = RequestRecord(url=url)
+        t0 = time.perf_counter()
+        response: Optional[requests.Response] = None
+
+        policy = self.cache.policy(url) if self.cache is not None and not stream else None
+        if policy is not None:
+            cached, conditional = self.cache.lookup(url, policy)
+            if cached is not None:
+                record.status, record.from_cache = 200, True
+                return cached, self._finish(record, t0)
+            if conditional:
+                headers = {**(headers or {}), **conditional}
+
+        for attempt in range(max_retries + 1):
+            record.attempts = attempt + 1
+            response = None
+            try:
+                with self.limiter.limit(url):
+                    response = self.session.get(url, timeout=timeout, stream=stream, headers=headers)
+                record.status = response.status_code
+                if response.status_code < 400 or response.status_code == 304:
+                    record.error = None
+                    break
+                record.error = f"HTTP {response.status_code}"
+                if response.status_code not in self.retry.retry_statuses:
+                    break
+            except requests.RequestException as e:
+                record.error = f"{type(e).__name__}: {e}"
+            if attempt < max_retries:
+                delay = self.retry.backoff(attempt, response)
+                if response is not None:
+                    response.close()  # devolve a conexão ao pool antes de esperar
+                time.sleep(delay)
+
+        if policy is not None and record.ok:
+            if response.status_code == 304:
+                cached = self.cache.not_modified(url)
+                if cached is not None:
+                    record.from_cache = True
+                    response = cached
+                else:
+                    record.error = "HTTP 304 sem entrada no cache"
+            elif response.status_code == 200:
+                self.cache.store(url, response)
+        return (response if record.ok else None), self._finish(record, t0)
+
+    def _finish(self, record: RequestRecord, t0: float) -> RequestRecord:
+        record.elapsed_s = time.perf_counter() - t0
+        with self._lock:
+            self.records.append(record)
+        return record
+
+    def download(
+        self,
+        url: str,
+        path: str,
+        max_age: float = 0.0,
+        chunk_size: int = 1 << 20,
+    ) -> Tuple[bool, Optional[RequestRecord]]:
+        """
+        Baixa `url` para `path` em streaming (o corpo nunca fica inteiro na memória).
+        Se o arquivo já existe, usa GET condicional (ETag/Last-Modified gravados em
+        `path`.json) e, dentro de `max_age` segundos do último download, nem consulta o servidor.
+
+        Args:
+            url (str): URL do arquivo.
+            path (str): Caminho de destino.
+            max_age (float): Segundos durante os quais o arquivo local é usado sem revalidação.
+            chunk_size (int): Tamanho dos blocos lidos da resposta.
+
+        Returns:
+            Tuple[bool, Optional[RequestRecord]]: Se o arquivo foi (re)baixado e o registro da
+            requisição (None quando o arquivo local ainda estava fresco).
+        """
+        meta_path = path + ".json"
+        meta: Dict = {}
+        if os.path.exists(path):
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+            if time.time() - meta.get("fetched_at", 0.0) < max_age:
+                return False, None
+        headers = {}
+        if meta.get("ETag"):
+            headers["If-None-Match"] = meta["ETag"]
+        if meta.get("Last-Modified"):
+            headers["If-Modified-Since"] = meta["Last-Modified"]
+
+        response, record = self.get(url, stream=True, headers=headers or None)
+        if response is None:
+            return False, record
+        changed = response.status_code != 304
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            if changed:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with open(tmp, "wb") as f:
+                    for chunk in response.iter_content(chunk_size):
+                        f.write(chunk)
+                os.replace(tmp, path)
+                meta = {k: response.headers[k] for k in ("ETag", "Last-Modified") if k in response.headers}
+        except requests.RequestException as e:
+            record.error = f"{type(e).__name__}: {e}"
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return False, record
+        finally:
+            response.close()
+        meta["fetched_at"] = time.time()
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return changed, record
+
+    def failures(self) -> List[RequestRecord]:
+        with self._lock:
+            return [r for r in self.records if not r.ok]
+
+
+http_session = HttpSession(cache=HttpCache())
@@ -1,79 +1,209 @@
 from typing import List, Tuple
-import io
+import os
 import pandas as pd
 import numpy as np
 import datetime as dt
+from urllib.parse import urlsplit
+
+import pyarrow as pa
+import pyarrow.feather as feather
 
 from endpoints import Endpoints
-from .utils import _safe_get, _haversine_km, _to_iso_z
+from .http_session import http_session
+from .utils import _min_distance_by_group, _to_iso_z
+
+
+# Distância (km) por grau de latitude; o grande círculo nunca é menor que R * |Δφ|.
+_KM_PER_DEG_LAT = 6371.0 * np.pi / 180.0
+# Elementos (localizações x pontos) por bloco de distâncias.
+_BLOCK_ELEMENTS = 2_000_000
+
+IBTRACS_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ibtracs_cache")
+# O CSV é atualizado algumas vezes por semana; dentro desse intervalo nem revalida.
+IBTRACS_MAX_AGE_S = 24 * 3600
+
+# Colunas lidas do CSV (o restante, ~160 colunas, é descartado já no parse).
+_IBTRACS_COLUMNS = ["SID", "USA_ATCF_ID", "NAME", "ISO_TIME", "LAT", "LON", "WMO_WIND", "USA_WIND", "WMO_PRES", "USA_PRES"]
+_IBTRACS_NUMERIC = ["LAT", "LON", "WMO_WIND", "USA_WIND", "WMO_PRES", "USA_PRES"]
+
+
+def _first_present(columns: List[str], candidates: Tuple[str, ...]) -> str | None:
+    return next((c for c in candidates if c in columns), None)
+
+
+def parse_ibtracs_csv(path: str) -> pd.DataFrame:
+    """
+    Lê o CSV do IBTrACS lendo apenas as colunas necessárias, com tipos explícitos.
+
+    Args:
+        path (str): Caminho do CSV ibtracs.*.list.v04r00.csv.
+
+    Returns:
+        pd.DataFrame: Colunas time (datetime64), storm_id/storm_name (category),
+        lat, lon, wind_kt e pressure_mb (float32), ordenado por time.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    time_col = "ISO_TIME" if "ISO_TIME" in header else next((c for c in header if "ISO_TIME" in c.upper()), None)
+    if time_col is None or "LAT" not in header or "LON" not in header:
+        return pd.DataFrame()
+    usecols = [c for c in header if c in _IBTRACS_COLUMNS or c == time_col]
+    numeric = [c for c in usecols if c in _IBTRACS_NUMERIC]
+    read_kwargs = dict(
+        usecols=usecols,
+        skiprows=[1],  # segunda linha do arquivo traz as unidades das colunas
+        na_values=[" "],
+        keep_default_na=False,
+    )
+    try:
+        df = pd.read_csv(path, dtype={**{c: "float32" for c in numeric}, **{c: "str" for c in usecols if c not in numeric}}, **read_kwargs)
+    except ValueError:
+        # Algum valor numérico fora do padrão: lê como texto e converte com coerção.
+        df = pd.read_csv(path, dtype="str", **read_kwargs)
+        for c in numeric:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype("float32")
+
+    # Normalize fields
+    out = pd.DataFrame()
+    out["time"] = pd.to_datetime(df[time_col], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    id_col = _first_present(list(df.columns), ("SID", "USA_ATCF_ID"))
+    out["storm_id"] = df[id_col].astype("category") if id_col else np.nan
+    out["storm_name"] = df["NAME"].astype("category") if "NAME" in df.columns else np.nan
+    out["lat"] = df["LAT"]
+    out["lon"] = df["LON"]
+    wind_col = _first_present(list(df.columns), ("WMO_WIND", "USA_WIND"))
+    out["wind_kt"] = df[wind_col] if wind_col else np.float32(np.nan)
+    pres_col = _first_present(list(df.columns), ("WMO_PRES", "USA_PRES"))
+    out["pressure_mb"] = df[pres_col] if pres_col else np.float32(np.nan)
+    out = out.dropna(subset=["time", "lat", "lon"]).sort_values("time", kind="stable")
+    return out.reset_index(drop=True)
+
+
+def _write_ibtracs_cache(df: pd.DataFrame, path: str) -> None:
+    # Arrow IPC (Feather v2) sem compressão, para poder ser aberto via memory-map.
+    tmp = f"{path}.tmp-{os.getpid()}"
+    feather.write_feather(df, tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+
+def _read_ibtracs_cache(path: str) -> pd.DataFrame:
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas()
 
 
-def fetch_ibtracs_all(endpoints: Endpoints = Endpoints()) -> pd.DataFrame:
+def fetch_ibtracs_all(endpoints: Endpoints = Endpoints(), cache_dir: str = IBTRACS_CACHE_DIR) -> pd.DataFrame:
     """
     Busca o arquivo CSV completo do IBTrACS v04r00 (todas as bacias).
 
+    O CSV é baixado em streaming para `cache_dir` (com GET condicional nas execuções
+    seguintes) e convertido uma única vez para um arquivo Arrow colunar; enquanto o CSV
+    não muda, as chamadas seguintes apenas abrem esse arquivo via memory-map.
+
     Args:
         endpoints (Endpoints): Objeto contendo os URLs dos endpoints das APIs.
+        cache_dir (str): Diretório do CSV baixado e do arquivo Arrow derivado.
 
     Returns:
         pd.DataFrame: DataFrame com informações sobre as tempestades históricas (id/nome, tempo, lat, lon, vento, pressão).
     """
-    r = _safe_get(endpoints.ibtracs_all_csv, timeout=120)
-    if r is None:
+    name = os.path.basename(urlsplit(endpoints.ibtracs_all_csv).path)
+    csv_path = os.path.join(cache_dir, name)
+    arrow_path = os.path.splitext(csv_path)[0] + ".arrow"
+
+    changed, _ = http_session.download(endpoints.ibtracs_all_csv, csv_path, max_age=IBTRACS_MAX_AGE_S)
+    if not os.path.exists(csv_path):
         return pd.DataFrame()
+    if not changed and os.path.exists(arrow_path) and os.path.getmtime(arrow_path) >= os.path.getmtime(csv_path):
+        return _read_ibtracs_cache(arrow_path)
     try:
-        df = pd.read_csv(io.StringIO(r.text))
+        out = parse_ibtracs_csv(csv_path)
     except Exception:
         return pd.DataFrame()
-    # Columns vary; try common fields
-    # Time field can be 'ISO_TIME' or 'ISO_TIME' like 'YYYY-MM-DD HH:MM:SS'
-    time_col = "ISO_TIME" if "ISO_TIME" in df.columns else None
-    if time_col is None:
-        # Try fallback
-        for c in df.columns:
-            if "ISO_TIME" in c.upper():
-                time_col = c
-                break
-    if time_col is None:
-        return pd.DataFrame()
-    # Normalize fields
-    out = pd.DataFrame()
-    out["time"] = pd.to_datetime(df[time_col], errors="coerce")
-    # storm id/name
-    if "SID" in df.columns:
-        out["storm_id"] = df["SID"]
-    elif "USA_ATCF_ID" in df.columns:
-        out["storm_id"] = df["USA_ATCF_ID"]
-    else:
-        out["storm_id"] = np.nan
-    if "NAME" in df.columns:
-        out["storm_name"] = df["NAME"]
-    else:
-        out["storm_name"] = np.nan
-    # position
-    lat_col = "LAT" if "LAT" in df.columns else None
-    lon_col = "LON" if "LON" in df.columns else None
-    if lat_col is None or lon_col is None:
-        return pd.DataFrame()
-    out["lat"] = pd.to_numeric(df[lat_col], errors="coerce")
-    out["lon"] = pd.to_numeric(df[lon_col], errors="coerce")
-    # intensity (optional)
-    if "WMO_WIND" in df.columns:
-        out["wind_kt"] = pd.to_numeric(df["WMO_WIND"], errors="coerce")
-    elif "USA_WIND" in df.columns:
-        out["wind_kt"] = pd.to_numeric(df["USA_WIND"], errors="coerce")
-    else:
-        out["wind_kt"] = np.nan
-    if "WMO_PRES" in df.columns:
-        out["pressure_mb"] = pd.to_numeric(df["WMO_PRES"], errors="coerce")
-    elif "USA_PRES" in df.columns:
-        out["pressure_mb"] = pd.to_numeric(df["USA_PRES"], errors="coerce")
-    else:
-        out["pressure_mb"] = np.nan
-    out = out.dropna(subset=["time", "lat", "lon"]).sort_values("time")
+    if not out.empty:
+        _write_ibtracs_cache(out, arrow_path)
     return out
 
 
+def compute_min_distance_matrix(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    ib: pd.DataFrame,
+    start: dt.date | dt.datetime | str,
+    end: dt.date | dt.datetime | str,
+    max_distance_km: float | None = None,
+) -> pd.DataFrame:
+    """
+    Calcula, de uma vez, a distância mínima diária de várias localizações para qualquer
+    tempestade IBTrACS dentro da janela de data solicitada.
+
+    Sem `max_distance_km` todos os pontos da janela são comparados com todas as
+    localizações (em blocos vetorizados). Com `max_distance_km`, cada localização só
+    considera os pontos na faixa de latitude que pode estar a essa distância, e
+    distâncias maiores que o limite viram NaN.
+
+    Args:
+        lats (np.ndarray): Latitudes das localizações.
+        lons (np.ndarray): Longitudes das localizações.
+        ib (pd.DataFrame): DataFrame com os dados das tempestades IBTrACS.
+        start (dt.date | dt.datetime | str): Data de início da janela de busca.
+        end (dt.date | dt.datetime | str): Data de fim da janela de busca.
+        max_distance_km (float | None): Distância máxima de interesse (km).
+
+    Returns:
+        pd.DataFrame: Matriz (localização x dia), com uma linha por localização na ordem
+        recebida e uma coluna por dia com pontos de tempestade na janela.
+    """
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+    index = pd.RangeIndex(len(lats), name="location")
+    if ib is None or ib.empty:
+        return pd.DataFrame(index=index, columns=pd.DatetimeIndex([], name="date"), dtype=float)
+    start_dt = pd.to_datetime(_to_iso_z(start)).tz_localize(None)
+    end_dt = pd.to_datetime(_to_iso_z(end)).tz_localize(None)
+    mask = (ib["time"] >= start_dt) & (ib["time"] <= end_dt)
+    sub = ib.loc[mask]
+    if sub.empty:
+        return pd.DataFrame(index=index, columns=pd.DatetimeIndex([], name="date"), dtype=float)
+
+    days = sub["time"].dt.normalize().to_numpy()
+    order = np.argsort(days, kind="stable")
+    unique_days, pday = np.unique(days[order], return_inverse=True)
+    plat = sub["lat"].to_numpy(dtype=np.float64)[order]
+    plon = sub["lon"].to_numpy(dtype=np.float64)[order]
+    result = np.full((len(lats), len(unique_days)), np.nan)
+
+    if max_distance_km is None:
+        # Blocos de dias inteiros (cada célula localização x dia é calculada uma única vez).
+        loc_chunk = max(1, min(len(lats), _BLOCK_ELEMENTS // 256))
+        bounds = np.append(np.flatnonzero(np.diff(pday, prepend=-1)), len(pday))
+        n_days = len(bounds) - 1
+        for l0 in range(0, len(lats), loc_chunk):
+            loc_idx = np.arange(l0, min(len(lats), l0 + loc_chunk))
+            points_per_block = max(1, _BLOCK_ELEMENTS // len(loc_idx))
+            k = 0
+            while k < n_days:
+                k1 = min(n_days, max(k + 1, int(np.searchsorted(bounds, bounds[k] + points_per_block))))
+                p0, p1 = bounds[k], bounds[k1]
+                days_in_block, mins = _min_distance_by_group(lats[loc_idx], lons[loc_idx], plat[p0:p1], plon[p0:p1], pday[p0:p1])
+                result[np.ix_(loc_idx, days_in_block)] = mins
+                k = k1
+    else:
+        band = max_distance_km / _KM_PER_DEG_LAT * (1 + 1e-9) + 1e-9
+        by_lat = np.argsort(plat, kind="stable")
+        sorted_lat = plat[by_lat]
+        for i in range(len(lats)):
+            lo = np.searchsorted(sorted_lat, lats[i] - band, side="left")
+            hi = np.searchsorted(sorted_lat, lats[i] + band, side="right")
+            idx = np.sort(by_lat[lo:hi])
+            if idx.size:
+                days_near, mins = _min_distance_by_group(lats[i:i + 1], lons[i:i + 1], plat[idx], plon[idx], pday[idx])
+                result[i, days_near] = mins[0]
+        with np.errstate(invalid="ignore"):
+            result[result > max_distance_km] = np.nan
+
+    return pd.DataFrame(result, index=index, columns=pd.DatetimeIndex(unique_days, name="date"))
+
+
 def compute_min_distance_to_ibtracs(
     lat: float, lon: float, ib: pd.DataFrame, start: dt.date | dt.datetime | str, end: dt.date | dt.datetime | str
 ) -> pd.DataFrame:
@@ -91,20 +221,7 @@ def compute_min_distance_to_ibtracs(
     Returns:
         pd.DataFrame: DataFrame indexado por data com a coluna 'IBTRACS_min_distance_km'.
     """
-    if ib is None or ib.empty:
+    matrix = compute_min_distance_matrix([lat], [lon], ib, start, end)
+    if matrix.shape[1] == 0:
         return pd.DataFrame(index=pd.to_datetime([]), columns=["IBTRACS_min_distance_km"]).astype(float)
-    start_dt = pd.to_datetime(_to_iso_z(start)).tz_localize(None)
-    end_dt = pd.to_datetime(_to_iso_z(end)).tz_localize(None)
-    mask = (ib["time"] >= start_dt) & (ib["time"] <= end_dt)
-    sub = ib.loc[mask].copy()
-    if sub.empty:
-        return pd.DataFrame(index=pd.to_datetime([]), columns=["IBTRACS_min_distance_km"]).astype(float)
-    sub["date"] = sub["time"].dt.normalize()
-    rows: List[Tuple[pd.Timestamp, float]] = []
-    for d, g in sub.groupby("date"):
-        vals = []
-        for _, r in g.iterrows():
-            vals.append(_haversine_km(lat, lon, float(r["lat"]), float(r["lon"]))) 
-        rows.append((d, float(np.min(vals)) if vals else np.nan))
-    out = pd.DataFrame(rows, columns=["date", "IBTRACS_min_distance_km"]).set_index("date").sort_index()
-    return out
+    return matrix.iloc[0].rename("IBTRACS_min_distance_km").to_frame()
@@ -0,0 +1,184 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class MirrorStats:
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency_s: Optional[float] = None  # média móvel exponencial das respostas válidas
+    open_until: float = 0.0
+    trial_in_flight: bool = False  # disjuntor meio-aberto: a tentativa de teste está em andamento
+
+
+class MirrorHealth:
+    """
+    Memória de saúde por espelho (ex: par ERDDAP base + dataset id): prefere os que
+    responderam bem e mais rápido e, como disjuntor (circuit breaker), deixa de tentar
+    por `cooldown_s` segundos um espelho com `failure_threshold` falhas seguidas.
+    Depois do intervalo o disjuntor fica meio-aberto: uma única chamada leva a tentativa
+    de teste (try_acquire) e, para as demais, o espelho segue aberto até ela terminar.
+    Um sucesso fecha o disjuntor; uma nova falha o reabre.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown_s: float = 300.0,
+        alpha: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.alpha = alpha
+        self._clock = clock
+        self._stats: Dict[Hashable, MirrorStats] = {}
+        self._lock = threading.Lock()
+
+    def record_success(self, key: Hashable, latency_s: float) -> None:
+        with self._lock:
+            st = self._stats.setdefault(key, MirrorStats())
+            st.successes += 1
+            st.consecutive_failures = 0
+            st.open_until = 0.0
+            st.trial_in_flight = False
+            st.latency_s = latency_s if st.latency_s is None else (1 - self.alpha) * st.latency_s + self.alpha * latency_s
+
+    def record_failure(self, key: Hashable) -> None:
+        with self._lock:
+            st = self._stats.setdefault(key, MirrorStats())
+            st.failures += 1
+            st.consecutive_failures += 1
+            st.trial_in_flight = False
+            if st.consecutive_failures >= self.failure_threshold:
+                st.open_until = self._clock() + self.cooldown_s
+
+    def is_open(self, key: Hashable) -> bool:
+        with self._lock:
+            st = self._stats.get(key)
+            return st is not None and (st.open_until > self._clock() or st.trial_in_flight)
+
+    def try_acquire(self, key: Hashable) -> bool:
+        """
+        Diz se o espelho pode ser tentado agora. Com o disjuntor meio-aberto, só a
+        primeira chamada recebe True (a tentativa de teste); as seguintes recebem False
+        até o resultado dela ser registrado por record_success ou record_failure.
+        """
+        with self._lock:
+            st = self._stats.get(key)
+            if st is None or st.open_until == 0.0:
+                return True
+            if st.open_until > self._clock() or st.trial_in_flight:
+                return False
+            st.trial_in_flight = True
+            return True
+
+    def latency(self, key: Hashable) -> Optional[float]:
+        with self._lock:
+            st = self._stats.get(key)
+            return None if st is None else st.latency_s
+
+    def rank(self, candidates: Sequence[Hashable]) -> List[Hashable]:
+        """
+        Ordena os candidatos: primeiro os que funcionaram (do mais rápido ao mais lento),
+        depois os ainda não testados (na ordem original), por fim os que vêm falhando.
+        Espelhos com o disjuntor aberto ficam de fora.
+        """
+        with self._lock:
+            def score(item: Tuple[int, Hashable]):
+                i, key = item
+                st = self._stats.get(key)
+                if st is None:
+                    return (1, 0.0, i)
+                if st.successes and st.consecutive_failures == 0:
+                    return (0, st.latency_s or 0.0, i)
+                return (2, float(st.consecutive_failures), i)
+
+            ranked = sorted(enumerate(candidates), key=score)
+        return [k for _, k in ranked if not self.is_open(k)]
+
+    def snapshot(self) -> Dict[Hashable, MirrorStats]:
+        with self._lock:
+            return {k: MirrorStats(**vars(v)) for k, v in self._stats.items()}
+
+
+# Threads das tentativas em corrida (separadas do pool de DataLoader.load_many).
+_race_pool = ThreadPoolExecutor(max_workers=64, thread_name_prefix="mirror-race")
+
+
+def race_first(
+    candidates: Sequence[Hashable],
+    attempt: Callable[[Hashable], Optional[T]],
+    health: MirrorHealth,
+    max_parallel: int = 4,
+    hedge_after_s: float = 3.0,
+    group: Optional[Callable[[Hashable], Hashable]] = None,
+) -> Tuple[Optional[Hashable], Optional[T]]:
+    """
+    Tenta os espelhos em corrida e devolve o primeiro resultado válido.
+
+    Começa pelo melhor espelho segundo `health`; se ele falhar, o próximo é disparado na
+    hora, e se demorar mais que `hedge_after_s` (ou o dobro da sua latência conhecida),
+    outro é disparado em paralelo, até `max_parallel` tentativas simultâneas. Com `group`
+    (ex: o servidor do espelho), as tentativas extras preferem grupos que não estão em
+    andamento, já que um servidor lento costuma ser lento para todos os seus datasets.
+    Tentativas que terminam depois do vencedor continuam atualizando a memória de saúde.
+
+    Args:
+        candidates (Sequence[Hashable]): Espelhos, na ordem de preferência padrão.
+        attempt (Callable): Função que recebe um espelho e devolve o resultado, ou None se inválido.
+        health (MirrorHealth): Memória de saúde compartilhada entre as chamadas.
+        max_parallel (int): Máximo de tentativas simultâneas.
+        hedge_after_s (float): Espera máxima antes de disparar uma tentativa extra.
+        group (Optional[Callable]): Função que agrupa espelhos que compartilham infraestrutura.
+
+    Returns:
+        Tuple[Optional[Hashable], Optional[T]]: O espelho vencedor e seu resultado (None, None se nenhum funcionou).
+    """
+    group = group or (lambda key: key)
+    queue = list(health.rank(candidates))
+    pending: Dict[Future, Hashable] = {}
+
+    def timed(key: Hashable) -> Optional[T]:
+        t0 = time.monotonic()
+        try:
+            result = attempt(key)
+        except Exception:
+            result = None
+        if result is None:
+            health.record_failure(key)
+        else:
+            health.record_success(key, time.monotonic() - t0)
+        return result
+
+    def launch() -> None:
+        while queue and len(pending) < max_parallel:
+            busy = {group(k) for k in pending.values()}
+            i = next((i for i, k in enumerate(queue) if group(k) not in busy), 0)
+            key = queue.pop(i)
+            # Um espelho meio-aberto já em teste por outra chamada é pulado.
+            if health.try_acquire(key):
+                pending[_race_pool.submit(timed, key)] = key
+                return
+
+    launch()
+    while pending:
+        known = [health.latency(k) for k in pending.values()]
+        wait_s = min([hedge_after_s] + [max(0.5, 2 * lat) for lat in known if lat is not None])
+        done, _ = wait(list(pending), timeout=wait_s, return_when=FIRST_COMPLETED)
+        if not done:
+            launch()  # hedge: as tentativas em andamento estão lentas
+            continue
+        for fut in done:
+            key = pending.pop(fut)
+            result = fut.result()
+            if result is not None:
+                return key, result
+            launch()
+    return None, None
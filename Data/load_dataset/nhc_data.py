@@ -3,7 +3,7 @@ import pandas as pd
 import numpy as np
 
 from endpoints import Endpoints
-from .utils import _safe_get, _haversine_km
+from .utils import _safe_get, _min_distance_by_group
 
 
 def fetch_nhc_current_storms(endpoints: Endpoints = Endpoints()) -> pd.DataFrame:
@@ -53,6 +53,66 @@ def fetch_nhc_current_storms(endpoints: Endpoints = Endpoints()) -> pd.DataFrame
     return df
 
 
+def nhc_forecast_horizon_distances_many(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    storms: pd.DataFrame,
+    horizons_days: Tuple[int, ...] = (1, 2, 3, 4, 5),
+    now: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """
+    Calcula, para várias localizações de uma vez, a distância mínima aos pontos de
+    previsão de tempestades do NHC em cada horizonte (D+1 a D+5).
+
+    Os pontos são ordenados por tempo uma única vez e separados por horizonte com
+    busca binária; todas as distâncias saem de uma única haversine vetorizada.
+
+    Args:
+        lats (np.ndarray): Latitudes das localizações.
+        lons (np.ndarray): Longitudes das localizações.
+        storms (pd.DataFrame): DataFrame contendo os pontos de previsão das tempestades (com 'time','lat','lon').
+        horizons_days (Tuple[int, ...]): Tupla de dias de horizonte para cálculo da distância.
+        now (pd.Timestamp | None): Instante de referência (UTC, sem fuso); se None, usa o horário atual.
+
+    Returns:
+        pd.DataFrame: Formato longo com as colunas 'location' (posição em lats/lons),
+                      'horizon_days' e 'NHC_distance_km' (NaN sem pontos no horizonte).
+    """
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+    horizons = list(horizons_days)
+    result = np.full((len(lats), len(horizons)), np.nan)
+
+    if storms is not None and not storms.empty and "time" in storms and len(lats):
+        if now is None:
+            now = pd.Timestamp.utcnow().tz_localize(None)
+        times = pd.to_datetime(storms["time"]).dt.tz_localize(None).to_numpy()
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        plat = storms["lat"].to_numpy(dtype=np.float64)[order]
+        plon = storms["lon"].to_numpy(dtype=np.float64)[order]
+
+        # Pontos de cada horizonte (dia alvo), concatenados e marcados com o índice do horizonte.
+        idx_parts, group_parts = [], []
+        for j, h in enumerate(horizons):
+            target = (now + pd.Timedelta(days=h)).normalize()
+            lo, hi = np.searchsorted(times, [np.datetime64(target), np.datetime64(target + pd.Timedelta(days=1))])
+            idx_parts.append(np.arange(lo, hi))
+            group_parts.append(np.full(hi - lo, j))
+        idx = np.concatenate(idx_parts)
+        if idx.size:
+            groups, mins = _min_distance_by_group(lats, lons, plat[idx], plon[idx], np.concatenate(group_parts))
+            result[:, groups] = mins
+
+    return pd.DataFrame(
+        {
+            "location": np.repeat(np.arange(len(lats)), len(horizons)),
+            "horizon_days": np.tile(np.asarray(horizons, dtype=int), len(lats)),
+            "NHC_distance_km": result.ravel(),
+        }
+    )
+
+
 def nhc_forecast_horizon_distances(
     lat: float,
     lon: float,
@@ -74,24 +134,7 @@ def nhc_forecast_horizon_distances(
                    com chaves como 'NHC_distance_km_D1'.
                    Retorna NaNs se não houver tempestades ou pontos de previsão.
     """
-    out: Dict[str, float] = {}
-    if storms is None or storms.empty or "time" not in storms:
-        for h in horizons_days:
-            out[f"NHC_distance_km_D{h}"] = np.nan
-        return pd.Series(out)
-    now = pd.Timestamp.utcnow().tz_localize(None)
-    df = storms.copy()
-    df["time"] = pd.to_datetime(df["time"]).dt.tz_localize(None)
-    for h in horizons_days:
-        target = (now + pd.Timedelta(days=h)).normalize()
-        # pick points within target day
-        mask = (df["time"] >= target) & (df["time"] < target + pd.Timedelta(days=1))
-        sub = df.loc[mask]
-        if sub.empty:
-            out[f"NHC_distance_km_D{h}"] = np.nan
-        else:
-            dmins = [
-                _haversine_km(lat, lon, float(r["lat"]), float(r["lon"])) for _, r in sub.iterrows()
-            ]
-            out[f"NHC_distance_km_D{h}"] = float(np.min(dmins)) if dmins else np.nan
-    return pd.Series(out)
+    tidy = nhc_forecast_horizon_distances_many([lat], [lon], storms, horizons_days)
+    return pd.Series(
+        {f"NHC_distance_km_D{h}": float(d) for h, d in zip(tidy["horizon_days"], tidy["NHC_distance_km"])}
+    )
@@ -0,0 +1,145 @@
+import io
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Leitores dos arquivos texto de índices climáticos mensais da NOAA (CPC/PSL).
+# As tabelas são localizadas pela estrutura das linhas (ano + valores, temporada + ano)
+# em vez de contagens fixas de linhas de cabeçalho/rodapé, e as datas são montadas
+# aritmeticamente como datetime64 (primeiro dia do mês).
+
+# Médias móveis de 3 meses, associadas ao mês central.
+SEASONS = ("DJF", "JFM", "FMA", "MAM", "AMJ", "MJJ", "JJA", "JAS", "ASO", "SON", "OND", "NDJ")
+
+
+def _is_year(token: str) -> bool:
+    return len(token) == 4 and token.isdigit()
+
+
+def _table_rows(
+    lines: Sequence[str],
+    start: int,
+    is_row: Callable[[List[str]], bool],
+    starts: Optional[Callable[[List[str]], bool]] = None,
+) -> List[str]:
+    # Primeiro bloco contíguo de linhas de dados a partir de `start`. O bloco começa na
+    # primeira linha aceita por `starts` (padrão: `is_row`) e segue enquanto `is_row`
+    # aceitar; assim uma linha curta no meio da tabela não a interrompe.
+    starts = is_row if starts is None else starts
+    rows: List[str] = []
+    for line in lines[start:]:
+        tokens = line.split()
+        if is_row(tokens) if rows else starts(tokens):
+            rows.append(line)
+        elif rows:
+            break
+    return rows
+
+
+def _read_rows(rows: List[str], n_cols: int) -> pd.DataFrame:
+    # Engine C do pandas; linhas curtas ficam com NaN.
+    return pd.read_csv(io.StringIO("\n".join(rows)), sep=r"\s+", header=None, names=range(n_cols), engine="c")
+
+
+def _numeric(df: pd.DataFrame) -> np.ndarray:
+    # Texto inesperado no lugar de um número vira NaN.
+    return df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+
+
+def month_stamps(years: np.ndarray, months: np.ndarray) -> pd.DatetimeIndex:
+    """
+    Converte pares (ano, mês 1-12) no primeiro dia do mês, sem passar por strings.
+
+    Args:
+        years (np.ndarray): Anos.
+        months (np.ndarray): Meses (1 a 12).
+
+    Returns:
+        pd.DatetimeIndex: Datas correspondentes, com o nome 'Data'.
+    """
+    offsets = (np.asarray(years, dtype=np.int64) - 1970) * 12 + np.asarray(months, dtype=np.int64) - 1
+    return pd.DatetimeIndex(offsets.astype("datetime64[M]").astype("datetime64[ns]"), name="Data")
+
+
+def _empty(column: str) -> pd.DataFrame:
+    return pd.DataFrame(columns=[column], index=pd.DatetimeIndex([], name="Data"))
+
+
+def parse_monthly_index(
+    text: str,
+    column: str,
+    section: Optional[str] = None,
+    missing: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Lê uma tabela "ano + 12 meses" (SOI, MEI.v2) e a transforma em série mensal.
+
+    Args:
+        text (str): Conteúdo do arquivo.
+        column (str): Nome da coluna de saída.
+        section (Optional[str]): Trecho de texto que marca a seção desejada; a tabela
+            lida é a primeira depois dele (None = primeira tabela do arquivo).
+        missing (Optional[float]): Valor de preenchimento a descartar (ex: -999.9).
+
+    Returns:
+        pd.DataFrame: DataFrame indexado por 'Data' (primeiro dia do mês) com a coluna `column`.
+    """
+    lines = text.splitlines()
+    start = 0
+    if section is not None:
+        start = next((i for i, line in enumerate(lines) if section in line), len(lines))
+    # Linhas de dados: ano seguido de valores. A tabela começa numa linha com vários valores
+    # (a linha "1979 2024" do MEI tem um só) e segue enquanto as linhas começarem por um ano.
+    rows = _table_rows(
+        lines,
+        start,
+        lambda tokens: len(tokens) > 1 and _is_year(tokens[0]),
+        starts=lambda tokens: len(tokens) > 2 and _is_year(tokens[0]),
+    )
+    if not rows:
+        return _empty(column)
+
+    table = _numeric(_read_rows(rows, 13))
+    years = np.repeat(table[:, 0], 12)
+    months = np.tile(np.arange(1, 13), len(table))
+    values = table[:, 1:].ravel()
+    keep = ~np.isnan(values) & ~np.isnan(years)
+    if missing is not None:
+        keep &= values != missing
+    index = month_stamps(years[keep], months[keep])
+    out = pd.DataFrame({column: values[keep]}, index=index)
+    return out.sort_index(kind="stable")
+
+
+def parse_seasonal_index(text: str, column: str = "ANOM") -> pd.DataFrame:
+    """
+    Lê uma tabela "temporada, ano, valores..." (ONI), associando cada média de 3 meses
+    ao mês central.
+
+    Args:
+        text (str): Conteúdo do arquivo.
+        column (str): Coluna do cabeçalho a extrair (ex: 'ANOM' ou 'TOTAL').
+
+    Returns:
+        pd.DataFrame: DataFrame indexado por 'Data' (mês central) com a coluna `column`.
+    """
+    lines = text.splitlines()
+    header_at = next((i for i, line in enumerate(lines) if column in line.split()), None)
+    if header_at is None:
+        return _empty(column)
+    header = lines[header_at].split()
+    value_at = header.index(column)
+    # Linhas sem a coluna pedida ficam com NaN e são descartadas abaixo.
+    rows = _table_rows(lines, header_at + 1, lambda tokens: len(tokens) > 1 and tokens[0] in SEASONS and _is_year(tokens[1]))
+    if not rows:
+        return _empty(column)
+
+    raw = _read_rows(rows, len(header))
+    table = _numeric(raw[[1, value_at]])
+    years, values = table[:, 0], table[:, 1]
+    keep = ~np.isnan(years) & ~np.isnan(values)
+    months = pd.Index(SEASONS).get_indexer(raw[0]) + 1
+    index = month_stamps(years[keep], months[keep])
+    out = pd.DataFrame({column: values[keep]}, index=index)
+    return out.sort_index(kind="stable")
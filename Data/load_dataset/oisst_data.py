@@ -1,9 +1,20 @@
 import io
+import numpy as np
 import pandas as pd
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Sequence, Tuple
 
 from endpoints import Endpoints
-from .utils import _to_iso_z, _safe_get
+from .mirrors import MirrorHealth, race_first
+from .utils import _to_iso_z, _fetch
+
+# Saúde dos pares (espelho ERDDAP, dataset id), compartilhada entre as chamadas.
+oisst_mirror_health = MirrorHealth()
+
+# Eixo de longitude de cada par (espelho, dataset): os datasets OISST do ERDDAP usam
+# 0..360, outros -180..180. Lido uma vez por par e reaproveitado.
+_lon_axes: Dict[Tuple[str, str], np.ndarray] = {}
 
 def _build_oisst_url(base: str, dsid: str, lat: float, lon: float, start_iso: str, end_iso: str) -> str:
     # griddap CSV query for point time series
@@ -12,6 +23,76 @@ def _build_oisst_url(base: str, dsid: str, lat: float, lon: float, start_iso: st
     return f"{base}/griddap/{dsid}.csv?time,lat,lon,sst[{start_iso}:1:{end_iso}][({lat})][({lon})]"
 
 
+def _lon_axis(base: str, dsid: str) -> np.ndarray | None:
+    """
+    Valores do eixo de longitude do dataset (griddap `longitude[0:1:last]`), ou None se o
+    espelho não responder.
+    """
+    axis = _lon_axes.get((base, dsid))
+    if axis is None:
+        r, _ = _fetch(f"{base}/griddap/{dsid}.csv?longitude[0:1:last]", max_retries=0)
+        if r is None:
+            return None
+        values = pd.read_csv(io.StringIO(r.text), skiprows=[1]).iloc[:, 0]
+        axis = np.sort(pd.to_numeric(values, errors="coerce").dropna().to_numpy())
+        if axis.size == 0:
+            return None
+        _lon_axes[(base, dsid)] = axis
+    return axis
+
+
+def _to_axis(lon: float, axis: np.ndarray) -> float:
+    # Leva uma longitude -180..180 para a convenção do eixo (0..360 se ele passa de 180).
+    return lon % 360.0 if axis[-1] > 180.0 else (lon + 180.0) % 360.0 - 180.0
+
+
+def _from_axis(lons: np.ndarray) -> np.ndarray:
+    # Longitudes do dataset (0..360 ou -180..180) de volta para -180..180.
+    return (lons + 180.0) % 360.0 - 180.0
+
+
+def _lon_segments(lon_min: float, lon_max: float, axis: np.ndarray) -> List[Tuple[float, float]]:
+    """
+    Faixas [início, fim] do eixo do dataset que cobrem a caixa lon_min..lon_max
+    (-180..180). Uma caixa que atravessa a emenda do eixo (180° em -180..180, 0° em
+    0..360) vira duas faixas, uma em cada ponta.
+    """
+    if lon_max - lon_min >= 360.0:
+        return [(float(axis[0]), float(axis[-1]))]
+    a, b = _to_axis(lon_min, axis), _to_axis(lon_max, axis)
+    clamp = lambda v: float(min(max(v, axis[0]), axis[-1]))
+    if a <= b:
+        return [(clamp(a), clamp(b))]
+    return [(clamp(a), float(axis[-1])), (float(axis[0]), clamp(b))]
+
+
+def _parse_oisst_csv(text: str) -> pd.DataFrame | None:
+    df = pd.read_csv(io.StringIO(text))
+    # Find time column flexibly (e.g., 'time', 'time (utc)')
+    time_col = None
+    for c in df.columns:
+        cl = c.lower()
+        if cl.startswith("time"):
+            time_col = c
+            break
+    # Find sst column (e.g., 'sst', 'sst (degree_c)')
+    sst_col = None
+    for c in df.columns:
+        cl = c.lower()
+        if cl.startswith("sst"):
+            sst_col = c
+            break
+    if time_col is None or sst_col is None:
+        return None
+    df["date"] = pd.to_datetime(df[time_col], errors="coerce").dt.tz_localize(None).dt.normalize()
+    df = df.dropna(subset=["date"]).set_index("date").sort_index()
+    out = df[[sst_col]].rename(columns={sst_col: "SST_OISST"})
+    # A linha de unidades do CSV deixa a coluna como texto; converte para número.
+    out["SST_OISST"] = pd.to_numeric(out["SST_OISST"], errors="coerce")
+    # Convert from Kelvin if needed; OISST is in °C already
+    return out
+
+
 def fetch_oisst_sst(
     lat: float,
     lon: float,
@@ -22,6 +103,11 @@ def fetch_oisst_sst(
     """
     Busca dados de temperatura da superfície do mar (SST) do NOAA ERDDAP OISST.
 
+    Os pares (espelho ERDDAP, dataset) são tentados em corrida (load_dataset.mirrors):
+    o par que funcionou mais rápido nas chamadas anteriores vai primeiro, outros entram
+    em paralelo se ele falhar ou demorar, e pares com falhas seguidas são pulados por
+    alguns minutos.
+
     Args:
         lat (float): Latitude do ponto de interesse.
         lon (float): Longitude do ponto de interesse.
@@ -34,36 +120,161 @@ def fetch_oisst_sst(
     """
     start_iso = _to_iso_z(start)
     end_iso = _to_iso_z(end)
-    for base in endpoints.erddap_bases:
-        for dsid in endpoints.oisst_ids:
-            url = _build_oisst_url(base, dsid, lat, lon, start_iso, end_iso)
-            r = _safe_get(url)
-            if r is None:
-                continue
-            try:
-                df = pd.read_csv(io.StringIO(r.text))
-                cols_lower = {c.lower(): c for c in df.columns}
-                # Find time column flexibly (e.g., 'time', 'time (utc)')
-                time_col = None
-                for c in df.columns:
-                    cl = c.lower()
-                    if cl.startswith("time"):
-                        time_col = c
-                        break
-                # Find sst column (e.g., 'sst', 'sst (degree_c)')
-                sst_col = None
-                for c in df.columns:
-                    cl = c.lower()
-                    if cl.startswith("sst"):
-                        sst_col = c
-                        break
-                if time_col is None or sst_col is None:
-                    continue
-                df["date"] = pd.to_datetime(df[time_col], errors="coerce").dt.tz_localize(None).dt.normalize()
-                df = df.dropna(subset=["date"]).set_index("date").sort_index()
-                out = df[[sst_col]].rename(columns={sst_col: "SST_OISST"})
-                # Convert from Kelvin if needed; OISST is in °C already
-                return out
-            except Exception:
-                continue
+
+    def attempt(mirror: Tuple[str, str]) -> pd.DataFrame | None:
+        base, dsid = mirror
+        axis = _lon_axis(base, dsid)
+        if axis is None:
+            return None
+        # Sem novas tentativas por espelho: a redundância vem dos outros espelhos.
+        url = _build_oisst_url(base, dsid, lat, _to_axis(lon, axis), start_iso, end_iso)
+        r, _ = _fetch(url, max_retries=0)
+        return None if r is None else _parse_oisst_csv(r.text)
+
+    mirrors = [(base, dsid) for base in endpoints.erddap_bases for dsid in endpoints.oisst_ids]
+    _, out = race_first(mirrors, attempt, oisst_mirror_health, group=lambda mirror: mirror[0])
+    if out is not None:
+        return out
     return pd.DataFrame(index=pd.to_datetime([]), columns=["SST_OISST"]).astype(float)
+
+
+def _empty_oisst() -> pd.DataFrame:
+    return pd.DataFrame(index=pd.to_datetime([]), columns=["SST_OISST"]).astype(float)
+
+
+def _build_oisst_box_url(
+    base: str, dsid: str, lat_min: float, lat_max: float, lon_min: float, lon_max: float, start_iso: str, end_iso: str
+) -> str:
+    # griddap CSV: cabeçalho com os nomes das colunas (time, [zlev,] latitude, longitude, sst)
+    # e uma linha de unidades.
+    return (
+        f"{base}/griddap/{dsid}.csv?sst[({start_iso}):1:({end_iso})]"
+        f"[({lat_min}):1:({lat_max})][({lon_min}):1:({lon_max})]"
+    )
+
+
+def _find_column(columns, prefix: str) -> str | None:
+    # Primeira coluna cujo nome começa com `prefix` (ex: 'time', 'time (UTC)').
+    return next((c for c in columns if str(c).lower().startswith(prefix)), None)
+
+
+def _group_boxes(lats: np.ndarray, lons: np.ndarray, box_deg: float) -> Dict[Tuple[int, int], np.ndarray]:
+    # Agrupa os pontos por célula de box_deg x box_deg graus.
+    keys = zip(np.floor(lats / box_deg).astype(int), np.floor(lons / box_deg).astype(int))
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(key, []).append(i)
+    return {k: np.array(v) for k, v in groups.items()}
+
+
+def _fetch_oisst_box(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    start_iso: str,
+    end_iso: str,
+    endpoints: Endpoints,
+    pad_deg: float,
+) -> List[pd.DataFrame] | None:
+    lat_min, lat_max = float(lats.min()) - pad_deg, float(lats.max()) + pad_deg
+    lon_min, lon_max = float(lons.min()) - pad_deg, float(lons.max()) + pad_deg
+
+    def fetch_segment(base: str, dsid: str, seg_min: float, seg_max: float) -> pd.DataFrame | None:
+        url = _build_oisst_box_url(base, dsid, lat_min, lat_max, seg_min, seg_max, start_iso, end_iso)
+        r, _ = _fetch(url, stream=True, max_retries=0)
+        if r is None:
+            return None
+        try:
+            r.raw.decode_content = True
+            # Parse em streaming direto do socket, sem montar o texto inteiro na memória.
+            # As colunas vêm do cabeçalho: datasets com eixo zlev têm uma coluna a mais.
+            box = pd.read_csv(r.raw, skiprows=[1])
+        finally:
+            r.close()
+        names = {prefix: _find_column(box.columns, prefix) for prefix in ("time", "lat", "lon", "sst")}
+        if any(c is None for c in names.values()) or box.empty:
+            return None
+        box = box[list(names.values())].set_axis(list(names), axis=1)
+        for c in ("lat", "lon", "sst"):
+            box[c] = pd.to_numeric(box[c], errors="coerce")
+        box["lon"] = _from_axis(box["lon"].to_numpy())
+        return box
+
+    def attempt(mirror: Tuple[str, str]) -> pd.DataFrame | None:
+        base, dsid = mirror
+        axis = _lon_axis(base, dsid)
+        if axis is None:
+            return None
+        parts = []
+        for seg_min, seg_max in _lon_segments(lon_min, lon_max, axis):
+            part = fetch_segment(base, dsid, seg_min, seg_max)
+            if part is None:
+                return None
+            parts.append(part)
+        return pd.concat(parts, ignore_index=True)
+
+    mirrors = [(base, dsid) for base in endpoints.erddap_bases for dsid in endpoints.oisst_ids]
+    _, box = race_first(mirrors, attempt, oisst_mirror_health, group=lambda mirror: mirror[0])
+    if box is None:
+        return None
+
+    # Célula mais próxima de cada ponto (como o seletor "(valor)" do ERDDAP faz por ponto).
+    grid_lat = np.unique(box["lat"].to_numpy())
+    grid_lon = np.unique(box["lon"].to_numpy())
+    box["date"] = pd.to_datetime(box["time"], errors="coerce").dt.tz_localize(None).dt.normalize()
+    box = box.dropna(subset=["date"])
+    frames: List[pd.DataFrame] = []
+    for lat, lon in zip(lats, lons):
+        cell_lat = grid_lat[np.argmin(np.abs(grid_lat - lat))]
+        # Distância em longitude pelo menor arco, para caixas que atravessam ±180°.
+        cell_lon = grid_lon[np.argmin(np.abs((grid_lon - lon + 180.0) % 360.0 - 180.0))]
+        cell = box.loc[(box["lat"] == cell_lat) & (box["lon"] == cell_lon), ["date", "sst"]]
+        frames.append(cell.set_index("date").sort_index().rename(columns={"sst": "SST_OISST"}))
+    return frames
+
+
+def fetch_oisst_sst_many(
+    lats: Sequence[float],
+    lons: Sequence[float],
+    start: dt.date | dt.datetime | str,
+    end: dt.date | dt.datetime | str,
+    endpoints: Endpoints = Endpoints(),
+    box_deg: float = 5.0,
+    grid_step_deg: float = 0.25,
+    max_workers: int = 4,
+) -> List[pd.DataFrame]:
+    """
+    Busca a SST do NOAA ERDDAP OISST para vários pontos com poucas requisições: os
+    pontos são agrupados em caixas de `box_deg` graus, cada caixa é baixada uma única vez
+    (CSV lido em streaming, colunas localizadas pelo cabeçalho) e a célula de grade mais
+    próxima de cada ponto é extraída localmente. Caixas que falham em todos os espelhos caem para fetch_oisst_sst por ponto.
+    As longitudes (-180..180) são convertidas para o eixo de cada dataset (0..360 nos OISST
+    do ERDDAP) e de volta; uma caixa que atravessa a emenda do eixo é pedida em duas partes.
+
+    Args:
+        lats (Sequence[float]): Latitudes dos pontos.
+        lons (Sequence[float]): Longitudes dos pontos.
+        start (dt.date | dt.datetime | str): Data de início da busca.
+        end (dt.date | dt.datetime | str): Data de fim da busca.
+        endpoints (Endpoints): Objeto contendo os URLs dos endpoints das APIs.
+        box_deg (float): Tamanho (graus) das caixas usadas para agrupar os pontos.
+        grid_step_deg (float): Resolução da grade OISST; a caixa é ampliada em meio passo para incluir a célula mais próxima.
+        max_workers (int): Caixas buscadas em paralelo.
+
+    Returns:
+        List[pd.DataFrame]: Um DataFrame por ponto, na ordem recebida, no mesmo formato de fetch_oisst_sst.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    start_iso = _to_iso_z(start)
+    end_iso = _to_iso_z(end)
+    results: List[pd.DataFrame] = [_empty_oisst() for _ in range(len(lats))]
+    boxes = _group_boxes(lats, lons, box_deg)
+
+    def fetch_box(idx: np.ndarray) -> None:
+        frames = _fetch_oisst_box(lats[idx], lons[idx], start_iso, end_iso, endpoints, grid_step_deg / 2)
+        for j, i in enumerate(idx):
+            results[i] = frames[j] if frames is not None else fetch_oisst_sst(lats[i], lons[i], start, end, endpoints)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(fetch_box, boxes.values()))
+    return results
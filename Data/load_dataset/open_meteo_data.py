@@ -2,8 +2,80 @@ import pandas as pd
 import numpy as np
 import requests
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Sequence
+
 from endpoints import Endpoints
-from .utils import _safe_get
+from .utils import _fetch, _safe_get
+
+# Variáveis diárias da previsão do Open-Meteo -> colunas do dataset.
+FORECAST_DAILY_COLUMNS: Dict[str, str] = {
+    "temperature_2m_max": "T2M_MAX_FC",
+    "temperature_2m_min": "T2M_MIN_FC",
+    "apparent_temperature_max": "T2M_APPARENT_MAX_FC",
+    "apparent_temperature_min": "T2M_APPARENT_MIN_FC",
+    "precipitation_sum": "PRECIP_SUM_FC",
+    "precipitation_probability_max": "PRECIP_PROB_MAX_FC",
+    "precipitation_hours": "PRECIP_HOURS_FC",
+    "windspeed_10m_max": "WIND_MAX10M_FC",
+    "windgusts_10m_max": "WINDGUST_MAX10M_FC",
+    "relative_humidity_2m_mean": "RH2M_MEAN_FC",
+    "cloudcover_mean": "CLOUDCOVER_MEAN_FC",
+    "pressure_msl_mean": "PRESSURE_MSL_MEAN_FC",
+    "uv_index_max": "UV_INDEX_MAX_FC",
+    "shortwave_radiation_sum": "SW_RADIATION_SUM_FC",
+}
+
+# Localizações por requisição nas variantes em lote (latitude/longitude separadas por vírgula).
+OPEN_METEO_CHUNK_SIZE = 100
+
+
+def _forecast_params(days: int) -> Dict[str, object]:
+    return {
+        "forecast_days": max(1, min(16, days)),
+        "daily": ",".join(FORECAST_DAILY_COLUMNS),
+        "timezone": "UTC",
+        "models": "gfs_seamless",  # prefer GFS where available
+    }
+
+
+def _marine_params(days: int) -> Dict[str, object]:
+    return {
+        "forecast_days": max(1, min(16, days)),
+        "daily": "sea_surface_temperature_mean",
+        "timezone": "UTC",
+    }
+
+
+def _empty_forecast() -> pd.DataFrame:
+    return pd.DataFrame(index=pd.to_datetime([]))
+
+
+def _empty_marine() -> pd.DataFrame:
+    return pd.DataFrame(index=pd.to_datetime([]), columns=["SST_FC"]).astype(float)
+
+
+def _parse_forecast_daily(data: dict) -> pd.DataFrame:
+    daily_obj = data.get("daily", {})
+    times = pd.to_datetime(daily_obj.get("time", []))
+    columns = {
+        dst: (daily_obj.get(src) or np.full(len(times), np.nan))
+        for src, dst in FORECAST_DAILY_COLUMNS.items()
+    }
+    df = pd.DataFrame(columns, index=times)
+    df.index.name = "date"
+    return df
+
+
+def _parse_marine_daily(data: dict) -> pd.DataFrame:
+    daily_obj = data.get("daily", {})
+    times = pd.to_datetime(daily_obj.get("time", []))
+    sst_vals = daily_obj.get("sea_surface_temperature_mean", [])
+    if not sst_vals:
+        return _empty_marine()
+    df = pd.DataFrame({"SST_FC": sst_vals}, index=times)
+    df.index.name = "date"
+    return df
 
 def fetch_open_meteo_daily_forecast(
     lat: float,
@@ -23,65 +95,15 @@ def fetch_open_meteo_daily_forecast(
     Returns:
         pd.DataFrame: DataFrame indexado por data UTC com colunas de previsão diária.
     """
-    daily = [
-        "temperature_2m_max",
-        "temperature_2m_min",
-        "apparent_temperature_max",
-        "apparent_temperature_min",
-        "precipitation_sum",
-        "precipitation_probability_max",
-        "precipitation_hours",
-        "windspeed_10m_max",
-        "windgusts_10m_max",
-        "relative_humidity_2m_mean",
-        "cloudcover_mean",
-        "pressure_msl_mean",
-        "uv_index_max",
-        "shortwave_radiation_sum",
-    ]
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "forecast_days": max(1, min(16, days)),
-        "daily": ",".join(daily),
-        "timezone": "UTC",
-        "models": "gfs_seamless",  # prefer GFS where available
-    }
+    params = {"latitude": lat, "longitude": lon, **_forecast_params(days)}
     url = endpoints.open_meteo_base + "?" + requests.compat.urlencode(params)
     r = _safe_get(url)
     if r is None:
-        return pd.DataFrame(index=pd.to_datetime([]))
+        return _empty_forecast()
     try:
-        data = r.json()
-        daily_obj = data.get("daily", {})
-        times = pd.to_datetime(daily_obj.get("time", []))
-        df = pd.DataFrame(index=times)
-        df.index.name = "date"
-        mapping = {
-        "temperature_2m_max": "T2M_MAX_FC",
-        "temperature_2m_min": "T2M_MIN_FC",
-        "apparent_temperature_max": "T2M_APPARENT_MAX_FC",
-        "apparent_temperature_min": "T2M_APPARENT_MIN_FC",
-        "precipitation_sum": "PRECIP_SUM_FC",
-        "precipitation_probability_max": "PRECIP_PROB_MAX_FC",
-        "precipitation_hours": "PRECIP_HOURS_FC",
-        "windspeed_10m_max": "WIND_MAX10M_FC",
-        "windgusts_10m_max": "WINDGUST_MAX10M_FC",
-        "relative_humidity_2m_mean": "RH2M_MEAN_FC",
-        "cloudcover_mean": "CLOUDCOVER_MEAN_FC",
-        "pressure_msl_mean": "PRESSURE_MSL_MEAN_FC",
-        "uv_index_max": "UV_INDEX_MAX_FC",
-        "shortwave_radiation_sum": "SW_RADIATION_SUM_FC",
-        }
-        for src, dst in mapping.items():
-            vals = daily_obj.get(src, [])
-            if not vals:
-                df[dst] = np.nan
-            else:
-                df[dst] = pd.Series(vals, index=times)
-        return df
+        return _parse_forecast_daily(r.json())
     except Exception:
-        return pd.DataFrame(index=pd.to_datetime([]))
+        return _empty_forecast()
 
 
 def fetch_open_meteo_marine_sst(
@@ -102,27 +124,131 @@ def fetch_open_meteo_marine_sst(
     Returns:
         pd.DataFrame: DataFrame indexado por data com a coluna SST_FC.
     """
-    daily = ["sea_surface_temperature_mean"]
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "forecast_days": max(1, min(16, days)),
-        "daily": ",".join(daily),
-        "timezone": "UTC",
-    }
+    params = {"latitude": lat, "longitude": lon, **_marine_params(days)}
     url = endpoints.open_meteo_marine_base + "?" + requests.compat.urlencode(params)
     r = _safe_get(url)
     if r is None:
-        return pd.DataFrame(index=pd.to_datetime([]), columns=["SST_FC"]).astype(float)
+        return _empty_marine()
     try:
-        data = r.json()
-        daily_obj = data.get("daily", {})
-        times = pd.to_datetime(daily_obj.get("time", []))
-        sst_vals = daily_obj.get("sea_surface_temperature_mean", [])
-        if not sst_vals:
-            return pd.DataFrame(index=pd.to_datetime([]), columns=["SST_FC"]).astype(float)
-        df = pd.DataFrame({"SST_FC": sst_vals}, index=times)
-        df.index.name = "date"
-        return df
+        return _parse_marine_daily(r.json())
     except Exception:
-        return pd.DataFrame(index=pd.to_datetime([]), columns=["SST_FC"]).astype(float)
+        return _empty_marine()
+
+
+def _fetch_many(
+    base: str,
+    params: Dict[str, object],
+    lats: Sequence[float],
+    lons: Sequence[float],
+    parse: Callable[[dict], pd.DataFrame],
+    empty: Callable[[], pd.DataFrame],
+    chunk_size: int,
+    max_workers: int,
+) -> pd.DataFrame:
+    # Uma requisição por bloco de localizações; a resposta é uma lista com um objeto por
+    # localização, na ordem pedida (ou um único objeto quando o bloco tem uma só).
+    # Se a API recusa o bloco (4xx, ex: uma coordenada inválida) ou a resposta não tem um
+    # objeto por localização, o bloco é dividido ao meio e cada metade é pedida de novo,
+    # até isolar as localizações com problema; as demais recebem seus dados.
+    # Falhas de conexão/5xx (já com novas tentativas) não são divididas.
+    lats, lons = list(lats), list(lons)
+    frames: List[pd.DataFrame] = [empty() for _ in lats]
+
+    def fetch_range(start: int, stop: int) -> None:
+        query = {
+            "latitude": ",".join(str(v) for v in lats[start:stop]),
+            "longitude": ",".join(str(v) for v in lons[start:stop]),
+            **params,
+        }
+        r, record = _fetch(base + "?" + requests.compat.urlencode(query))
+        items = None
+        if r is not None:
+            try:
+                data = r.json()
+                items = data if isinstance(data, list) else [data]
+            except ValueError:
+                items = None
+            if items is not None and len(items) != stop - start:
+                items = None
+        elif record.status is None or record.status >= 500 or record.status == 429:
+            return
+        if items is None:
+            if stop - start > 1:
+                middle = (start + stop) // 2
+                fetch_range(start, middle)
+                fetch_range(middle, stop)
+            return
+        for i, item in zip(range(start, stop), items):
+            try:
+                frames[i] = parse(item)
+            except Exception:
+                pass
+
+    def fetch_chunk(start: int) -> None:
+        fetch_range(start, min(len(lats), start + chunk_size))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(fetch_chunk, range(0, len(lats), chunk_size)))
+    if not frames:
+        return pd.concat([empty()], keys=[0], names=["location", "date"])
+    return pd.concat(frames, keys=range(len(frames)), names=["location", "date"])
+
+
+def fetch_open_meteo_daily_forecast_many(
+    lats: Sequence[float],
+    lons: Sequence[float],
+    days: int = 7,
+    endpoints: Endpoints = Endpoints(),
+    chunk_size: int = OPEN_METEO_CHUNK_SIZE,
+    max_workers: int = 4,
+) -> pd.DataFrame:
+    """
+    Variante em lote de fetch_open_meteo_daily_forecast: agrupa as localizações em
+    requisições com várias coordenadas (chunk_size por requisição).
+
+    Args:
+        lats (Sequence[float]): Latitudes das localizações.
+        lons (Sequence[float]): Longitudes das localizações.
+        days (int): Número de dias para a previsão (máximo de 16 dias).
+        endpoints (Endpoints): Objeto contendo os URLs dos endpoints das APIs.
+        chunk_size (int): Localizações por requisição.
+        max_workers (int): Requisições em paralelo.
+
+    Returns:
+        pd.DataFrame: Formato longo indexado por (location, date), onde location é a posição
+        em lats/lons, com as mesmas colunas de fetch_open_meteo_daily_forecast.
+    """
+    return _fetch_many(
+        endpoints.open_meteo_base, _forecast_params(days), lats, lons,
+        _parse_forecast_daily, _empty_forecast, chunk_size, max_workers,
+    )
+
+
+def fetch_open_meteo_marine_sst_many(
+    lats: Sequence[float],
+    lons: Sequence[float],
+    days: int = 7,
+    endpoints: Endpoints = Endpoints(),
+    chunk_size: int = OPEN_METEO_CHUNK_SIZE,
+    max_workers: int = 4,
+) -> pd.DataFrame:
+    """
+    Variante em lote de fetch_open_meteo_marine_sst: agrupa as localizações em
+    requisições com várias coordenadas (chunk_size por requisição).
+
+    Args:
+        lats (Sequence[float]): Latitudes das localizações.
+        lons (Sequence[float]): Longitudes das localizações.
+        days (int): Número de dias para a previsão (máximo de 16 dias).
+        endpoints (Endpoints): Objeto contendo os URLs dos endpoints das APIs.
+        chunk_size (int): Localizações por requisição.
+        max_workers (int): Requisições em paralelo.
+
+    Returns:
+        pd.DataFrame: Formato longo indexado por (location, date), onde location é a posição
+        em lats/lons, com a coluna SST_FC.
+    """
+    return _fetch_many(
+        endpoints.open_meteo_marine_base, _marine_params(days), lats, lons,
+        _parse_marine_daily, _empty_marine, chunk_size, max_workers,
+    )
@@ -0,0 +1,154 @@
+import datetime as dt
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from endpoints import Endpoints
+from .power_data import DEFAULT_PARAMS_POWER, fetch_power_daily
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "power_store")
+
+# Limites por requisição: a API diária por ponto aceita até 20 parâmetros; o período é
+# dividido em blocos para manter cada resposta pequena.
+MAX_PARAMS_PER_REQUEST = 20
+MAX_DAYS_PER_REQUEST = 366 * 5
+
+# Valor de preenchimento da POWER para dados ausentes.
+POWER_FILL_VALUE = -999.0
+# Dias recentes ainda podem ser preenchidos/revisados pela POWER; -999 nesse intervalo
+# é tratado como lacuna e buscado de novo, fora dele é considerado definitivo.
+POWER_FINAL_AFTER_DAYS = 30
+
+
+def _date_gaps(missing: pd.DatetimeIndex, max_days: int) -> List[Tuple[dt.date, dt.date]]:
+    # Agrupa datas ausentes (ordenadas) em intervalos contíguos de no máximo max_days.
+    gaps: List[Tuple[dt.date, dt.date]] = []
+    if missing.empty:
+        return gaps
+    run_start = prev = missing[0]
+    for d in missing[1:]:
+        if (d - prev).days != 1 or (d - run_start).days >= max_days:
+            gaps.append((run_start.date(), prev.date()))
+            run_start = d
+        prev = d
+    gaps.append((run_start.date(), prev.date()))
+    return gaps
+
+
+class PowerStore:
+    """
+    Armazenamento local (um arquivo Parquet por localização) dos dados diários da NASA
+    POWER. Cada consulta busca na API apenas as datas/parâmetros que ainda não estão no
+    arquivo e as incorpora a ele, de modo que a atualização diária de uma localização
+    vira uma requisição de poucos dias.
+    """
+
+    def __init__(self, directory: str = DEFAULT_STORE_DIR, endpoints: Endpoints = Endpoints()):
+        self.directory = directory
+        self.endpoints = endpoints
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.requests_made = 0
+
+    def path_for(self, lat: float, lon: float) -> str:
+        return os.path.join(self.directory, f"lat{lat:.4f}_lon{lon:.4f}.parquet")
+
+    def _lock(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def read(self, lat: float, lon: float) -> pd.DataFrame:
+        path = self.path_for(lat, lon)
+        if not os.path.exists(path):
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+        return pd.read_parquet(path)
+
+    def _write(self, path: str, df: pd.DataFrame) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+
+    def missing_ranges(
+        self,
+        stored: pd.DataFrame,
+        start: dt.date,
+        end: dt.date,
+        params: List[str],
+    ) -> List[Tuple[dt.date, dt.date]]:
+        """
+        Calcula os intervalos de datas que precisam ser buscados na API.
+
+        Args:
+            stored (pd.DataFrame): Dados já armazenados da localização.
+            start (dt.date): Data de início desejada.
+            end (dt.date): Data de fim desejada.
+            params (List[str]): Parâmetros desejados.
+
+        Returns:
+            List[Tuple[dt.date, dt.date]]: Intervalos (início, fim) inclusivos, já divididos em blocos.
+        """
+        wanted = pd.date_range(start, end, freq="D", name="date")
+        present = stored.reindex(index=wanted, columns=params).to_numpy(dtype=float)
+        recent = wanted > pd.Timestamp(dt.date.today() - dt.timedelta(days=POWER_FINAL_AFTER_DAYS))
+        incomplete = pd.isna(present) | ((present == POWER_FILL_VALUE) & recent[:, None])
+        return _date_gaps(wanted[incomplete.any(axis=1)], MAX_DAYS_PER_REQUEST)
+
+    def fetch(
+        self,
+        lat: float,
+        lon: float,
+        start: dt.date | dt.datetime | str,
+        end: dt.date | dt.datetime | str,
+        params: Optional[List[str]] = None,
+        endpoints: Optional[Endpoints] = None,
+    ) -> pd.DataFrame:
+        """
+        Retorna os dados diários da NASA POWER para o ponto e o período, no mesmo formato
+        de fetch_power_daily (colunas na ordem de `params`), buscando na API somente as
+        lacunas do armazenamento local.
+
+        Args:
+            lat (float): Latitude do ponto de interesse.
+            lon (float): Longitude do ponto de interesse.
+            start (dt.date | dt.datetime | str): Data de início da busca.
+            end (dt.date | dt.datetime | str): Data de fim da busca.
+            params (Optional[List[str]]): Lista de parâmetros a serem buscados. Se None, usa DEFAULT_PARAMS_POWER.
+            endpoints (Optional[Endpoints]): Endpoints das APIs; se None, usa os do armazenamento.
+
+        Returns:
+            pd.DataFrame: DataFrame com os dados diários da NASA POWER.
+        """
+        params = list(DEFAULT_PARAMS_POWER if params is None else params)
+        endpoints = self.endpoints if endpoints is None else endpoints
+        start_date = pd.Timestamp(start).date()
+        end_date = pd.Timestamp(end).date()
+        path = self.path_for(lat, lon)
+
+        with self._lock(path):
+            stored = self.read(lat, lon)
+            fetched: List[pd.DataFrame] = []
+            for gap_start, gap_end in self.missing_ranges(stored, start_date, end_date, params):
+                for i in range(0, len(params), MAX_PARAMS_PER_REQUEST):
+                    chunk = fetch_power_daily(
+                        lat, lon, gap_start, gap_end, params[i:i + MAX_PARAMS_PER_REQUEST], endpoints=endpoints
+                    )
+                    with self._locks_guard:
+                        self.requests_made += 1
+                    if not chunk.empty:
+                        fetched.append(chunk)
+            if fetched:
+                new = pd.concat(fetched)
+                new = new.groupby(level=0).first()  # blocos de parâmetros da mesma data numa linha
+                columns = list(stored.columns) + [c for c in new.columns if c not in stored.columns]
+                stored = new.combine_first(stored)[columns].sort_index()
+                stored.index.name = "date"
+                self._write(path, stored)
+
+        window = stored.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)]
+        df = window[[c for c in params if c in stored.columns]]
+        if df.empty:
+            return pd.DataFrame(index=pd.to_datetime([]))
+        return df
@@ -1,7 +1,10 @@
 import datetime as dt
-import math
+import numpy as np
 import requests
-from typing import Optional
+from typing import Optional, Tuple
+
+from .geo import _haversine_km, _haversine_km_np
+from .http_session import RequestRecord, http_session
 
 
 def _to_yyyymmdd(d: dt.date | dt.datetime | str) -> str:
@@ -25,20 +28,63 @@ def _to_iso_z(dt_like: dt.date | dt.datetime | str) -> str:
     raise ValueError("Unsupported date type")
 
 
-def _safe_get(url: str, timeout: int = 60) -> Optional[requests.Response]:
-    try:
-        r = requests.get(url, timeout=timeout)
-        r.raise_for_status()
-        return r
-    except Exception:
-        return None
+def _fetch(
+    url: str,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+    max_retries: Optional[int] = None,
+) -> Tuple[Optional[requests.Response], RequestRecord]:
+    # Resposta (ou None) e o registro com status, tentativas, duração e motivo da falha.
+    return http_session.get(url, timeout=timeout, stream=stream, max_retries=max_retries)
+
+
+def _safe_get(url: str, timeout: Optional[float] = None) -> Optional[requests.Response]:
+    # Mantém o contrato antigo (None em caso de falha); o motivo fica em http_session.records.
+    r, _ = _fetch(url, timeout=timeout)
+    return r
+
+
+def _haversine_km_exact(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    # _haversine_km aplicada elemento a elemento (mesmos valores, bit a bit).
+    args = (np.asarray(a, dtype=np.float64).tolist() for a in (lat1, lon1, lat2, lon2))
+    return np.fromiter(map(_haversine_km, *args), dtype=np.float64, count=np.size(lat1))
+
+
+# Margem para selecionar os candidatos ao mínimo (o erro da haversine vetorizada é ~1e-11 km).
+_EXACT_TOL_KM = 1e-6
+
+
+def _min_distance_by_group(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    plat: np.ndarray,
+    plon: np.ndarray,
+    group: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distância mínima de cada localização para cada grupo de pontos (ex: um dia).
+
+    A haversine vetorizada escolhe os candidatos ao mínimo e o valor final vem de
+    _haversine_km, então o resultado é idêntico ao cálculo ponto a ponto (inclusive
+    NaN quando algum ponto do grupo tem coordenada ausente).
 
+    Args:
+        lats (np.ndarray): Latitudes das localizações (L).
+        lons (np.ndarray): Longitudes das localizações (L).
+        plat (np.ndarray): Latitudes dos pontos (P), ordenados por grupo.
+        plon (np.ndarray): Longitudes dos pontos (P).
+        group (np.ndarray): Identificador (inteiro, não decrescente) do grupo de cada ponto.
 
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371.0
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Os grupos presentes (G) e a matriz L x G de mínimos.
+    """
+    d = _haversine_km_np(lats[:, None], lons[:, None], plat[None, :], plon[None, :])
+    seg = np.flatnonzero(np.diff(group, prepend=group[0] - 1))
+    mins = np.minimum.reduceat(d, seg, axis=1)
+    counts = np.diff(np.append(seg, len(group)))
+    rows, cols = np.nonzero(d <= np.repeat(mins, counts, axis=1) + _EXACT_TOL_KM)
+    exact = _haversine_km_exact(lats[rows], lons[rows], plat[cols], plon[cols])
+    cell = np.full(mins.shape, np.inf)
+    np.minimum.at(cell, (rows, np.searchsorted(seg, cols, side="right") - 1), exact)
+    cell[np.isnan(mins)] = np.nan
+    return group[seg], cell
@@ -0,0 +1,244 @@
+"""
+Geração das mensagens do SabIA (coluna sabia_message_en) para as previsões classificadas.
+
+Linhas com a mesma chave de modelo (cidade, classificação e temperatura média
+arredondada) recebem a mesma mensagem, então a API de chat é chamada uma única vez por
+chave. As mensagens geradas ficam num cache em disco entre as execuções; as chaves que
+faltam são geradas em paralelo (com limite de concorrência e novas tentativas), e quando
+a API não está disponível a mensagem sai de um modelo local.
+"""
+import json
+import math
+import os
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from load_dataset.http_session import RetryPolicy
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "classified_forecasts", "sabia_messages_cache.json")
+MAX_MESSAGE_CHARS = 150
+
+# Classificação principal de uma linha: a primeira extrema, nesta ordem, ou 'normal'.
+CLASSIFICATION_PRIORITY = ["very_hot", "very_cold", "very_windy", "very_wet", "very_uncomfortable"]
+
+# Mensagens locais usadas quando a API não responde ({temp} = " (28°C)", ou vazio sem T2M).
+LOCAL_TEMPLATES = {
+    "very_hot": "A scorching day in {city}{temp}! Cool off with a dip or some açaí, and stay hydrated.",
+    "very_cold": "Brr, a very cold day in {city}{temp}! Time for a warm pão de queijo and a cozy café.",
+    "very_windy": "Hold onto your hat, it's windy in {city}{temp}! A great day for a walk in the park.",
+    "very_wet": "A humid day in {city}{temp}. Visit a museum or catch a show, and bring an umbrella!",
+    "very_uncomfortable": "Hot and muggy in {city}{temp}. Stay inside with a Minas coffee and take it easy.",
+    "normal": "A pleasant day in {city}{temp}! Perfect for a stroll outdoors and enjoying the Cerrado weather.",
+}
+
+
+def main_classification(classification: str) -> str:
+    classifications = [c.strip() for c in classification.split(",")] if classification else ["normal"]
+    return next((c for c in CLASSIFICATION_PRIORITY if c in classifications), "normal")
+
+
+def _normalize_city(city: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", str(city)).split()).casefold()
+
+
+def _truncate(message: str) -> str:
+    # Garantir que a mensagem final seja curta (max 150 caracteres)
+    message = message.strip()
+    return message if len(message) <= MAX_MESSAGE_CHARS else message[:MAX_MESSAGE_CHARS - 3] + "..."
+
+
+@dataclass
+class MessageStats:
+    rows: int = 0
+    unique_keys: int = 0
+    cache_hits: int = 0
+    api_calls: int = 0
+    api_retries: int = 0
+    generated: int = 0
+    fallbacks: int = 0
+
+
+class SabiaMessageGenerator:
+    """
+    Gera a coluna sabia_message_en a partir das previsões classificadas.
+
+    Args:
+        api_key (Optional[str]): Chave da API de chat (None = usa só os modelos locais).
+        base_url (str): URL base de uma API compatível com /chat/completions (ex: um servidor local de teste).
+        model (str): Modelo de chat.
+        cache_path (Optional[str]): Arquivo JSON do cache de mensagens (None = sem cache em disco).
+        max_concurrency (int): Máximo de chamadas simultâneas à API.
+        retry (Optional[RetryPolicy]): Novas tentativas em 429/5xx e erros de conexão (None = RetryPolicy()).
+        timeout (float): Timeout de cada chamada, em segundos.
+        temperature_step (float): Arredondamento da temperatura média na chave do modelo (°C).
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        model: str = DEFAULT_MODEL,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+        max_concurrency: int = 4,
+        retry: Optional[RetryPolicy] = None,
+        timeout: float = 30.0,
+        temperature_step: float = 1.0,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.cache_path = cache_path
+        self.max_concurrency = max_concurrency
+        self.retry = retry or RetryPolicy()
+        self.timeout = timeout
+        self.temperature_step = temperature_step
+        self.stats = MessageStats()
+        self._lock = threading.Lock()
+        self._cache: Dict[str, str] = self._load_cache()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _load_cache(self) -> Dict[str, str]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp = f"{self.cache_path}.tmp-{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._cache, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.cache_path)
+
+    def _rounded_temperature(self, t2m: float) -> Optional[float]:
+        if t2m is None or (isinstance(t2m, float) and math.isnan(t2m)):
+            return None
+        return round(round(float(t2m) / self.temperature_step) * self.temperature_step, 1)
+
+    def template_key(self, city: str, classification: str, t2m: float) -> Tuple[str, str, str]:
+        """
+        Chave normalizada de uma linha: (cidade, classificação, temperatura média arredondada).
+        """
+        labels = ", ".join(sorted(c.strip() for c in str(classification or "normal").split(",")))
+        temp = self._rounded_temperature(t2m)
+        return _normalize_city(city), labels, "nan" if temp is None else f"{temp:g}"
+
+    def build_prompt(self, city: str, classification: str, temp: Optional[float]) -> str:
+        temp_text = f"average temperature {temp:g}°C" if temp is not None else "no temperature available"
+        return (
+            f"You are SabIA, a friendly and concise weather assistant from Uberlândia, Minas Gerais, Brazil. "
+            f"Your persona is inspired by the warm, welcoming, and unique spirit of Minas Gerais. "
+            f"For {city}, the forecast is: {temp_text}. The general conditions are: {classification}. "
+            f"Based on this, reflecting the local charm, Cerrado nature, and Minas Gerais culture, create a short, "
+            f"friendly message (maximum {MAX_MESSAGE_CHARS} characters) and a suggested activity. "
+            f"Your response should be ONLY in English."
+        )
+
+    def local_message(self, city: str, classification: str, temp: Optional[float]) -> str:
+        template = LOCAL_TEMPLATES[main_classification(classification)]
+        return _truncate(template.format(city=city, temp="" if temp is None else f" ({temp:g}°C)"))
+
+    def _complete(self, prompt: str) -> Optional[str]:
+        # Uma chamada a /chat/completions, com novas tentativas; None se não houve resposta válida.
+        body = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 75,
+            "temperature": 0.8,
+        }
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        for attempt in range(self.retry.max_retries + 1):
+            response = None
+            with self._lock:
+                self.stats.api_calls += 1
+                if attempt:
+                    self.stats.api_retries += 1
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/chat/completions", json=body, headers=headers, timeout=self.timeout
+                )
+                if response.status_code == 200:
+                    content = response.json()["choices"][0]["message"]["content"]
+                    return _truncate(content) if content and content.strip() else None
+                if response.status_code not in self.retry.retry_statuses:
+                    return None
+            except (requests.RequestException, ValueError, KeyError, IndexError, TypeError):
+                pass
+            if attempt < self.retry.max_retries:
+                time.sleep(self.retry.backoff(attempt, response))
+        return None
+
+    def generate(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Gera as mensagens de todas as linhas.
+
+        Args:
+            df (pd.DataFrame): Previsões classificadas (colunas city_name, classification e T2M_prediction).
+
+        Returns:
+            pd.Series: Mensagem de cada linha, com o mesmo índice de `df`. As contagens da
+            execução (linhas, chaves distintas, acertos de cache, chamadas à API etc.)
+            ficam em self.stats.
+        """
+        self.stats = MessageStats(rows=len(df))
+        cities = df["city_name"].to_numpy()
+        classifications = df["classification"].fillna("normal").to_numpy()
+        temps = df["T2M_prediction"].to_numpy(dtype=float)
+
+        # Primeira linha de cada chave: usada para montar o prompt/modelo da chave.
+        keys = [self.template_key(c, k, t) for c, k, t in zip(cities, classifications, temps)]
+        representative: Dict[Tuple[str, str, str], int] = {}
+        for i, key in enumerate(keys):
+            representative.setdefault(key, i)
+        self.stats.unique_keys = len(representative)
+
+        messages: Dict[Tuple[str, str, str], str] = {}
+        missing = []
+        for key, i in representative.items():
+            cached = self._cache.get("|".join(key))
+            if cached is not None:
+                messages[key] = cached
+                self.stats.cache_hits += 1
+            else:
+                missing.append((key, i))
+
+        def produce(item) -> None:
+            key, i = item
+            temp = self._rounded_temperature(temps[i])
+            message = None
+            if self.api_key:
+                message = self._complete(self.build_prompt(cities[i], classifications[i], temp))
+            with self._lock:
+                if message is None:
+                    messages[key] = self.local_message(cities[i], classifications[i], temp)
+                    self.stats.fallbacks += 1
+                else:
+                    # Só mensagens geradas pela API vão para o cache; as locais são refeitas
+                    # na próxima execução, quando a API pode estar de volta.
+                    messages[key] = message
+                    self._cache["|".join(key)] = message
+                    self.stats.generated += 1
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency)) as pool:
+            list(pool.map(produce, missing))
+        if self.stats.generated:
+            self._save_cache()
+        return pd.Series([messages[key] for key in keys], index=df.index, name="sabia_message_en")
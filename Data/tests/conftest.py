@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos de Data/ são importados como nos notebooks (from endpoints import Endpoints).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
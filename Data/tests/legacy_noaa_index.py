@@ -0,0 +1,83 @@
+"""
+Leitores dos índices SOI, MEI.v2 e ONI como eram antes de load_dataset.noaa_index
+(pd.read_csv com engine='python', skiprows/skipfooter fixos, melt e datas montadas
+como texto), sem os print(). Servem de referência para os testes de regressão e
+para benchmarks/bench_noaa_index.py.
+"""
+import pandas as pd
+
+
+def legacy_soi(source) -> pd.DataFrame:
+    df_soi = pd.read_csv(
+        source,
+        sep=r'\s+',
+        skiprows=31,
+        header=None,
+        engine='python',
+        skipfooter=6,
+        names=['YEAR', 'JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+    )
+    df_soi = df_soi.melt(id_vars=['YEAR'], var_name='MON_NAME', value_name='SOI')
+    df_soi['SOI'] = pd.to_numeric(df_soi['SOI'], errors='coerce')
+    df_soi = df_soi[df_soi['SOI'] != -999.9]
+    df_soi['YEAR'] = pd.to_numeric(df_soi['YEAR'], errors='coerce')
+    df_soi = df_soi.dropna(subset=['YEAR', 'SOI'])
+    df_soi['YEAR'] = df_soi['YEAR'].astype(int)
+    month_mapping = {
+        'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+        'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
+    }
+    df_soi['MON'] = df_soi['MON_NAME'].map(month_mapping)
+    df_soi['Date_String'] = (
+        df_soi['YEAR'].astype(str) + '-' +
+        df_soi['MON'].astype(int).astype(str).str.zfill(2) + '-01'
+    )
+    df_soi['Data'] = pd.to_datetime(df_soi['Date_String'], format="%Y-%m-%d")
+    return df_soi.set_index('Data')[['SOI']].sort_index()
+
+
+def legacy_mei_v2(source) -> pd.DataFrame:
+    df_mei = pd.read_csv(source, sep=r'\s+', header=None, skiprows=1, engine='python', skipfooter=15)
+    col_names = ['YEAR'] + [str(i).zfill(2) for i in range(1, 13)]
+    df_mei.columns = col_names[:df_mei.shape[1]]
+    df_mei = df_mei.melt(id_vars=['YEAR'], var_name='MON', value_name='MEI_V2')
+    df_mei['MEI_V2'] = pd.to_numeric(df_mei['MEI_V2'], errors='coerce')
+    df_mei = df_mei.dropna(subset=['MEI_V2'])
+    df_mei['MON'] = pd.to_numeric(df_mei['MON'], errors='coerce')
+    df_mei = df_mei.dropna(subset=['MON'])
+    df_mei = df_mei[df_mei['MON'].between(1, 12, inclusive='both')]
+    df_mei['YEAR'] = df_mei['YEAR'].astype(int)
+    df_mei['MON'] = df_mei['MON'].astype(int)
+    df_mei['Date_String'] = (
+        df_mei['YEAR'].astype(str) + '-' +
+        df_mei['MON'].astype(str).str.zfill(2) + '-01'
+    )
+    df_mei['Data'] = pd.to_datetime(df_mei['Date_String'], format="%Y-%m-%d")
+    return df_mei.set_index('Data')[['MEI_V2']].sort_index()
+
+
+def legacy_oni(source) -> pd.DataFrame:
+    df_nino = pd.read_csv(
+        source,
+        sep=r'\s+',
+        skiprows=1,
+        header=None,
+        engine='python',
+        skipfooter=2,
+        names=['SEAS', 'YR', 'TOTAL', 'ANOM']
+    )
+    df_nino['YR'] = pd.to_numeric(df_nino['YR'], errors='coerce')
+    df_nino['ANOM'] = pd.to_numeric(df_nino['ANOM'], errors='coerce')
+    df_nino = df_nino.dropna(subset=['YR', 'ANOM'])
+    df_nino['YR'] = df_nino['YR'].astype(int)
+    month_mapping = {
+        'DJF': 1, 'JFM': 2, 'FMA': 3, 'MAM': 4, 'AMJ': 5, 'MJJ': 6,
+        'JJA': 7, 'JAS': 8, 'ASO': 9, 'SON': 10, 'OND': 11, 'NDJ': 12
+    }
+    df_nino['MON'] = df_nino['SEAS'].map(month_mapping)
+    df_nino['Date_String'] = (
+        df_nino['YR'].astype(str) + '-' +
+        df_nino['MON'].astype(str).str.zfill(2) + '-01'
+    )
+    df_nino['Data'] = pd.to_datetime(df_nino['Date_String'], format="%Y-%m-%d")
+    return df_nino.set_index('Data')[['ANOM']].sort_index()
@@ -0,0 +1,86 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# (status, cabeçalhos, corpo) devolvido pelo handler de cada StubServer.
+Reply = Tuple[int, Dict[str, str], bytes]
+
+
+class StubServer:
+    """
+    Servidor HTTP local (uma thread por requisição) para os testes dos loaders.
+
+    `handler(method, path, query, body)` monta a resposta de cada requisição (partes da
+    query sem `=`, como as do griddap, chegam como chaves de valor vazio); `delay`
+    simula a latência da API. O servidor conta as requisições recebidas e o máximo de
+    requisições em andamento ao mesmo tempo; os cabeçalhos de cada requisição ficam em
+    `request_headers`, na mesma ordem de `requests`.
+    """
+
+    def __init__(self, handler: Callable[[str, str, Dict[str, List[str]], bytes], Reply], delay: float = 0.0):
+        self.handler = handler
+        self.delay = delay
+        self.requests: List[Tuple[str, str]] = []
+        self.request_headers: List[Dict[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Cabeçalhos e corpo saem em escritas separadas; sem isso o Nagle + ACK
+            # atrasado somam ~40 ms a cada resposta em conexões keep-alive.
+            disable_nagle_algorithm = True
+
+            def _serve(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parts = urlsplit(self.path)
+                with stub._lock:
+                    stub.requests.append((self.command, self.path))
+                    stub.request_headers.append(dict(self.headers.items()))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    status, headers, payload = stub.handler(self.command, parts.path, parse_qs(parts.query, keep_blank_values=True), body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _serve
+            do_POST = _serve
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}"
+
+    def __enter__(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
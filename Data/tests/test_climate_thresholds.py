@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from climate_thresholds import build_threshold_table, day_of_year_366
+from weather_classifier import WeatherClassifier
+
+
+def history_table():
+    dates = pd.date_range("2020-01-01", "2022-12-31", freq="D")
+    history = pd.DataFrame(
+        {"latitude": -18.9186, "longitude": -48.2772, "T2M_MAX": 20.0},
+        index=dates,
+    )
+    # Linha sem data válida no histórico é ignorada.
+    extra = pd.DataFrame({"latitude": [-18.9186], "longitude": [-48.2772], "T2M_MAX": [99.0]}, index=[pd.NaT])
+    return build_threshold_table(pd.concat([history, extra]), names=["T2M_MAX_P90"])
+
+
+def test_day_of_year_366_marks_missing_and_invalid_dates():
+    doy = day_of_year_366(["2023-03-01", "2024-03-01", None, "not a date", pd.NaT, "2024-12-31"])
+    np.testing.assert_array_equal(doy, [61, 61, 0, 0, 0, 366])
+
+
+def test_lookup_returns_nan_for_missing_dates():
+    table = history_table()
+    assert np.all(table.values == 20.0)
+    limits = table.lookup([-18.9186] * 3, [-48.2772] * 3, ["2024-06-01", pd.NaT, "not a date"])
+    np.testing.assert_array_equal(limits["T2M_MAX_P90"], [20.0, np.nan, np.nan])
+
+
+def test_classify_frame_falls_back_to_fixed_limits_for_missing_dates():
+    classifier = WeatherClassifier(forecast_folder=None, thresholds=history_table())
+    predictions = pd.DataFrame({
+        "latitude": -18.9186,
+        "longitude": -48.2772,
+        "date": ["2024-06-01", None, "not a date", "2024-06-02"],
+        "T2M_MAX_prediction": [25.0, 25.0, 31.0, 19.0],
+    })
+    # 25 > P90 (20) com a tabela; sem data valem os 30 °C fixos.
+    labels = classifier.classify_frame(predictions)
+    assert list(labels) == ["very_hot", "normal", "very_hot", "normal"]
@@ -0,0 +1,150 @@
+import datetime as dt
+import os
+
+import pytest
+
+from load_dataset.http_cache import DEFAULT_MAX_BYTES, CachePolicy, HttpCache, default_policy
+from load_dataset.http_session import HttpSession, RetryPolicy
+from stub_server import StubServer
+
+HOUR = 3600.0
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def power_url(base: str, end: dt.date) -> str:
+    start = end - dt.timedelta(days=3)
+    return f"{base}/api/temporal/daily/point?parameters=T2M&start={start:%Y%m%d}&end={end:%Y%m%d}"
+
+
+def session_for(stub: StubServer, host: str, tmp_path, clock: FakeClock, **cache_kwargs) -> HttpSession:
+    # As políticas são escolhidas pelo host real da fonte; o stub faz o papel dele.
+    policy = lambda url: default_policy(url.replace(stub.url, f"https://{host}"))
+    cache = HttpCache(str(tmp_path / "cache"), policy=policy, clock=clock, **cache_kwargs)
+    return HttpSession(retry=RetryPolicy(max_retries=0), cache=cache)
+
+
+def counting_handler(method, path, query, body):
+    return 200, {"Content-Type": "application/json"}, b'{"ok": true}'
+
+
+def test_default_policy_per_source():
+    today = dt.date.today()
+    old = power_url("https://power.larc.nasa.gov", today - dt.timedelta(days=60))
+    recent = power_url("https://power.larc.nasa.gov", today - dt.timedelta(days=2))
+    assert default_policy(old) == CachePolicy("immutable")
+    assert default_policy(recent) == CachePolicy("ttl", 6 * HOUR)
+    assert default_policy("https://power.larc.nasa.gov/api/temporal/daily/point?parameters=T2M") is None
+    assert default_policy("https://api.open-meteo.com/v1/forecast?latitude=1") == CachePolicy("ttl", 3 * HOUR)
+    assert default_policy("https://marine-api.open-meteo.com/v1/marine?latitude=1") == CachePolicy("ttl", 3 * HOUR)
+    assert default_policy("https://www.cpc.ncep.noaa.gov/data/indices/soi") == CachePolicy("revalidate", 12 * HOUR)
+    assert default_policy("https://psl.noaa.gov/enso/mei/data/meiv2.data") == CachePolicy("revalidate", 12 * HOUR)
+    assert default_policy("http://127.0.0.1:8000/anything") is None
+    assert HttpCache().max_bytes == DEFAULT_MAX_BYTES == 2 * 1024 ** 3
+
+
+@pytest.mark.parametrize(
+    "host, path, max_age",
+    [
+        ("power.larc.nasa.gov", "recent", 6 * HOUR),
+        ("api.open-meteo.com", "/v1/forecast?latitude=-18.9&longitude=-48.3", 3 * HOUR),
+    ],
+)
+def test_ttl_sources_are_served_from_disk_until_they_expire(host, path, max_age, tmp_path):
+    clock = FakeClock()
+    with StubServer(counting_handler) as stub:
+        session = session_for(stub, host, tmp_path, clock)
+        url = power_url(stub.url, dt.date.today() - dt.timedelta(days=2)) if path == "recent" else stub.url + path
+
+        first, record = session.get(url)
+        assert first.json() == {"ok": True} and not record.from_cache
+        clock.now += max_age - 1
+        second, record = session.get(url)
+        assert second.content == first.content and record.from_cache
+        assert len(stub.requests) == 1
+
+        clock.now += 2
+        _, record = session.get(url)
+        assert not record.from_cache and len(stub.requests) == 2
+        assert "If-None-Match" not in stub.request_headers[-1]
+
+
+def test_final_power_ranges_never_expire(tmp_path):
+    clock = FakeClock()
+    with StubServer(counting_handler) as stub:
+        session = session_for(stub, "power.larc.nasa.gov", tmp_path, clock)
+        url = power_url(stub.url, dt.date.today() - dt.timedelta(days=60))
+        session.get(url)
+        clock.now += 365 * 24 * HOUR
+        _, record = session.get(url)
+        assert record.from_cache and len(stub.requests) == 1
+
+
+def test_noaa_indices_are_revalidated_with_a_conditional_get(tmp_path):
+    clock = FakeClock()
+    current = {"etag": '"v1"', "body": b"SOI v1"}
+
+    def handler(method, path, query, body):
+        if stub.request_headers[-1].get("If-None-Match") == current["etag"]:
+            return 304, {"ETag": current["etag"]}, b""
+        return 200, {"Content-Type": "text/plain", "ETag": current["etag"]}, current["body"]
+
+    with StubServer(handler) as stub:
+        session = session_for(stub, "www.cpc.ncep.noaa.gov", tmp_path, clock)
+        url = f"{stub.url}/data/indices/soi"
+        assert session.get(url)[0].text == "SOI v1"
+
+        clock.now += 12 * HOUR - 1
+        assert session.get(url)[1].from_cache and len(stub.requests) == 1
+
+        # Após 12 h: GET condicional, o servidor responde 304 e o conteúdo salvo é usado.
+        clock.now += 2
+        response, record = session.get(url)
+        assert len(stub.requests) == 2
+        assert stub.request_headers[-1]["If-None-Match"] == '"v1"'
+        assert response.status_code == 200 and response.text == "SOI v1" and record.from_cache
+        assert session.cache.stats()["revalidated"] == 1
+
+        # A revalidação renova a entrada por mais 12 h.
+        clock.now += 12 * HOUR - 1
+        assert session.get(url)[1].from_cache and len(stub.requests) == 2
+
+        # Conteúdo novo no servidor: 200 com a nova ETag substitui a entrada.
+        current.update(etag='"v2"', body=b"SOI v2")
+        clock.now += 2
+        response, record = session.get(url)
+        assert response.text == "SOI v2" and not record.from_cache
+        clock.now += 1
+        assert session.get(url)[0].text == "SOI v2" and len(stub.requests) == 3
+
+
+def test_least_recently_used_entries_are_evicted_over_the_size_limit(tmp_path):
+    clock = FakeClock()
+    payload = b"x" * 1000
+
+    with StubServer(lambda method, path, query, body: (200, {}, payload)) as stub:
+        # Cabem duas respostas de 1000 bytes.
+        session = session_for(stub, "api.open-meteo.com", tmp_path, clock, max_bytes=2500)
+        urls = [f"{stub.url}/v1/forecast?latitude={i}" for i in range(3)]
+        session.get(urls[0])
+        clock.now += 1
+        session.get(urls[1])
+        clock.now += 1
+        assert session.get(urls[0])[1].from_cache  # urls[0] passa a ser a mais recente
+        clock.now += 1
+        session.get(urls[2])  # excede o limite: sai urls[1], a usada há mais tempo
+
+        assert session.cache.stats()["evictions"] == 1
+        bodies = [n for n in os.listdir(tmp_path / "cache") if n.endswith(".body")]
+        assert len(bodies) == 2
+        requests_before = len(stub.requests)
+        assert session.get(urls[0])[1].from_cache
+        assert session.get(urls[2])[1].from_cache
+        assert not session.get(urls[1])[1].from_cache
+        assert len(stub.requests) == requests_before + 1
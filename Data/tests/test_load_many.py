@@ -0,0 +1,111 @@
+import json
+import time
+from collections import Counter
+
+import pandas as pd
+import pytest
+import requests
+
+from data_loader import DataLoader
+from endpoints import Endpoints
+from load_dataset.concurrency import HostLimiter, host_limiter
+from load_dataset.http_session import HttpSession, RetryPolicy
+from load_dataset.power_data import build_power_url
+from stub_server import StubServer
+
+DELAY_S = 0.1
+LIMIT = 4
+DATES = ["20250101", "20250102", "20250103"]
+
+
+def power_reply(method, path, query, body):
+    lat = float(query["latitude"][0])
+    parameter = {"T2M": {d: lat + i for i, d in enumerate(DATES)}}
+    return 200, {"Content-Type": "application/json"}, json.dumps({"properties": {"parameter": parameter}}).encode()
+
+
+@pytest.fixture
+def power_stub():
+    with StubServer(power_reply, delay=DELAY_S) as stub:
+        host_limiter.configure(stub.host, LIMIT, None)
+        yield stub
+
+
+def test_load_many_respects_host_limit_and_beats_sequential_requests(power_stub):
+    points = [{"name": f"p{i}", "latitude": -10.0 - i, "longitude": -40.0} for i in range(4 * LIMIT)]
+    endpoints = Endpoints(power_base=f"{power_stub.url}/power")
+
+    # Caminho antigo: um requests.get por ponto, um depois do outro.
+    t0 = time.perf_counter()
+    for p in points:
+        url = build_power_url(p["latitude"], p["longitude"], DATES[0], DATES[-1], ["T2M"], endpoints)
+        assert requests.get(url, timeout=10).status_code == 200
+    sequential_s = time.perf_counter() - t0
+    assert power_stub.max_in_flight == 1
+
+    power_stub.max_in_flight = 0
+    t0 = time.perf_counter()
+    out = DataLoader(endpoints=endpoints).load_many(points, sources=("power",), start=DATES[0], end=DATES[-1])
+    concurrent_s = time.perf_counter() - t0
+
+    power = out["power"]
+    assert len(power) == len(points) * len(DATES)
+    assert power["name"].drop_duplicates().tolist() == [p["name"] for p in points]
+    first = power[power["name"] == "p0"]
+    assert first["T2M"].tolist() == [-10.0, -9.0, -8.0]
+    assert first.index.tolist() == list(pd.to_datetime(DATES))
+
+    # O limite por host é respeitado e atingido; o ganho fica perto de LIMIT vezes.
+    assert power_stub.max_in_flight == LIMIT
+    assert sequential_s / concurrent_s > 0.75 * LIMIT
+
+
+@pytest.fixture
+def flaky_stub():
+    calls = Counter()
+
+    def reply(method, path, query, body):
+        calls[path] += 1
+        n = calls[path]
+        if path == "/rate-limited" and n == 1:
+            return 429, {"Retry-After": "0.3"}, b""
+        if path == "/unavailable" and n <= 2:
+            return 503, {}, b""
+        if path == "/missing":
+            return 404, {}, b""
+        return 200, {}, b"ok"
+
+    with StubServer(reply) as stub:
+        yield stub
+
+
+def make_session() -> HttpSession:
+    return HttpSession(retry=RetryPolicy(max_retries=3, backoff_base=0.01), limiter=HostLimiter(), cache=None)
+
+
+def test_retry_after_is_honoured_on_429(flaky_stub):
+    response, record = make_session().get(f"{flaky_stub.url}/rate-limited")
+    assert response is not None and response.text == "ok"
+    assert record.attempts == 2
+    assert record.elapsed_s >= 0.3
+
+
+def test_5xx_is_retried_and_4xx_is_not(flaky_stub):
+    session = make_session()
+    response, record = session.get(f"{flaky_stub.url}/unavailable")
+    assert response is not None and record.attempts == 3
+
+    response, record = session.get(f"{flaky_stub.url}/missing")
+    assert response is None
+    assert (record.attempts, record.error) == (1, "HTTP 404")
+    assert session.failures() == [record]
+
+
+def test_retry_policy_backoff_prefers_retry_after_and_caps_the_jitter():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+    response = requests.Response()
+    response.headers["Retry-After"] = "2"
+    assert policy.backoff(0, response) == 2.0
+    response.headers["Retry-After"] = "120"
+    assert policy.backoff(0, response) == 5.0
+    assert all(0 <= policy.backoff(attempt) <= min(5.0, 2 ** attempt) for attempt in range(6) for _ in range(20))
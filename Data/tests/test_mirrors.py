@@ -0,0 +1,122 @@
+import threading
+import time
+
+import requests
+
+from load_dataset.mirrors import MirrorHealth, race_first
+from stub_server import StubServer
+
+
+def ok_reply(method, path, query, body):
+    return 200, {}, b"sst"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def fetch(base: str):
+    # Tentativa de um espelho: o corpo da resposta, ou None se falhou.
+    r = requests.get(f"{base}/griddap/ds.csv", timeout=10)
+    return r.text if r.status_code == 200 else None
+
+
+def test_hedge_fires_on_a_slow_mirror_and_the_fast_one_wins():
+    with StubServer(ok_reply, delay=2.0) as slow, StubServer(ok_reply) as fast:
+        health = MirrorHealth()
+        t0 = time.monotonic()
+        winner, result = race_first([slow.url, fast.url], fetch, health, hedge_after_s=0.2)
+        elapsed = time.monotonic() - t0
+
+        assert (winner, result) == (fast.url, "sst")
+        assert len(slow.requests) == 1 and len(fast.requests) == 1  # o lento foi tentado primeiro
+        assert 0.2 <= elapsed < 1.5
+        # O espelho rápido passa a ser o preferido na próxima chamada.
+        assert health.rank([slow.url, fast.url])[0] == fast.url
+
+
+def test_breaker_opens_after_repeated_failures_and_closes_after_cooldown():
+    state = {"failing": True}
+
+    def reply(method, path, query, body):
+        return (503, {}, b"") if state["failing"] else (200, {}, b"sst")
+
+    clock = FakeClock()
+    health = MirrorHealth(failure_threshold=3, cooldown_s=60.0, clock=clock)
+    with StubServer(reply) as mirror:
+        for _ in range(3):
+            assert race_first([mirror.url], fetch, health) == (None, None)
+        assert len(mirror.requests) == 3
+        assert health.is_open(mirror.url)
+
+        # Disjuntor aberto: o espelho fica fora do ranking e nem é consultado.
+        assert health.rank([mirror.url]) == []
+        assert race_first([mirror.url], fetch, health) == (None, None)
+        assert len(mirror.requests) == 3
+
+        # Passado o intervalo ele volta a ser tentado; uma nova falha reabre o disjuntor.
+        clock.now += 61.0
+        assert not health.is_open(mirror.url)
+        assert race_first([mirror.url], fetch, health) == (None, None)
+        assert len(mirror.requests) == 4
+        assert health.is_open(mirror.url)
+
+        # Depois de outro intervalo, uma resposta válida fecha o disjuntor.
+        clock.now += 61.0
+        state["failing"] = False
+        assert race_first([mirror.url], fetch, health) == (mirror.url, "sst")
+        assert not health.is_open(mirror.url)
+        stats = health.snapshot()[mirror.url]
+        assert (stats.failures, stats.successes, stats.consecutive_failures) == (4, 1, 0)
+
+
+def test_half_open_mirror_gets_a_single_trial():
+    clock = FakeClock()
+    health = MirrorHealth(failure_threshold=1, cooldown_s=60.0, clock=clock)
+    with StubServer(ok_reply, delay=0.5) as mirror:
+        health.record_failure(mirror.url)
+        clock.now += 61.0
+        assert not health.is_open(mirror.url)
+
+        # Várias chamadas ao mesmo tempo: só uma leva a tentativa de teste.
+        start = threading.Barrier(8)
+        results = []
+
+        def call():
+            start.wait()
+            results.append(race_first([mirror.url], fetch, health))
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(mirror.requests) == 1
+        assert results.count((mirror.url, "sst")) == 1
+        assert results.count((None, None)) == 7
+        assert not health.is_open(mirror.url)
+
+
+def test_mirror_stays_open_while_its_trial_runs_and_reopens_if_it_fails():
+    clock = FakeClock()
+    health = MirrorHealth(failure_threshold=1, cooldown_s=60.0, clock=clock)
+    health.record_failure("m")
+    assert not health.try_acquire("m")
+
+    clock.now += 61.0
+    assert health.try_acquire("m")
+    assert health.is_open("m") and health.rank(["m"]) == []
+    assert not health.try_acquire("m")
+
+    # A tentativa falhou: novo intervalo inteiro antes do próximo teste.
+    health.record_failure("m")
+    assert health.is_open("m") and not health.try_acquire("m")
+    clock.now += 61.0
+    assert health.try_acquire("m")
+    health.record_success("m", 0.1)
+    assert health.try_acquire("m") and health.try_acquire("m")
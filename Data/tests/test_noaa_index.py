@@ -0,0 +1,95 @@
+import os
+
+import pandas as pd
+import pytest
+
+from endpoints import Endpoints
+from legacy_noaa_index import legacy_mei_v2, legacy_oni, legacy_soi
+from load_dataset.mei_data import fetch_mei_v2_data
+from load_dataset.nino_oni_data import fetch_nino34_oni_data
+from load_dataset.noaa_index import parse_monthly_index, parse_seasonal_index
+from load_dataset.soi_data import SOI_MISSING, fetch_soi_data
+from stub_server import StubServer
+
+# Amostras no layout dos arquivos publicados pela CPC/PSL, com linhas ilegíveis,
+# linhas curtas e meses ausentes (-999.9 / -999.00).
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SOI_FILE = os.path.join(DATA_DIR, "soi.txt")
+MEI_FILE = os.path.join(DATA_DIR, "meiv2.data")
+ONI_FILE = os.path.join(DATA_DIR, "oni.ascii.txt")
+
+
+def read(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def assert_same(new: pd.DataFrame, old: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(new, old, check_freq=False)
+    assert new.index.name == old.index.name == "Data"
+
+
+def test_soi_matches_legacy_parser():
+    new = parse_monthly_index(read(SOI_FILE), "SOI", section="STANDARDIZED", missing=SOI_MISSING)
+    assert_same(new, legacy_soi(SOI_FILE))
+    # Linha ilegível (1987/MAY), linha curta (1990 sem NOV/DEC) e meses -999.9 ficam de fora.
+    assert pd.Timestamp("1987-05-01") not in new.index and pd.Timestamp("1987-06-01") in new.index
+    assert pd.Timestamp("1990-10-01") in new.index and pd.Timestamp("1990-11-01") not in new.index
+    assert new.index[-1] == pd.Timestamp("2025-09-01")
+    assert len(new) == 75 * 12 - 1 - 2 - 3
+
+
+def test_mei_matches_legacy_parser():
+    new = parse_monthly_index(read(MEI_FILE), "MEI_V2")
+    assert_same(new, legacy_mei_v2(MEI_FILE))
+    assert pd.Timestamp("1998-03-01") not in new.index
+    assert new.index[0] == pd.Timestamp("1979-01-01")
+    # O MEI nunca descartou -999.00 (meses ainda sem dado); o comportamento é mantido.
+    assert (new.loc["2025-09-01":, "MEI_V2"] == -999.0).all()
+
+
+def test_oni_matches_legacy_parser():
+    new = parse_seasonal_index(read(ONI_FILE), "ANOM")
+    assert_same(new, legacy_oni(ONI_FILE))
+    assert pd.Timestamp("1990-07-01") not in new.index  # ANOM ilegível
+    assert pd.Timestamp("2001-04-01") not in new.index  # linha sem ANOM
+    assert new.index[-1] == pd.Timestamp("2025-08-01")
+
+
+def test_row_with_a_single_value_does_not_cut_the_table(tmp_path):
+    lines = read(MEI_FILE).splitlines()
+    at = next(i for i, line in enumerate(lines) if line.split()[:1] == ["1990"])
+    lines[at] = "  1990   0.50"
+    path = tmp_path / "meiv2.data"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    new = parse_monthly_index(path.read_text(encoding="utf-8"), "MEI_V2")
+    assert_same(new, legacy_mei_v2(str(path)))
+    assert new.index[-1] == pd.Timestamp("2025-12-01")
+
+
+def test_soi_table_is_found_without_fixed_line_counts():
+    # O arquivo atual da CPC tem a primeira tabela com todos os anos desde 1951; o
+    # skiprows=31 antigo deixava de cair na tabela padronizada, a busca estrutural não.
+    text = read(SOI_FILE)
+    lines = text.splitlines()
+    first_table_end = lines.index("") + 1 + 24
+    extra = [f"{y:6d}" + "   0.0" * 12 for y in range(1975, 2026)]
+    longer = "\n".join(lines[:first_table_end] + extra + lines[first_table_end:]) + "\n"
+    expected = parse_monthly_index(text, "SOI", section="STANDARDIZED", missing=SOI_MISSING)
+    assert_same(parse_monthly_index(longer, "SOI", section="STANDARDIZED", missing=SOI_MISSING), expected)
+
+
+@pytest.mark.parametrize(
+    "fetch, field, path, legacy",
+    [
+        (fetch_soi_data, "soi_data", SOI_FILE, legacy_soi),
+        (fetch_mei_v2_data, "mei_v2_data", MEI_FILE, legacy_mei_v2),
+        (fetch_nino34_oni_data, "nino34_oni_data", ONI_FILE, legacy_oni),
+    ],
+)
+def test_fetchers_parse_the_download_without_printing(fetch, field, path, legacy, capsys):
+    body = read(path).encode()
+    with StubServer(lambda method, p, query, b: (200, {"Content-Type": "text/plain"}, body)) as stub:
+        df = fetch(endpoints=Endpoints(**{field: f"{stub.url}/{os.path.basename(path)}"}))
+    assert_same(df, legacy(path))
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,110 @@
+import re
+import numpy as np
+import pandas as pd
+import pytest
+
+from endpoints import Endpoints
+from load_dataset.oisst_data import fetch_oisst_sst_many
+from stub_server import StubServer
+
+GRID_LAT = np.arange(-24.0, -19.0, 0.25) + 0.125
+GRID_LON = np.arange(-44.0, -39.0, 0.25) + 0.125
+# Eixo global dos datasets OISST do ERDDAP (0..360) e o equivalente em -180..180.
+AXIS_360 = np.arange(0.0, 360.0, 0.25) + 0.125
+AXIS_180 = AXIS_360 - 180.0
+DATES = ["2025-01-01T12:00:00Z", "2025-01-02T12:00:00Z"]
+RANGE = re.compile(r"\[\(([^)]*)\):1:\(([^)]*)\)\]")
+
+
+def sst(day: int, lat: float, lon: float) -> float:
+    # `lon` em -180..180, qualquer que seja o eixo do dataset.
+    lon = (lon + 180.0) % 360.0 - 180.0
+    return round(20.0 + day + (lat + 30.0) / 10.0 + (lon + 50.0) / 100.0, 4)
+
+
+def erddap_reply(grid_lat: np.ndarray, axis_lon: np.ndarray, with_zlev: bool = False):
+    """Griddap em miniatura: devolve o eixo de longitude ou a caixa pedida, recusando faixas fora do eixo."""
+    def reply(method, path, query, body):
+        (request,) = query
+        if request.startswith("longitude"):
+            lines = ["longitude", "degrees_east"] + [f"{lon}" for lon in axis_lon]
+            return 200, {"Content-Type": "text/csv"}, ("\n".join(lines) + "\n").encode()
+
+        _, (lat_min, lat_max), (lon_min, lon_max) = RANGE.findall(request)
+        lon_min, lon_max = float(lon_min), float(lon_max)
+        if not axis_lon[0] <= lon_min <= lon_max <= axis_lon[-1]:
+            return 404, {}, b"Error: longitude outside the axis range"
+        lats = grid_lat[(grid_lat >= float(lat_min)) & (grid_lat <= float(lat_max))]
+        lons = axis_lon[(axis_lon >= lon_min) & (axis_lon <= lon_max)]
+
+        header = ["time"] + (["zlev"] if with_zlev else []) + ["latitude", "longitude", "sst"]
+        units = ["UTC"] + (["m"] if with_zlev else []) + ["degrees_north", "degrees_east", "degree_C"]
+        lines = [",".join(header), ",".join(units)]
+        for day, t in enumerate(DATES):
+            for lat in lats:
+                for lon in lons:
+                    zlev = ["0.0"] if with_zlev else []
+                    lines.append(",".join([t] + zlev + [f"{lat}", f"{lon}", f"{sst(day, lat, lon)}"]))
+        return 200, {"Content-Type": "text/csv"}, ("\n".join(lines) + "\n").encode()
+    return reply
+
+
+def data_requests(stub: StubServer):
+    return [path for _, path in stub.requests if "?sst" in path]
+
+
+def expected(lat: float, lon: float, grid_lat: np.ndarray, axis_lon: np.ndarray):
+    grid_lon = (axis_lon + 180.0) % 360.0 - 180.0
+    cell_lat = grid_lat[np.argmin(np.abs(grid_lat - lat))]
+    cell_lon = grid_lon[np.argmin(np.abs((grid_lon - lon + 180.0) % 360.0 - 180.0))]
+    return [sst(0, cell_lat, cell_lon), sst(1, cell_lat, cell_lon)]
+
+
+@pytest.mark.parametrize("with_zlev", [False, True])
+def test_box_columns_come_from_the_header(with_zlev):
+    lats, lons = [-21.3, -22.9], [-40.2, -43.1]
+    with StubServer(erddap_reply(GRID_LAT, GRID_LON, with_zlev)) as stub:
+        endpoints = Endpoints(erddap_bases=(f"{stub.url}/erddap",), oisst_ids=(f"oisst{int(with_zlev)}",))
+        frames = fetch_oisst_sst_many(lats, lons, "2025-01-01", "2025-01-02", endpoints)
+
+    assert len(data_requests(stub)) == 1  # uma caixa para os dois pontos
+    assert "/griddap/" in stub.requests[-1][1] and ".csv?" in stub.requests[-1][1]
+    for frame, lat, lon in zip(frames, lats, lons):
+        assert frame.columns.tolist() == ["SST_OISST"]
+        assert frame.index.tolist() == list(pd.to_datetime(["2025-01-01", "2025-01-02"]))
+        assert frame["SST_OISST"].tolist() == expected(lat, lon, GRID_LAT, GRID_LON)
+
+
+def test_box_is_converted_to_a_0_360_axis():
+    lats, lons = [-21.3, -22.9], [-40.2, -43.1]
+    with StubServer(erddap_reply(GRID_LAT, AXIS_360)) as stub:
+        endpoints = Endpoints(erddap_bases=(f"{stub.url}/erddap",), oisst_ids=("nceiOisst2Agg",))
+        frames = fetch_oisst_sst_many(lats, lons, "2025-01-01", "2025-01-02", endpoints)
+        # O eixo é lido uma vez por espelho: uma segunda busca só pede a caixa.
+        fetch_oisst_sst_many(lats, lons, "2025-01-01", "2025-01-02", endpoints)
+
+    assert sum("longitude" in path for _, path in stub.requests) == 1
+    assert len(data_requests(stub)) == 2
+    for frame, lat, lon in zip(frames, lats, lons):
+        assert frame["SST_OISST"].tolist() == expected(lat, lon, GRID_LAT, AXIS_360)
+
+
+@pytest.mark.parametrize(
+    "axis_lon, lons",
+    [
+        (AXIS_360, [0.05, -0.02]),  # caixa atravessa 0° (emenda do eixo 0..360)
+        (AXIS_180, [179.95, -179.99]),  # caixas atravessam ±180° (emenda do eixo -180..180)
+    ],
+)
+def test_box_crossing_the_axis_seam_is_split(axis_lon, lons):
+    lats = [-21.3, -21.4]
+    with StubServer(erddap_reply(GRID_LAT, axis_lon)) as stub:
+        endpoints = Endpoints(erddap_bases=(f"{stub.url}/erddap",), oisst_ids=("oisst",))
+        frames = fetch_oisst_sst_many(lats, lons, "2025-01-01", "2025-01-02", endpoints)
+
+    # Toda caixa atravessa a emenda e vira duas requisições, uma em cada ponta do eixo.
+    boxes = 1 if len({int(np.floor(lon / 5.0)) for lon in lons}) == 1 else 2
+    assert len(data_requests(stub)) == 2 * boxes
+    for frame, lat, lon in zip(frames, lats, lons):
+        assert len(frame) == 2
+        assert frame["SST_OISST"].tolist() == expected(lat, lon, GRID_LAT, axis_lon)
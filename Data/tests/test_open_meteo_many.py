@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+
+from endpoints import Endpoints
+from load_dataset.http_session import http_session
+from load_dataset.open_meteo_data import fetch_open_meteo_marine_sst_many
+from stub_server import StubServer
+
+TIMES = ["2025-01-01", "2025-01-02"]
+
+
+def marine_reply(method, path, query, body):
+    lats = [float(v) for v in query["latitude"][0].split(",")]
+    if any(abs(lat) > 90 for lat in lats):
+        return 400, {"Content-Type": "application/json"}, b'{"error":true,"reason":"Latitude must be in range"}'
+    items = [{"daily": {"time": TIMES, "sea_surface_temperature_mean": [lat, lat + 1]}} for lat in lats]
+    payload = items if len(items) > 1 else items[0]
+    return 200, {"Content-Type": "application/json"}, json.dumps(payload).encode()
+
+
+def test_invalid_coordinate_does_not_empty_the_whole_chunk():
+    lats = [-10.0 - i for i in range(10)]
+    lats[6] = 123.0  # latitude inválida: a API recusa qualquer bloco que a contenha
+    lons = [-38.0] * len(lats)
+    with StubServer(marine_reply) as stub:
+        endpoints = Endpoints(open_meteo_marine_base=f"{stub.url}/v1/marine")
+        long = fetch_open_meteo_marine_sst_many(lats, lons, 2, endpoints, chunk_size=len(lats))
+
+    for i, lat in enumerate(lats):
+        frame = long.xs(i, level="location") if i in long.index.get_level_values("location") else None
+        if i == 6:
+            assert frame is None or frame["SST_FC"].isna().all()
+        else:
+            assert frame["SST_FC"].tolist() == [lat, lat + 1]
+    # O bloco é dividido só ao longo do caminho da coordenada inválida.
+    assert len(stub.requests) <= 2 * int(np.ceil(np.log2(len(lats)))) + 1
+
+
+def test_server_errors_are_not_bisected():
+    def reply(method, path, query, body):
+        return 503, {"Retry-After": "0"}, b""
+
+    with StubServer(reply) as stub:
+        endpoints = Endpoints(open_meteo_marine_base=f"{stub.url}/v1/marine")
+        long = fetch_open_meteo_marine_sst_many([-10.0, -11.0, -12.0, -13.0], [-38.0] * 4, 2, endpoints)
+
+    assert long["SST_FC"].isna().all()
+    # Uma requisição com as novas tentativas da sessão, sem divisão do bloco.
+    assert len(stub.requests) == http_session.retry.max_retries + 1
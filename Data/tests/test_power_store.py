@@ -0,0 +1,42 @@
+import json
+
+import pandas as pd
+
+from data_loader import DataLoader
+from endpoints import Endpoints
+from load_dataset.power_store import PowerStore
+from stub_server import StubServer
+
+PARAMS = ["T2M_MAX", "T2M_MIN", "RH2M"]
+
+
+def power_reply(method, path, query, body):
+    days = pd.date_range(pd.Timestamp(query["start"][0]), pd.Timestamp(query["end"][0]), freq="D")
+    # Parâmetros na ordem inversa da pedida, para conferir a ordem das colunas na saída.
+    names = query["parameters"][0].split(",")[::-1]
+    parameter = {name: {d.strftime("%Y%m%d"): float(k * 100 + d.day) for d in days} for k, name in enumerate(names)}
+    return 200, {"Content-Type": "application/json"}, json.dumps({"properties": {"parameter": parameter}}).encode()
+
+
+def test_power_store_uses_the_loader_endpoints_and_fetches_only_gaps(tmp_path):
+    with StubServer(power_reply) as stub:
+        store = PowerStore(str(tmp_path))  # Endpoints padrão: só o DataLoader aponta para o stub
+        loader = DataLoader(endpoints=Endpoints(power_base=f"{stub.url}/power"), power_store=store)
+
+        first = loader.load_power_daily_data(-18.9, -48.3, "2025-01-01", "2025-01-10", PARAMS)
+        assert len(stub.requests) == 1
+        assert first.columns.tolist() == PARAMS
+        assert first.index.tolist() == list(pd.date_range("2025-01-01", "2025-01-10"))
+        assert first.loc["2025-01-03", "RH2M"] == 3.0
+
+        # Janela estendida em um dia: uma requisição só para o dia novo.
+        second = loader.load_power_daily_data(-18.9, -48.3, "2025-01-01", "2025-01-11", PARAMS)
+        assert len(stub.requests) == 2
+        assert "start=20250111&end=20250111" in stub.requests[-1][1]
+        assert second.columns.tolist() == PARAMS
+        pd.testing.assert_frame_equal(second.iloc[:-1], first, check_freq=False)
+
+        # Subconjunto em outra ordem: vem do armazenamento, na ordem pedida.
+        subset = loader.load_power_daily_data(-18.9, -48.3, "2025-01-05", "2025-01-06", ["RH2M", "T2M_MAX"])
+        assert len(stub.requests) == 2
+        assert subset.columns.tolist() == ["RH2M", "T2M_MAX"]
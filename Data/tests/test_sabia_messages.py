@@ -0,0 +1,85 @@
+import json
+import time
+
+import pandas as pd
+
+from load_dataset.http_session import RetryPolicy
+from sabia_messages import SabiaMessageGenerator
+from stub_server import StubServer
+
+
+def chat_reply(body: bytes) -> bytes:
+    prompt = json.loads(body)["messages"][0]["content"]
+    content = "SabIA says hi to " + prompt.split("For ")[1].split(",")[0]
+    return json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+
+
+def chat_handler(method, path, query, body):
+    assert (method, path) == ("POST", "/v1/chat/completions")
+    return 200, {"Content-Type": "application/json"}, chat_reply(body)
+
+
+def forecasts() -> pd.DataFrame:
+    # 6 linhas, 3 chaves: a cidade é normalizada e a temperatura arredondada a 1 °C.
+    return pd.DataFrame({
+        "city_name": ["Uberlândia", " uberlândia ", "Uberlândia", "Aracaju", "Aracaju", "Recife"],
+        "classification": ["very_hot", "very_hot", "very_hot", "normal", "normal", "very_wet"],
+        "T2M_prediction": [31.2, 30.9, 31.4, 25.0, 25.1, float("nan")],
+    }, index=[10, 11, 12, 13, 14, 15])
+
+
+def test_one_call_per_key_and_cache_hits_on_the_next_run(tmp_path):
+    cache = str(tmp_path / "cache.json")
+    df = forecasts()
+    with StubServer(chat_handler) as stub:
+        generator = SabiaMessageGenerator(api_key="test", base_url=f"{stub.url}/v1", cache_path=cache)
+        messages = generator.generate(df)
+        assert len(stub.requests) == 3
+        assert generator.stats.unique_keys == 3 and generator.stats.generated == 3
+        assert messages.index.equals(df.index) and messages.name == "sabia_message_en"
+        assert messages[10] == messages[11] == messages[12] == "SabIA says hi to Uberlândia"
+        assert messages[13] == messages[14] != messages[15]
+
+        again = SabiaMessageGenerator(api_key="test", base_url=f"{stub.url}/v1", cache_path=cache)
+        assert again.generate(df).equals(messages)
+        assert len(stub.requests) == 3
+        assert again.stats.cache_hits == 3 and again.stats.api_calls == 0
+
+
+def test_429_is_retried_after_the_retry_after_delay():
+    rejected = []
+
+    def handler(method, path, query, body):
+        if len(rejected) < 2:
+            rejected.append(path)
+            return 429, {"Retry-After": "0.2"}, b""
+        return chat_handler(method, path, query, body)
+
+    with StubServer(handler) as stub:
+        # Sem Retry-After a espera poderia chegar a 10 s (backoff_base).
+        generator = SabiaMessageGenerator(
+            api_key="test", base_url=f"{stub.url}/v1", cache_path=None, max_concurrency=1,
+            retry=RetryPolicy(max_retries=3, backoff_base=10.0),
+        )
+        t0 = time.perf_counter()
+        messages = generator.generate(forecasts().head(1))
+        elapsed = time.perf_counter() - t0
+    assert messages.iloc[0] == "SabIA says hi to Uberlândia"
+    assert generator.stats.api_calls == 3 and generator.stats.api_retries == 2
+    assert generator.stats.fallbacks == 0
+    assert 0.4 <= elapsed < 2.0
+
+
+def test_local_template_when_the_api_fails(tmp_path):
+    cache = tmp_path / "cache.json"
+    with StubServer(lambda method, path, query, body: (503, {"Retry-After": "0"}, b"")) as stub:
+        generator = SabiaMessageGenerator(
+            api_key="test", base_url=f"{stub.url}/v1", cache_path=str(cache), retry=RetryPolicy(max_retries=1),
+        )
+        messages = generator.generate(forecasts())
+        assert len(stub.requests) == 3 * 2
+    assert generator.stats.fallbacks == 3 and generator.stats.generated == 0
+    assert messages[10] == "A scorching day in Uberlândia (31°C)! Cool off with a dip or some açaí, and stay hydrated."
+    assert messages[15].startswith("A humid day in Recife.")
+    # Mensagens locais não vão para o cache: a próxima execução tenta a API de novo.
+    assert not cache.exists()
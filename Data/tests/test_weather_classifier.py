@@ -0,0 +1,40 @@
+import os
+
+import pandas as pd
+import pytest
+
+from weather_classifier import OUTPUT_COLUMNS, WeatherClassifier, write_classified_forecasts
+
+
+def write_location(folder, days, t2m_max):
+    os.makedirs(folder)
+    for var, value in [("T2M", 25.0), ("T2M_MAX", t2m_max), ("T2M_MIN", 15.0), ("WS2M", 2.0), ("RH2M", 60.0)]:
+        pd.DataFrame({"date": days, "prediction": value}).to_csv(os.path.join(folder, f"forecast_{var}.csv"))
+
+
+def test_classify_directory_warns_about_locations_without_t2m(tmp_path, capsys):
+    days = ["2025-10-01", "2025-10-02"]
+    write_location(tmp_path / "Alpha", days, 32.0)
+    os.makedirs(tmp_path / "Beta")  # sem arquivos de previsão
+    locations = [
+        {"name": "Alpha", "latitude": -18.9, "longitude": -48.3},
+        {"name": "Beta", "latitude": -10.9, "longitude": -37.1},
+    ]
+
+    results = WeatherClassifier(forecast_folder=None).classify_directory(str(tmp_path), locations)
+
+    assert results.columns.tolist() == OUTPUT_COLUMNS
+    assert results["city_name"].unique().tolist() == ["Alpha"]
+    assert results["classification"].tolist() == ["very_hot", "very_hot"]
+    assert "Beta" in capsys.readouterr().out
+
+
+def test_write_classified_forecasts_requires_the_messages(tmp_path):
+    results = pd.DataFrame({c: [1.0] for c in OUTPUT_COLUMNS}).assign(date="2025-10-01", city_name="Alpha", classification="normal")
+    with pytest.raises(ValueError, match="sabia_message_en"):
+        write_classified_forecasts(results, str(tmp_path))
+    assert not os.listdir(tmp_path)
+
+    paths = write_classified_forecasts(results.assign(sabia_message_en="hi"), str(tmp_path), snapshot=True)
+    assert [os.path.basename(p) for p in paths] == ["classified_weather_forecast.csv", "classified_weather_forecast.snapshot"]
+    assert pd.read_csv(paths[0])["sabia_message_en"].tolist() == ["hi"]
@@ -1,10 +1,154 @@
 
+import hashlib
 import pandas as pd
+import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+from climate_thresholds import ThresholdTable
+from forecast_snapshot import write_forecast_snapshot
+
+# Arquivos de previsão por variável gerados pelo notebook 04 (forecast_<VAR>.csv).
+FORECAST_FILES = [
+    "forecast_RH2M.csv",
+    "forecast_T2M_MAX.csv",
+    "forecast_T2M_MIN.csv",
+    "forecast_T2M.csv",
+    "forecast_WS2M.csv",
+]
+PREDICTION_VARIABLES = ["T2M", "T2M_MAX", "T2M_MIN", "WS2M", "RH2M"]
+LOCATION_COLUMNS = ["city_name", "latitude", "longitude"]
+# Colunas do classified_weather_forecast.csv lido pelo BackEnd (mais sabia_message_en).
+OUTPUT_COLUMNS = ["date", "classification"] + LOCATION_COLUMNS + [f"{var}_prediction" for var in PREDICTION_VARIABLES]
+
+# Regras de classificação: (rótulo, variáveis de previsão usadas, método de limiar).
+# Cada regra é avaliada de uma vez sobre os arrays das variáveis e vira um bit de `flags`
+# (bit i = RULES[i]), de modo que o rótulo textual sai de uma tabela com 2^5 entradas.
+RULES = (
+    ("very_hot", ("T2M_MAX",), "is_very_hot"),
+    ("very_cold", ("T2M_MIN",), "is_very_cold"),
+    ("very_windy", ("WS2M",), "is_very_windy"),
+    ("very_wet", ("RH2M",), "is_very_wet"),
+    ("very_uncomfortable", ("T2M", "RH2M"), "is_very_uncomfortable"),
+)
+
+# Limiares climatológicos (climate_thresholds) usados por regra quando o classificador
+# recebe uma ThresholdTable, na ordem dos argumentos de limite do método da regra.
+RELATIVE_THRESHOLDS = {
+    "very_hot": ("T2M_MAX_P90",),
+    "very_cold": ("T2M_MIN_P10",),
+    "very_windy": ("WS2M_P90",),
+    "very_wet": ("RH2M_P90",),
+    "very_uncomfortable": ("T2M_P90", "RH2M_P80"),
+}
+
+
+def _flag_labels() -> np.ndarray:
+    labels = []
+    for flags in range(1 << len(RULES)):
+        active = [name for i, (name, _, _) in enumerate(RULES) if flags >> i & 1]
+        labels.append(", ".join(active) if active else "normal")
+    return np.array(labels, dtype=object)
+
+
+# Rótulo textual de cada combinação de flags (0 = "normal").
+FLAG_LABELS = _flag_labels()
+
+
+def _read_forecast_folder(folder: str, warn: bool = True) -> Dict[str, pd.DataFrame]:
+    data = {}
+    for file in FORECAST_FILES:
+        path = os.path.join(folder, file)
+        if os.path.exists(path):
+            df = pd.read_csv(path, index_col=0)
+            # Extrair o nome da variável do nome do arquivo (ex: RH2M, T2M_MAX)
+            var_name = file.replace("forecast_", "").replace(".csv", "")
+            data[var_name] = df
+        elif warn:
+            print(f"Aviso: O arquivo {path} não foi encontrado.")
+    return data
+
+
+def _forecast_frame(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    # Uma linha por data da previsão, com a coluna <VAR>_prediction de cada arquivo carregado.
+    results = pd.DataFrame(index=next(iter(data.values())).index) # Use o índice de um dos dataframes como base
+    results['date'] = data['T2M']['date'] # Adiciona a coluna de data
+    for var in PREDICTION_VARIABLES:
+        if var in data:
+            results[f'{var}_prediction'] = data[var]['prediction']
+    return results
+
+
+def _read_location(folder: str, city_name: str, latitude: float, longitude: float) -> pd.DataFrame:
+    # Executada nos processos do pool em classify_directory (precisa ser de nível de módulo).
+    data = _read_forecast_folder(folder, warn=False)
+    if 'T2M' not in data:
+        return pd.DataFrame()
+    results = _forecast_frame(data).reindex(columns=['date'] + [f'{var}_prediction' for var in PREDICTION_VARIABLES])
+    results['city_name'] = city_name
+    results['latitude'] = latitude
+    results['longitude'] = longitude
+    return results.reset_index(drop=True)
+
+
+def write_classified_forecasts(
+    results: pd.DataFrame, output_folder: str = "classified_forecasts", snapshot: bool = False
+) -> List[str]:
+    """
+    Grava as previsões classificadas (uma ou várias localizações), já com as mensagens
+    do SabIA, no formato lido pelo BackEnd: classified_weather_forecast.csv e, com
+    snapshot=True, também o snapshot binário (forecast_snapshot).
+
+    Args:
+        results (pd.DataFrame): Saída de classify_weather, classify_table ou classify_directory
+            com a coluna sabia_message_en (sabia_messages.SabiaMessageGenerator).
+        output_folder (str): Pasta de saída.
+        snapshot (bool): Grava também classified_weather_forecast.snapshot. No notebook 05
+            o snapshot é gravado pela última célula.
+
+    Returns:
+        List[str]: Caminhos dos arquivos gravados.
+    """
+    # O BackEnd descarta linhas sem mensagem; um arquivo sem a coluna não carrega.
+    if "sabia_message_en" not in results.columns:
+        raise ValueError(
+            "As previsões precisam da coluna 'sabia_message_en' (gere as mensagens com "
+            "sabia_messages.SabiaMessageGenerator antes de gravar)."
+        )
+    os.makedirs(output_folder, exist_ok=True)
+    csv_path = os.path.join(output_folder, "classified_weather_forecast.csv")
+    csv_bytes = results.to_csv(index=False).encode("utf-8")
+    with open(csv_path, "wb") as f:
+        f.write(csv_bytes)
+    paths = [csv_path]
+    if snapshot:
+        snapshot_path = os.path.join(output_folder, "classified_weather_forecast.snapshot")
+        # Mesmo hash do CSV gravado, para o BackEnd servir a mesma ETag com qualquer um dos dois.
+        write_forecast_snapshot(results, snapshot_path, hashlib.sha256(csv_bytes).hexdigest())
+        paths.append(snapshot_path)
+    return paths
+
 
 class WeatherClassifier:
-    def __init__(self, forecast_folder="forecast/", city_name="Uberlândia", latitude=-18.9186, longitude=-48.2772):
+    def __init__(
+        self,
+        forecast_folder="forecast/",
+        city_name="Uberlândia",
+        latitude=-18.9186,
+        longitude=-48.2772,
+        thresholds: Optional[ThresholdTable] = None,
+    ):
+        """
+        Args:
+            forecast_folder: Pasta com os forecast_<VAR>.csv de uma cidade (None = modo em lote).
+            city_name, latitude, longitude: Localização das previsões de forecast_folder.
+            thresholds (Optional[ThresholdTable]): Limiares climatológicos por localização e dia
+                do ano (climate_thresholds). Sem ela, ou para localizações fora da tabela, valem
+                os limiares fixos dos métodos is_very_*.
+        """
         self.forecast_folder = forecast_folder
+        self.thresholds = thresholds
         self.data = {}
         self.city_name = city_name
         self.latitude = latitude
@@ -12,22 +156,9 @@ class WeatherClassifier:
         self._load_data()
 
     def _load_data(self):
-        files = [
-            "forecast_RH2M.csv",
-            "forecast_T2M_MAX.csv",
-            "forecast_T2M_MIN.csv",
-            "forecast_T2M.csv",
-            "forecast_WS2M.csv",
-        ]
-        for file in files:
-            path = os.path.join(self.forecast_folder, file)
-            if os.path.exists(path):
-                df = pd.read_csv(path, index_col=0)
-                # Extrair o nome da variável do nome do arquivo (ex: RH2M, T2M_MAX)
-                var_name = file.replace("forecast_", "").replace(".csv", "")
-                self.data[var_name] = df
-            else:
-                print(f"Aviso: O arquivo {path} não foi encontrado.")
+        if self.forecast_folder is None:
+            return  # modo em lote: os dados chegam por classify_table/classify_directory
+        self.data = _read_forecast_folder(self.forecast_folder)
 
     def classify_weather(self):
         # Esta função conterá a lógica para classificar o tempo
@@ -40,84 +171,177 @@ class WeatherClassifier:
         #     print(self.data["T2M_MAX"].head())
         
         # Lógica de classificação será adicionada aqui
-        results = pd.DataFrame(index=next(iter(self.data.values())).index) # Use o índice de um dos dataframes como base
-        results['date'] = self.data['T2M']['date'] # Adiciona a coluna de data
-
-        # Adicionar as colunas de previsão de temperatura, vento e umidade
-        if 'T2M' in self.data:
-            results['T2M_prediction'] = self.data['T2M']['prediction']
-        if 'T2M_MAX' in self.data:
-            results['T2M_MAX_prediction'] = self.data['T2M_MAX']['prediction']
-        if 'T2M_MIN' in self.data:
-            results['T2M_MIN_prediction'] = self.data['T2M_MIN']['prediction']
-        if 'WS2M' in self.data:
-            results['WS2M_prediction'] = self.data['WS2M']['prediction']
-        if 'RH2M' in self.data:
-            results['RH2M_prediction'] = self.data['RH2M']['prediction']
-
-        if 'T2M_MAX' in self.data:
-            results['very_hot'] = self.data['T2M_MAX']['prediction'].apply(self.is_very_hot)
-        if 'T2M_MIN' in self.data:
-            results['very_cold'] = self.data['T2M_MIN']['prediction'].apply(self.is_very_cold)
-        if 'WS2M' in self.data:
-            results['very_windy'] = self.data['WS2M']['prediction'].apply(self.is_very_windy)
-        if 'RH2M' in self.data:
-            results['very_wet'] = self.data['RH2M']['prediction'].apply(self.is_very_wet)
-        if 'T2M' in self.data and 'RH2M' in self.data:
-            results['very_uncomfortable'] = [
-                self.is_very_uncomfortable(t2m_pred, rh2m_pred)
-                for t2m_pred, rh2m_pred in zip(
-                    self.data['T2M']['prediction'],
-                    self.data['RH2M']['prediction']
-                )
-            ]
-
-        # Adicionar a classe "Normal" se nenhuma das outras condições for verdadeira
-        # Certifique-se de que todas as colunas de classificação existam para evitar KeyError
-        classification_cols = ['very_hot', 'very_cold', 'very_windy', 'very_wet', 'very_uncomfortable']
-        for col in classification_cols:
-            if col not in results.columns:
-                results[col] = False # Inicializa com False se a coluna não existe (ex: dados faltando)
-
-        results['normal'] = ~results[classification_cols].any(axis=1)
-
-        # Criar a nova coluna de classificação textual
-        def get_classification_text(row):
-            active_classifications = [col for col in classification_cols if row[col]]
-            if row['normal']:
-                active_classifications.append("normal")
-            return ", ".join(active_classifications) if active_classifications else "Não Classificado"
-
-        results['classification'] = results.apply(get_classification_text, axis=1)
+        results = _forecast_frame(self.data)
 
         # Adicionar as novas colunas de cidade e coordenadas
         results['city_name'] = self.city_name
         results['latitude'] = self.latitude
         results['longitude'] = self.longitude
 
+        results['classification'] = self.classify_frame(results)
+
         # Selecionar as colunas 'date', 'classification', 'city_name', 'latitude', 'longitude' e as novas colunas de previsão para o retorno
-        return results[['date', 'classification', 'city_name', 'latitude', 'longitude', 'T2M_prediction', 'T2M_MAX_prediction', 'T2M_MIN_prediction', 'WS2M_prediction', 'RH2M_prediction']]
+        return results[OUTPUT_COLUMNS]
+
+    def classify_frame(self, predictions: pd.DataFrame) -> np.ndarray:
+        """
+        Classifica todas as linhas de um DataFrame com colunas <VAR>_prediction de uma vez.
+        Com `thresholds`, os limiares de cada linha vêm da tabela (colunas latitude,
+        longitude e date).
+
+        Args:
+            predictions (pd.DataFrame): Previsões (ex: T2M_MAX_prediction), de uma ou várias localizações.
+
+        Returns:
+            np.ndarray: Rótulo de classificação de cada linha.
+        """
+        values = {
+            var: predictions[f"{var}_prediction"].to_numpy()
+            for var in PREDICTION_VARIABLES
+            if f"{var}_prediction" in predictions.columns
+        }
+        limits = None
+        if self.thresholds is not None:
+            limits = self.thresholds.lookup(predictions['latitude'], predictions['longitude'], predictions['date'])
+        return self.label_flags(self.evaluate_rules(values, limits))
+
+    def classify_table(self, forecasts: pd.DataFrame) -> pd.DataFrame:
+        """
+        Classifica várias localizações a partir de uma tabela em formato longo.
+
+        Args:
+            forecasts (pd.DataFrame): Colunas city_name, latitude, longitude, date, variable
+                (ex: 'T2M_MAX') e prediction, com uma linha por (localização, data, variável).
+
+        Returns:
+            pd.DataFrame: Colunas de OUTPUT_COLUMNS, ordenado por localização e data.
+        """
+        wide = (
+            forecasts.set_index(LOCATION_COLUMNS + ["date", "variable"])["prediction"]
+            .unstack("variable")
+            .reindex(columns=PREDICTION_VARIABLES)
+            .add_suffix("_prediction")
+            .reset_index()
+        )
+        wide.columns.name = None
+        wide["classification"] = self.classify_frame(wide)
+        return wide[OUTPUT_COLUMNS]
+
+    def classify_directory(
+        self,
+        root: str,
+        locations: Union[pd.DataFrame, Sequence[Mapping[str, object]]],
+        max_workers: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Classifica várias localizações cujas previsões estão em pastas separadas, cada uma
+        no formato do notebook 04 (forecast_<VAR>.csv). Os arquivos são lidos em paralelo
+        por um pool de processos (quando max_workers > 1) e a classificação é feita de uma
+        vez sobre todas as localizações.
+
+        Args:
+            root (str): Pasta que contém uma subpasta por localização.
+            locations (pd.DataFrame | Sequence[Mapping]): Localizações com 'name', 'latitude' e
+                'longitude' e, opcionalmente, 'folder' (subpasta; por padrão, o próprio nome).
+            max_workers (Optional[int]): Processos para a leitura dos arquivos (None ou 1 = sem pool).
+
+        Returns:
+            pd.DataFrame: Colunas de OUTPUT_COLUMNS, com as localizações na ordem de `locations`.
+            Localizações sem forecast_T2M.csv ficam de fora e são listadas em um aviso.
+        """
+        if isinstance(locations, pd.DataFrame):
+            locations = locations.to_dict("records")
+        args = [
+            (
+                os.path.join(root, str(loc.get("folder") or loc["name"])),
+                loc["name"],
+                float(loc["latitude"]),
+                float(loc["longitude"]),
+            )
+            for loc in locations
+        ]
+        if max_workers is not None and max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                frames = list(pool.map(_read_location, *zip(*args)))
+        else:
+            frames = [_read_location(*a) for a in args]
+        missing = [a[1] for a, df in zip(args, frames) if df.empty]
+        if missing:
+            print(f"Aviso: localizações sem forecast_T2M.csv ignoradas: {', '.join(missing)}")
+        frames = [df for df in frames if not df.empty]
+        if not frames:
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
+        results = pd.concat(frames, ignore_index=True)
+        results["classification"] = self.classify_frame(results)
+        return results[OUTPUT_COLUMNS]
+
+    def evaluate_rules(
+        self,
+        values: Mapping[str, np.ndarray],
+        limits: Optional[Mapping[str, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Avalia todas as regras de RULES de forma vetorizada.
+
+        Args:
+            values (Mapping[str, np.ndarray]): Previsões por variável (ex: 'T2M_MAX'), todas do mesmo tamanho.
+            limits (Optional[Mapping[str, np.ndarray]]): Limiares por linha (ex: 'T2M_MAX_P90'),
+                usados pelas regras de RELATIVE_THRESHOLDS; onde o limiar é NaN vale o fixo.
+
+        Returns:
+            np.ndarray: Flags (uint8) por linha; o bit i indica que a regra RULES[i] é verdadeira.
+                Regras cujas variáveis não estão em `values` ficam falsas.
+        """
+        n = len(next(iter(values.values()))) if values else 0
+        flags = np.zeros(n, dtype=np.uint8)
+        for bit, (label, variables, method) in enumerate(RULES):
+            if all(var in values for var in variables):
+                rule = getattr(self, method)
+                args = [np.asarray(values[var], dtype=np.float64) for var in variables]
+                names = RELATIVE_THRESHOLDS.get(label, ())
+                with np.errstate(invalid="ignore"):
+                    mask = np.asarray(rule(*args), dtype=bool)
+                    if limits is not None and names and all(name in limits for name in names):
+                        rule_limits = [np.asarray(limits[name], dtype=np.float64) for name in names]
+                        known = ~np.any(np.isnan(rule_limits), axis=0)
+                        mask = np.where(known, rule(*args, *rule_limits), mask)
+                flags |= mask.astype(np.uint8) << bit
+        return flags
+
+    @staticmethod
+    def label_flags(flags: np.ndarray) -> np.ndarray:
+        """
+        Converte flags em rótulos textuais (ex: "very_hot, very_uncomfortable" ou "normal").
+
+        Args:
+            flags (np.ndarray): Flags retornadas por evaluate_rules.
+
+        Returns:
+            np.ndarray: Rótulos (dtype object), consultados em FLAG_LABELS.
+        """
+        return FLAG_LABELS[flags]
 
     # Métodos para definir as condições específicas
-    def is_very_hot(self, t2m_max):
+    # Os limites podem ser escalares ou arrays por linha (limiares climatológicos).
+    def is_very_hot(self, t2m_max, limit=30):
         # Exemplo: Muito quente se T2M_MAX > 30
-        return t2m_max > 30
+        return t2m_max > limit
 
-    def is_very_cold(self, t2m_min):
+    def is_very_cold(self, t2m_min, limit=10):
         # Exemplo: Muito frio se T2M_MIN < 10
-        return t2m_min < 10
+        return t2m_min < limit
 
-    def is_very_windy(self, ws2m):
+    def is_very_windy(self, ws2m, limit=10):
         # Exemplo: Muito ventoso se WS2M > 10
-        return ws2m > 10
+        return ws2m > limit
 
-    def is_very_wet(self, rh2m):
+    def is_very_wet(self, rh2m, limit=90):
         # Exemplo: Muito úmido se RH2M > 90
-        return rh2m > 90
+        return rh2m > limit
 
-    def is_very_uncomfortable(self, t2m, rh2m):
+    def is_very_uncomfortable(self, t2m, rh2m, t2m_limit=28, rh2m_limit=80):
         # Exemplo: Muito desconfortável se T2M > 28 e RH2M > 80
-        return t2m > 28 and rh2m > 80
+        return (t2m > t2m_limit) & (rh2m > rh2m_limit)
 
 
 # Exemplo de uso (opcional, pode ser removido ou movido para um script de teste)